@@ -0,0 +1,103 @@
+"""Token usage, cost and latency accounting for council model calls."""
+
+import json
+from typing import List, Dict, Any, Optional
+
+from .config import MODEL_PRICES, MODEL_PRICES_FILE
+
+# Usage fields summed across calls
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens")
+
+_prices: Optional[Dict[str, Dict[str, float]]] = None
+
+
+def get_prices() -> Dict[str, Dict[str, float]]:
+    """Price table (USD per 1M tokens) keyed by model id, with file overrides."""
+    global _prices
+    if _prices is None:
+        _prices = dict(MODEL_PRICES)
+        if MODEL_PRICES_FILE:
+            try:
+                with open(MODEL_PRICES_FILE, 'r') as f:
+                    _prices.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"Error loading model prices from {MODEL_PRICES_FILE}: {e}")
+    return _prices
+
+
+def call_cost(model: str, usage: Optional[Dict[str, int]]) -> Optional[float]:
+    """
+    Cost of one call in USD.
+
+    Args:
+        model: Model identifier as configured (e.g. "openai/gpt-5.1")
+        usage: Normalized token usage from the provider (see providers.base.make_usage)
+
+    Returns:
+        Cost in USD, or None if the usage or the model's price is unknown
+    """
+    price = get_prices().get(model)
+    if usage is None or price is None:
+        return None
+
+    cache_read = usage.get("cache_read_tokens", 0)
+    cache_write = usage.get("cache_write_tokens", 0)
+    uncached = max(0, usage.get("input_tokens", 0) - cache_read - cache_write)
+    cost = (
+        uncached * price["input"]
+        + cache_read * price.get("cache_read", price["input"])
+        + cache_write * price.get("cache_write", price["input"])
+        + usage.get("output_tokens", 0) * price["output"]
+    ) / 1_000_000
+    return round(cost, 6)
+
+
+def summarize_calls(results: List[Dict[str, Any]], wall_time: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Aggregate per-call accounting for a stage.
+
+    Args:
+        results: Stage result entries carrying 'usage', 'cost' and 'latency'
+        wall_time: Stage wall-clock duration in seconds
+
+    Returns:
+        Dict with summed token counts, 'cost' (USD), 'calls', 'unpriced_calls'
+        (calls that hit a provider but could not be costed; cache hits and
+        coalesced copies cost nothing), the slowest call's
+        'max_latency' and the stage 'wall_time'
+    """
+    summary: Dict[str, Any] = {field: 0 for field in USAGE_FIELDS}
+    summary.update({"cost": 0.0, "calls": len(results), "unpriced_calls": 0, "max_latency": 0.0})
+    for result in results:
+        for field in USAGE_FIELDS:
+            summary[field] += (result.get("usage") or {}).get(field, 0)
+        if result.get("cost") is not None:
+            summary["cost"] += result["cost"]
+        elif result.get("cache") not in ("hit", "coalesced"):
+            summary["unpriced_calls"] += 1
+        summary["max_latency"] = max(summary["max_latency"], result.get("latency") or 0.0)
+    summary["cost"] = round(summary["cost"], 6)
+    summary["wall_time"] = None if wall_time is None else round(wall_time, 3)
+    return summary
+
+
+def summarize_turn(stage_usage: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Total a turn's per-stage summaries (as built by summarize_calls).
+
+    Returns:
+        Dict with summed token counts, 'cost', 'calls', 'unpriced_calls' and
+        the turn 'wall_time' (sum of stage wall times)
+    """
+    total: Dict[str, Any] = {field: 0 for field in USAGE_FIELDS}
+    total.update({"cost": 0.0, "calls": 0, "unpriced_calls": 0, "wall_time": 0.0})
+    for stage, summary in stage_usage.items():
+        if stage == "total":
+            continue
+        for field in USAGE_FIELDS + ("calls", "unpriced_calls"):
+            total[field] += summary.get(field, 0)
+        total["cost"] += summary.get("cost", 0.0)
+        total["wall_time"] += summary.get("wall_time") or 0.0
+    total["cost"] = round(total["cost"], 6)
+    total["wall_time"] = round(total["wall_time"], 3)
+    return total
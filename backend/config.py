@@ -1,6 +1,7 @@
 """Configuration for the LLM Council."""
 
 import os
+import json
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,7 +10,10 @@ load_dotenv()
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
 # Council members - list of OpenRouter model identifiers
+# (COUNCIL_MODELS env: comma-separated override, e.g. "mock/a,mock/b,mock/c")
 COUNCIL_MODELS = [
+    model.strip() for model in os.getenv("COUNCIL_MODELS", "").split(",") if model.strip()
+] or [
     "openai/gpt-5.1",
     "google/gemini-3-pro-preview",
     "anthropic/claude-sonnet-4.5",
@@ -17,16 +21,223 @@ COUNCIL_MODELS = [
 ]
 
 # Chairman model - synthesizes final response
-CHAIRMAN_MODEL = "google/gemini-3-pro-preview"
+CHAIRMAN_MODEL = os.getenv("CHAIRMAN_MODEL", "google/gemini-3-pro-preview")
+
+# Model used to title new conversations
+TITLE_MODEL = os.getenv("TITLE_MODEL", "google/gemini-2.5-flash")
+
+
+def _optional_number(name: str):
+    """Read an optional int/float env var; unset or empty means None."""
+    value = os.getenv(name)
+    if not value:
+        return None
+    return float(value) if "." in value else int(value)
+
+
+def _optional_quorum(name: str):
+    """Read an optional quorum env var; a fraction must be in (0, 1]."""
+    quorum = _optional_number(name)
+    if isinstance(quorum, float) and not 0 < quorum <= 1:
+        raise ValueError(f"{name}={quorum}: a fractional quorum must be in (0, 1]")
+    return quorum
+
+
+# Per-stage quorum/deadline policy for council stages.
+# quorum: members that must answer before the stage moves on - an int count,
+#   a float fraction of the seats (e.g. 0.75), or None to wait for everyone.
+# deadline: seconds after which the stage proceeds with whoever has answered
+#   (None = no stage deadline). Stragglers are cancelled either way.
+STAGE_POLICIES = {
+    "stage1": {
+        "quorum": _optional_quorum("STAGE1_QUORUM"),
+        "deadline": _optional_number("STAGE1_DEADLINE"),
+    },
+    "stage2": {
+        "quorum": _optional_quorum("STAGE2_QUORUM"),
+        "deadline": _optional_number("STAGE2_DEADLINE"),
+    },
+}
+
+# Seconds a whole council turn may take (every stage, retry and the title).
+# Provider calls are cut off and stages stop waiting once it passes; 0 disables it.
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "300")) or None
+
+# Background council jobs: size of the worker pool, queued jobs beyond which
+# submissions are refused (503), and seconds finished jobs stay queryable
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "100"))
+JOB_RETENTION = float(os.getenv("JOB_RETENTION", "3600"))
+
+# Resumable event streams. Each turn's events are kept in memory up to
+# EVENT_LOG_MEMORY_MAX; older ones spill to EVENT_LOG_SPILL_DIR when it is set
+# and are dropped otherwise. A turn with no client attached keeps running for
+# TURN_RESUME_GRACE seconds so a reconnect can pick it up; finished turns can
+# be replayed for TURN_RETENTION seconds.
+EVENT_LOG_MEMORY_MAX = int(os.getenv("EVENT_LOG_MEMORY_MAX", "5000"))
+EVENT_LOG_SPILL_DIR = os.getenv("EVENT_LOG_SPILL_DIR") or None
+TURN_RESUME_GRACE = float(os.getenv("TURN_RESUME_GRACE", "30"))
+TURN_RETENTION = float(os.getenv("TURN_RETENTION", "300"))
+
+# Checkpointed turns: each member result and completed stage of a running
+# turn is saved to storage, and turns interrupted by a restart resume from
+# their checkpoint on startup instead of re-querying every model.
+TURN_CHECKPOINTS_ENABLED = os.getenv("TURN_CHECKPOINTS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Graceful drain on shutdown (or POST /api/drain): new council turns are
+# refused with 503 and /ready reports not-ready, running turns and queued jobs
+# get SHUTDOWN_GRACE seconds to finish, and whatever is still running is then
+# cancelled with its checkpoint kept so it resumes on the next startup. Give
+# uvicorn --timeout-graceful-shutdown no more than this so open SSE streams
+# do not hold up the drain.
+SHUTDOWN_GRACE = float(os.getenv("SHUTDOWN_GRACE", "30"))
 
 # OpenRouter API endpoint
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
 # Data directory for conversation storage
-DATA_DIR = "data/conversations"
+DATA_DIR = os.getenv("DATA_DIR", "data/conversations")
+
+# Conversation storage backend: "json" (one JSON file per conversation under
+# DATA_DIR), "jsonl" (an append-only log per conversation under DATA_DIR,
+# converting JSON files on first access) or "sqlite" (a WAL-mode database at
+# STORAGE_SQLITE_PATH, which imports the JSON conversations in DATA_DIR when
+# first created)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json").lower()
+STORAGE_SQLITE_PATH = os.getenv("STORAGE_SQLITE_PATH", "data/council.sqlite3")
+# jsonl: records a log may gain by appends before a read compacts it
+JSONL_COMPACT_AFTER = int(os.getenv("JSONL_COMPACT_AFTER", "32"))
 
 # Personas storage
 PERSONAS_FILE = "data/personas.json"
 
 # Models are fetched dynamically from provider APIs (see models_fetcher.py).
 # Static fallback used only when API fails or key is missing.
+
+# Provider HTTP connection pools (shared across council calls, see providers/clients.py)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+
+# Retry policy for provider calls (see providers/retry.py)
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))  # total attempts per call
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))  # seconds, doubled per attempt
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "8"))  # cap on computed backoff
+RETRY_MAX_RETRY_AFTER = float(os.getenv("RETRY_MAX_RETRY_AFTER", "30"))  # give up if server asks for longer
+# Retry budget: each call earns RETRY_BUDGET_RATIO retry tokens (capped at
+# RETRY_BUDGET_MAX), each retry spends one - so under load retries stay at
+# roughly RATIO x traffic instead of multiplying it.
+RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+RETRY_BUDGET_MAX = float(os.getenv("RETRY_BUDGET_MAX", "20"))
+
+# Circuit breakers for native provider routes (see providers/circuit.py).
+# After CIRCUIT_FAILURE_THRESHOLD consecutive retryable failures a provider (or
+# a single model on it) is routed via OpenRouter for CIRCUIT_RESET_TIMEOUT
+# seconds, then a probe call decides whether to close the circuit again.
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+# Adaptive per-provider concurrency and rate limits (see providers/limits.py).
+# concurrency is the starting in-flight cap, adapted AIMD-style between
+# min_concurrency and max_concurrency from rate-limit headers and 429s; rps is
+# an optional token-bucket request rate (None = unlimited). Calls over the
+# limit are queued, not failed.
+PROVIDER_LIMITS = {
+    "default": {"concurrency": 8, "min_concurrency": 1, "max_concurrency": 64, "rps": None},
+    "openai": {"concurrency": 16, "min_concurrency": 1, "max_concurrency": 128, "rps": None},
+    "anthropic": {"concurrency": 16, "min_concurrency": 1, "max_concurrency": 128, "rps": None},
+    "google": {"concurrency": 16, "min_concurrency": 1, "max_concurrency": 128, "rps": None},
+    "openrouter": {"concurrency": 32, "min_concurrency": 1, "max_concurrency": 256, "rps": None},
+}
+
+# Optional per-model limits, keyed by model identifier (e.g. "openai/gpt-5.1"),
+# applied on top of the provider limit. Same keys as PROVIDER_LIMITS entries.
+MODEL_LIMITS = {}
+
+# Hedged requests (see providers/hedging.py). When enabled, a query_model call
+# to a model reachable both natively and via OpenRouter that hasn't answered by
+# the native route's observed p-th percentile latency is duplicated on
+# OpenRouter; the first answer wins and the other call is cancelled.
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "0.9"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "10"))  # before that, use HEDGE_DEFAULT_DELAY
+HEDGE_DEFAULT_DELAY = float(os.getenv("HEDGE_DEFAULT_DELAY", "30"))
+# Hedge budget: like the retry budget, hedges stay a bounded fraction of calls
+HEDGE_BUDGET_RATIO = float(os.getenv("HEDGE_BUDGET_RATIO", "0.1"))
+HEDGE_BUDGET_MAX = float(os.getenv("HEDGE_BUDGET_MAX", "10"))
+
+# Content-addressed response cache for provider calls (see providers/cache.py).
+# Keyed by a hash of (model, messages) - generation settings are fixed per
+# provider; an in-memory LRU tier backed by SQLite on disk. Off by default:
+# while on, repeating a question returns the stored answer, not a fresh one.
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "86400"))  # seconds
+RESPONSE_CACHE_MEMORY_SIZE = int(os.getenv("RESPONSE_CACHE_MEMORY_SIZE", "1024"))  # entries
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", "data/response_cache.sqlite3")  # "" disables disk tier
+# Stages whose calls use the cache when enabled
+# (RESPONSE_CACHE_STAGES env: comma-separated, e.g. "stage2,title"; default all)
+_cached_stages = {
+    stage.strip()
+    for stage in os.getenv("RESPONSE_CACHE_STAGES", "stage1,stage2,stage3,title").split(",")
+    if stage.strip()
+}
+RESPONSE_CACHE_STAGES = {stage: stage in _cached_stages for stage in ("stage1", "stage2", "stage3", "title")}
+
+# Single-flight: concurrent identical requests (same model + messages) share
+# one upstream call instead of each fanning out to the provider.
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Provider prompt caching for the shared prefix of council prompts (stage-2
+# context reused by every ranker and the chairman): Anthropic cache_control
+# blocks, Gemini cached content, OpenAI prompt_cache_key routing.
+PROMPT_CACHE_ENABLED = os.getenv("PROMPT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+GOOGLE_CONTEXT_CACHE_TTL = int(os.getenv("GOOGLE_CONTEXT_CACHE_TTL", "600"))  # seconds
+# Gemini rejects cached content below a model-specific minimum; skip explicit
+# caching for prefixes estimated (at ~4 chars/token) below this size
+GOOGLE_CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("GOOGLE_CONTEXT_CACHE_MIN_TOKENS", "4096"))
+
+# Model prices in USD per 1M tokens, keyed by model id as configured. Used to
+# cost each call from its token usage (see accounting.py); cache_read and
+# cache_write default to the input price. Extend or override with a JSON file
+# of the same shape at MODEL_PRICES_FILE.
+MODEL_PRICES = {
+    "openai/gpt-5.1": {"input": 1.25, "output": 10.0, "cache_read": 0.125},
+    "openai/gpt-4o": {"input": 2.5, "output": 10.0, "cache_read": 1.25},
+    "openai/gpt-4o-mini": {"input": 0.15, "output": 0.6, "cache_read": 0.075},
+    "google/gemini-3-pro-preview": {"input": 2.0, "output": 12.0, "cache_read": 0.2},
+    "google/gemini-2.5-pro": {"input": 1.25, "output": 10.0, "cache_read": 0.125},
+    "google/gemini-2.5-flash": {"input": 0.3, "output": 2.5, "cache_read": 0.03},
+    "anthropic/claude-sonnet-4.5": {"input": 3.0, "output": 15.0, "cache_read": 0.3, "cache_write": 3.75},
+    "anthropic/claude-sonnet-4": {"input": 3.0, "output": 15.0, "cache_read": 0.3, "cache_write": 3.75},
+    "x-ai/grok-4": {"input": 3.0, "output": 15.0, "cache_read": 0.75},
+}
+MODEL_PRICES_FILE = os.getenv("MODEL_PRICES_FILE")
+
+# Tracing (see tracing.py): one trace per council turn. Spans export over OTLP
+# when the OpenTelemetry SDK + OTLP exporter are installed and
+# OTEL_EXPORTER_OTLP_ENDPOINT is set, else they are appended to TRACE_JSONL_PATH.
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() in ("1", "true", "yes")
+TRACE_JSONL_PATH = os.getenv("TRACE_JSONL_PATH", "data/traces.jsonl")
+TRACE_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "llm-council")
+# Send W3C traceparent headers on outgoing provider requests
+TRACE_PROPAGATE = os.getenv("TRACE_PROPAGATE", "true").lower() in ("1", "true", "yes")
+
+# In-process mock provider for offline load/latency testing (see
+# providers/mock_provider.py). Models with the "mock/" prefix (e.g.
+# "mock/fast", "mock/slow") never leave the process. Everything is
+# deterministic under MOCK_SEED. Latency and size distributions are dicts:
+# {"dist": "fixed", "value": x} | {"dist": "uniform", "low": a, "high": b} |
+# {"dist": "normal", "mean": m, "stddev": s} | {"dist": "lognormal", "median": m, "sigma": s}
+MOCK_SEED = int(os.getenv("MOCK_SEED", "0"))
+MOCK_DEFAULTS = {
+    "latency": {"dist": "lognormal", "median": float(os.getenv("MOCK_LATENCY_MEDIAN", "0.8")), "sigma": 0.4},
+    "token_interval": float(os.getenv("MOCK_TOKEN_INTERVAL", "0.01")),  # seconds between streamed tokens
+    "response_tokens": {"dist": "uniform", "low": 150, "high": 400},
+    "failure_rate": float(os.getenv("MOCK_FAILURE_RATE", "0")),  # raises a retryable 503
+    "timeout_rate": float(os.getenv("MOCK_TIMEOUT_RATE", "0")),  # hangs, then raises a timeout
+    # chance a request's cacheable prefix is reported as a prompt-cache read
+    "prompt_cache_hit_rate": float(os.getenv("MOCK_PROMPT_CACHE_HIT_RATE", "0.9")),
+}
+# Per-model overrides keyed by the name after "mock/", as JSON in MOCK_MODELS, e.g.
+# {"slow": {"latency": {"dist": "fixed", "value": 5}}, "flaky": {"failure_rate": 0.3}}
+MOCK_MODELS = json.loads(os.getenv("MOCK_MODELS", "{}"))
@@ -0,0 +1,72 @@
+"""In-memory index of conversation metadata, so listing does not read conversation files."""
+
+import bisect
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class ConversationIndex:
+    """
+    Listing metadata (id, created_at, title, message_count) of every
+    conversation, ordered by creation time.
+
+    Built on first use by `load`, which scans storage once; after that the
+    storage write paths keep it current, and a page of the listing costs
+    O(page size). Writes made before the first build need not be recorded,
+    since the scan picks them up.
+    """
+
+    def __init__(self, load: Callable[[], Iterable[Dict[str, Any]]]):
+        self._load = load
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        # (created_at, id) of every entry, ascending
+        self._order: List[Tuple[str, str]] = []
+
+    def _build(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            entries = {metadata["id"]: metadata for metadata in self._load()}
+            self._order = sorted((m["created_at"], m["id"]) for m in entries.values())
+            self._entries = entries
+        return self._entries
+
+    def put(self, metadata: Dict[str, Any]):
+        """Insert or replace a conversation's metadata."""
+        if self._entries is None:
+            return
+        old = self._entries.get(metadata["id"])
+        if old is not None and old["created_at"] != metadata["created_at"]:
+            del self._order[bisect.bisect_left(self._order, (old["created_at"], old["id"]))]
+            old = None
+        if old is None:
+            bisect.insort(self._order, (metadata["created_at"], metadata["id"]))
+        self._entries[metadata["id"]] = dict(metadata)
+
+    def update(self, conversation_id: str, **fields: Any):
+        """Change fields of an indexed conversation (e.g. title)."""
+        if self._entries is not None and conversation_id in self._entries:
+            self._entries[conversation_id].update(fields)
+
+    def add_message(self, conversation_id: str):
+        """Count one more message in a conversation."""
+        if self._entries is not None and conversation_id in self._entries:
+            self._entries[conversation_id]["message_count"] += 1
+
+    def page(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Conversations newest first.
+
+        Args:
+            limit: Maximum number to return (None = all)
+            offset: Number of newest conversations to skip
+
+        Returns:
+            List of metadata dicts (copies)
+        """
+        entries = self._build()
+        end = max(0, len(self._order) - offset)
+        start = 0 if limit is None else max(0, end - limit)
+        return [dict(entries[conversation_id]) for _, conversation_id in reversed(self._order[start:end])]
+
+    def invalidate(self):
+        """Drop the index; the next listing scans storage again."""
+        self._entries = None
+        self._order = []
@@ -1,12 +1,55 @@
 """3-stage LLM Council orchestration."""
 
-from typing import List, Dict, Any, Tuple, Optional
+import math
+import re
+import time
+from typing import List, Dict, Any, Tuple, Optional, Callable, AsyncIterator
 from .providers import (
     query_models_parallel,
-    query_models_parallel_with_messages,
+    query_models_as_completed,
     query_model,
+    stream_model,
 )
-from .config import COUNCIL_MODELS, CHAIRMAN_MODEL
+from .providers.base import CACHEABLE
+from . import metrics, tracing
+from .deadline import request_deadline, expired
+from .accounting import call_cost, summarize_calls, summarize_turn
+from .config import COUNCIL_MODELS, CHAIRMAN_MODEL, TITLE_MODEL, STAGE_POLICIES, RESPONSE_CACHE_STAGES
+
+# FINAL RANKING parsing: the section marker, numbered entries ("1. Response A")
+# and bare labels
+_FINAL_RANKING = "FINAL RANKING:"
+# The lookbehind anchors matches at the start of a digit run, keeping long
+# digit runs linear rather than rescanned from every position
+_NUMBERED_LABEL = re.compile(r'(?<!\d)\d+\.\s*(Response [A-Z])')
+_LABEL = re.compile(r'Response [A-Z]')
+
+
+# Stage-2 instructions, sent after the shared council context
+RANKING_PROMPT = """Evaluate the anonymized responses above.
+
+Your task:
+1. First, evaluate each response individually. For each response, explain what it does well and what it does poorly.
+2. Then, at the very end of your response, provide a final ranking.
+
+IMPORTANT: Your final ranking MUST be formatted EXACTLY as follows:
+- Start with the line "FINAL RANKING:" (all caps, with colon)
+- Then list the responses from best to worst as a numbered list
+- Each line should be: number, period, space, then ONLY the response label (e.g., "1. Response A")
+- Do not add any other text or explanations in the ranking section
+
+Example of the correct format for your ENTIRE response:
+
+Response A provides good detail on X but misses Y...
+Response B is accurate but lacks depth on Z...
+Response C offers the most comprehensive answer...
+
+FINAL RANKING:
+1. Response C
+2. Response A
+3. Response B
+
+Now provide your evaluation and ranking:"""
 
 
 def _build_messages(
@@ -22,10 +65,167 @@ def _build_messages(
     return [{"role": "user", "content": user_content}]
 
 
+def _build_council_context(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Build the anonymized stage-1 context shared by every ranker and the chairman.
+
+    It is sent first, as a user message marked cacheable, and must stay
+    byte-identical across those calls so providers can serve it from their
+    prompt caches; anything per-call (personas, instructions) comes after it.
+    The question and the answers are untrusted text, so they never get the
+    system role; that stays reserved for persona prompts.
+
+    Returns:
+        Tuple of (prefix messages, label_to_model mapping)
+    """
+    # Create anonymized labels for responses (Response A, Response B, etc.)
+    labels = [chr(65 + i) for i in range(len(stage1_results))]  # A, B, C, ...
+
+    # Create mapping from label to model name
+    label_to_model = {
+        f"Response {label}": result['model']
+        for label, result in zip(labels, stage1_results)
+    }
+
+    responses_text = "\n\n".join([
+        f"Response {label}:\n{result['response']}"
+        for label, result in zip(labels, stage1_results)
+    ])
+
+    context = f"""Multiple AI models on an LLM Council have independently answered the following question.
+
+Question: {user_query}
+
+Here are the responses from different models (anonymized):
+
+{responses_text}"""
+
+    return [{"role": "user", "content": context, CACHEABLE: True}], label_to_model
+
+
+def _resolve_quorum(quorum: Optional[float], seats: int) -> Optional[int]:
+    """Turn a policy quorum (seat count or fraction of seats) into a seat count."""
+    if quorum is None:
+        return None
+    if isinstance(quorum, float):
+        return max(1, min(math.ceil(quorum * seats), seats))
+    return max(1, min(int(quorum), seats))
+
+
+def _record_dropped_seats(
+    stage: str,
+    models: List[str],
+    seen: set,
+    failed: List[Dict[str, Any]],
+    quorum_met: bool,
+    metadata: Optional[Dict[str, Any]],
+    on_event: Optional[Callable[[Dict[str, Any]], None]],
+) -> List[Dict[str, Any]]:
+    """
+    Record seats that did not contribute to a stage: failed calls plus
+    stragglers cancelled by the stage's quorum/deadline policy.
+    """
+    reason = "quorum" if quorum_met else "deadline"
+    cancelled = [
+        {"index": i, "model": model, "reason": reason}
+        for i, model in enumerate(models)
+        if i not in seen
+    ]
+    if on_event is not None:
+        for seat in cancelled:
+            on_event({"type": f"{stage}_member_dropped", "data": seat})
+
+    dropped = sorted(failed + cancelled, key=lambda seat: seat["index"])
+    if metadata is not None:
+        metadata.setdefault("dropped_seats", {})[stage] = dropped
+    return dropped
+
+
+def _record_call_stats(
+    stage: str,
+    results: List[Dict[str, Any]],
+    metadata: Optional[Dict[str, Any]],
+    started: Optional[float] = None,
+):
+    """
+    Record a stage's provider retry total, response-cache hits/misses and
+    its token usage, cost and latency (see accounting.summarize_calls).
+    """
+    wall_time = None if started is None else time.monotonic() - started
+    if wall_time is not None:
+        metrics.stage_duration.observe(wall_time, stage=stage)
+    if metadata is None:
+        return
+    metadata.setdefault("retries", {})[stage] = sum(r.get("retries", 0) for r in results)
+    metadata.setdefault("cache", {})[stage] = {
+        "hits": sum(1 for r in results if r.get("cache") == "hit"),
+        "misses": sum(1 for r in results if r.get("cache") == "miss"),
+    }
+    metadata.setdefault("usage", {})[stage] = summarize_calls(results, wall_time)
+
+
+async def _query_pending_seats(
+    models: List[str],
+    messages_list: List[List[Dict[str, Any]]],
+    checkpointed: Dict[int, Dict[str, Any]],
+    on_delta: Optional[Callable[[int, str, str], None]],
+    quorum: Optional[int],
+    deadline: Optional[float],
+    cache: bool,
+) -> AsyncIterator[Tuple[int, str, Optional[Dict[str, Any]]]]:
+    """
+    query_models_as_completed over the seats not already in `checkpointed`,
+    yielding council seat indices; checkpointed answers count toward quorum.
+    """
+    pending = [i for i in range(len(models)) if i not in checkpointed]
+    if quorum is not None:
+        quorum -= len(checkpointed)
+    if not pending or (quorum is not None and quorum <= 0):
+        return
+
+    seat_delta = None
+    if on_delta is not None:
+        def seat_delta(j: int, model: str, text: str):
+            on_delta(pending[j], model, text)
+
+    async for j, model, response in query_models_as_completed(
+        [models[i] for i in pending],
+        [messages_list[i] for i in pending],
+        on_delta=seat_delta,
+        quorum=quorum,
+        deadline=deadline,
+        cache=cache,
+    ):
+        yield pending[j], model, response
+
+
+def _call_accounting(model: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-call accounting fields for a stage result entry."""
+    usage = response.get('usage')
+    return {
+        "retries": response.get('retries', 0),
+        "cache": response.get('cache'),
+        "usage": usage,
+        "cost": call_cost(model, usage),
+        "latency": response.get('latency'),
+    }
+
+
+@tracing.traced(
+    "council.stage1",
+    attributes=lambda user_query, models, *args, **kwargs: {"council.seats": len(models)},
+)
 async def stage1_collect_responses(
     user_query: str,
     models: List[str],
     personas: Optional[List[Dict[str, Any]]] = None,
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    policy: Optional[Dict[str, Any]] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    checkpointed: Optional[Dict[int, Dict[str, Any]]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Stage 1: Collect individual responses from council models.
@@ -34,6 +234,17 @@ async def stage1_collect_responses(
         user_query: The user's question
         models: List of model identifiers to query
         personas: Optional list of persona dicts (one per model)
+        on_event: Optional callback; when set, responses are streamed, each
+            token delta is emitted as a 'stage1_delta' event and each finished
+            seat as a 'stage1_member_complete' (or 'stage1_member_failed') event
+        policy: Optional quorum/deadline policy (defaults to STAGE_POLICIES["stage1"])
+        metadata: Optional dict; seats dropped by failure or policy are
+            recorded under metadata["dropped_seats"]["stage1"], the
+            provider retry count under metadata["retries"]["stage1"] and
+            response-cache hits/misses under metadata["cache"]["stage1"];
+            summed token usage, cost and timing go under metadata["usage"]["stage1"]
+        checkpointed: Optional seat results already collected (by seat
+            index), e.g. from an interrupted turn; those seats are not queried
 
     Returns:
         List of dicts with 'model' and 'response' keys
@@ -41,6 +252,8 @@ async def stage1_collect_responses(
     if not models:
         return []
 
+    started = time.monotonic()
+
     # Build messages per model (each may have different persona)
     if personas and len(personas) >= len(models):
         messages_list = [
@@ -50,25 +263,83 @@ async def stage1_collect_responses(
     else:
         messages_list = [_build_messages(user_query, None) for _ in models]
 
-    responses = await query_models_parallel_with_messages(models, messages_list)
+    on_delta = None
+    if on_event is not None:
+        def on_delta(index: int, model: str, text: str):
+            on_event({
+                "type": "stage1_delta",
+                "data": {"index": index, "model": model, "delta": text},
+            })
 
-    # Format results
-    stage1_results = []
-    for model, response in responses.items():
-        if response is not None:  # Only include successful responses
-            stage1_results.append({
-                "model": model,
-                "response": response.get('content', '')
+    policy = STAGE_POLICIES["stage1"] if policy is None else policy
+    quorum = _resolve_quorum(policy.get("quorum"), len(models))
+
+    # Collect results as each seat lands; keep seat order for stable labels
+    checkpointed = checkpointed or {}
+    completed = sorted(checkpointed.items())
+    seen = set(checkpointed)
+    failed = []
+    if on_event is not None:
+        for index, result in completed:
+            on_event({
+                "type": "stage1_member_complete",
+                "data": {"index": index, **result},
+            })
+    async for index, model, response in _query_pending_seats(
+        models,
+        messages_list,
+        checkpointed,
+        on_delta,
+        quorum,
+        policy.get("deadline"),
+        RESPONSE_CACHE_STAGES["stage1"],
+    ):
+        seen.add(index)
+        if response is None:  # Only include successful responses
+            failed.append({"index": index, "model": model, "reason": "failed"})
+            if on_event is not None:
+                on_event({
+                    "type": "stage1_member_failed",
+                    "data": {"index": index, "model": model},
+                })
+            continue
+
+        result = {
+            "model": model,
+            "response": response.get('content', ''),
+            **_call_accounting(model, response),
+        }
+        completed.append((index, result))
+        if on_event is not None:
+            on_event({
+                "type": "stage1_member_complete",
+                "data": {"index": index, **result},
             })
 
+    _record_dropped_seats(
+        "stage1", models, seen, failed,
+        quorum is not None and len(completed) >= quorum,
+        metadata, on_event,
+    )
+    stage1_results = [result for _, result in sorted(completed, key=lambda c: c[0])]
+    _record_call_stats("stage1", stage1_results, metadata, started)
+
     return stage1_results
 
 
+@tracing.traced(
+    "council.stage2",
+    attributes=lambda user_query, stage1_results, models, *args, **kwargs: {"council.seats": len(models)},
+)
 async def stage2_collect_rankings(
     user_query: str,
     stage1_results: List[Dict[str, Any]],
     models: List[str],
     personas: Optional[List[Dict[str, Any]]] = None,
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    policy: Optional[Dict[str, Any]] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    checkpointed: Optional[Dict[int, Dict[str, Any]]] = None,
 ) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
     """
     Stage 2: Each model ranks the anonymized responses.
@@ -76,78 +347,97 @@ async def stage2_collect_rankings(
     Args:
         user_query: The original user query
         stage1_results: Results from Stage 1
+        models: List of model identifiers acting as rankers
+        personas: Optional list of persona dicts (one per model)
+        on_event: Optional callback; each finished ranker is emitted as a
+            'stage2_member_complete' event carrying the running aggregate rankings
+        policy: Optional quorum/deadline policy (defaults to STAGE_POLICIES["stage2"])
+        metadata: Optional dict; seats dropped by failure or policy are
+            recorded under metadata["dropped_seats"]["stage2"], the
+            provider retry count under metadata["retries"]["stage2"] and
+            response-cache hits/misses under metadata["cache"]["stage2"];
+            summed token usage, cost and timing go under metadata["usage"]["stage2"]
+        checkpointed: Optional ranker results already collected (by seat
+            index), e.g. from an interrupted turn; those seats are not queried
 
     Returns:
         Tuple of (rankings list, label_to_model mapping)
     """
-    # Create anonymized labels for responses (Response A, Response B, etc.)
-    labels = [chr(65 + i) for i in range(len(stage1_results))]  # A, B, C, ...
+    started = time.monotonic()
 
-    # Create mapping from label to model name
-    label_to_model = {
-        f"Response {label}": result['model']
-        for label, result in zip(labels, stage1_results)
-    }
-
-    # Build the ranking prompt
-    responses_text = "\n\n".join([
-        f"Response {label}:\n{result['response']}"
-        for label, result in zip(labels, stage1_results)
-    ])
-
-    ranking_prompt = f"""You are evaluating different responses to the following question:
-
-Question: {user_query}
-
-Here are the responses from different models (anonymized):
-
-{responses_text}
-
-Your task:
-1. First, evaluate each response individually. For each response, explain what it does well and what it does poorly.
-2. Then, at the very end of your response, provide a final ranking.
-
-IMPORTANT: Your final ranking MUST be formatted EXACTLY as follows:
-- Start with the line "FINAL RANKING:" (all caps, with colon)
-- Then list the responses from best to worst as a numbered list
-- Each line should be: number, period, space, then ONLY the response label (e.g., "1. Response A")
-- Do not add any other text or explanations in the ranking section
-
-Example of the correct format for your ENTIRE response:
-
-Response A provides good detail on X but misses Y...
-Response B is accurate but lacks depth on Z...
-Response C offers the most comprehensive answer...
-
-FINAL RANKING:
-1. Response C
-2. Response A
-3. Response B
-
-Now provide your evaluation and ranking:"""
+    # The shared context leads every ranker's prompt; personas and the
+    # ranking instructions follow so they do not break the cached prefix
+    context, label_to_model = _build_council_context(user_query, stage1_results)
 
     # Build messages per model (each may have different persona)
     if personas and len(personas) >= len(models):
         messages_list = [
-            _build_messages(ranking_prompt, personas[i] if i < len(personas) else None)
+            context + _build_messages(RANKING_PROMPT, personas[i] if i < len(personas) else None)
             for i in range(len(models))
         ]
     else:
-        messages_list = [_build_messages(ranking_prompt, None) for _ in models]
-
-    responses = await query_models_parallel_with_messages(models, messages_list)
-
-    # Format results
-    stage2_results = []
-    for model, response in responses.items():
-        if response is not None:
-            full_text = response.get('content', '')
-            parsed = parse_ranking_from_text(full_text)
-            stage2_results.append({
-                "model": model,
-                "ranking": full_text,
-                "parsed_ranking": parsed
-            })
+        messages_list = [context + _build_messages(RANKING_PROMPT, None) for _ in models]
+
+    policy = STAGE_POLICIES["stage2"] if policy is None else policy
+    quorum = _resolve_quorum(policy.get("quorum"), len(models))
+
+    def emit_member(index: int, result: Dict[str, Any]):
+        running = [r for _, r in completed]
+        on_event({
+            "type": "stage2_member_complete",
+            "data": {"index": index, **result},
+            "metadata": {
+                "label_to_model": label_to_model,
+                "aggregate_rankings": calculate_aggregate_rankings(running, label_to_model),
+            },
+        })
+
+    checkpointed = checkpointed or {}
+    completed = []
+    seen = set(checkpointed)
+    failed = []
+    for index, result in sorted(checkpointed.items()):
+        completed.append((index, result))
+        if on_event is not None:
+            emit_member(index, result)
+    async for index, model, response in _query_pending_seats(
+        models,
+        messages_list,
+        checkpointed,
+        None,
+        quorum,
+        policy.get("deadline"),
+        RESPONSE_CACHE_STAGES["stage2"],
+    ):
+        seen.add(index)
+        if response is None:
+            failed.append({"index": index, "model": model, "reason": "failed"})
+            if on_event is not None:
+                on_event({
+                    "type": "stage2_member_failed",
+                    "data": {"index": index, "model": model},
+                })
+            continue
+
+        full_text = response.get('content', '')
+        parsed = parse_ranking_from_text(full_text)
+        result = {
+            "model": model,
+            "ranking": full_text,
+            "parsed_ranking": parsed,
+            **_call_accounting(model, response),
+        }
+        completed.append((index, result))
+        if on_event is not None:
+            emit_member(index, result)
+
+    _record_dropped_seats(
+        "stage2", models, seen, failed,
+        quorum is not None and len(completed) >= quorum,
+        metadata, on_event,
+    )
+    stage2_results = [result for _, result in sorted(completed, key=lambda c: c[0])]
+    _record_call_stats("stage2", stage2_results, metadata, started)
 
     return stage2_results, label_to_model
 
@@ -175,30 +465,16 @@ def _build_persona_context(
     return "\n".join(lines)
 
 
-async def stage3_synthesize_final(
+def _build_chairman_prompt(
     user_query: str,
-    stage1_results: List[Dict[str, Any]],
+    label_to_model: Dict[str, str],
     stage2_results: List[Dict[str, Any]],
-    personas: Optional[List[Dict[str, Any]]] = None,
+    persona_context: str = "",
     subject: Optional[str] = None,
-) -> Dict[str, Any]:
-    """
-    Stage 3: Chairman synthesizes final response.
-
-    Args:
-        user_query: The original user query
-        stage1_results: Individual model responses from Stage 1
-        stage2_results: Rankings from Stage 2
-        personas: Optional list of persona dicts (for context)
-        subject: Optional discussion subject/topic
-
-    Returns:
-        Dict with 'model' and 'response' keys
-    """
-    # Build comprehensive context for chairman
-    stage1_text = "\n\n".join([
-        f"Model: {result['model']}\nResponse: {result['response']}"
-        for result in stage1_results
+) -> str:
+    """Build the chairman's instructions, sent after the shared council context."""
+    authors_text = "\n".join([
+        f"- {label}: {model}" for label, model in label_to_model.items()
     ])
 
     stage2_text = "\n\n".join([
@@ -206,7 +482,6 @@ async def stage3_synthesize_final(
         for result in stage2_results
     ])
 
-    persona_context = _build_persona_context(stage1_results, personas)
     subject_block = ""
     if subject and subject.strip():
         subject_block = f"""
@@ -214,21 +489,21 @@ DISCUSSION SUBJECT: {subject.strip()}
 (This is what this conversation is about. Use it to frame your synthesis.)
 """
 
-    chairman_prompt = f"""You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question, and then ranked each other's responses.
+    chairman_prompt = f"""You are the Chairman of an LLM Council. Multiple AI models have provided the responses above to a user's question, and then ranked each other's responses.
 {subject_block}
 ORIGINAL QUESTION: {user_query}
+
+STAGE 1 - Response authors:
+{authors_text}
 """
 
     if persona_context:
         chairman_prompt += f"""
 COUNCIL MEMBER PERSONAS (each model responded with this perspective; use this to understand their viewpoints):
 {persona_context}
-
 """
 
-    chairman_prompt += f"""STAGE 1 - Individual Responses:
-{stage1_text}
-
+    chairman_prompt += f"""
 STAGE 2 - Peer Rankings:
 {stage2_text}
 
@@ -240,22 +515,87 @@ Your task as Chairman is to synthesize all of this information into a single, co
 
 Provide a clear, well-reasoned final answer that represents the council's collective wisdom:"""
 
-    messages = [{"role": "user", "content": chairman_prompt}]
+    return chairman_prompt
+
+
+@tracing.traced(
+    "council.stage3",
+    attributes=lambda *args, **kwargs: {"llm.model": CHAIRMAN_MODEL},
+)
+async def stage3_synthesize_final(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    personas: Optional[List[Dict[str, Any]]] = None,
+    subject: Optional[str] = None,
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Stage 3: Chairman synthesizes final response.
+
+    Args:
+        user_query: The original user query
+        stage1_results: Individual model responses from Stage 1
+        stage2_results: Rankings from Stage 2
+        personas: Optional list of persona dicts (for context)
+        subject: Optional discussion subject/topic
+        on_event: Optional callback; when set, the synthesis is streamed and
+            each token delta is emitted as a 'stage3_delta' event
+        metadata: Optional dict; the chairman's provider retry count and
+            cache hit/miss are recorded under metadata["retries"]["stage3"]
+            and metadata["cache"]["stage3"], its token usage, cost and
+            timing under metadata["usage"]["stage3"]
+
+    Returns:
+        Dict with 'model' and 'response' keys
+    """
+    started = time.monotonic()
+
+    # Build comprehensive context for chairman; the anonymized stage-1
+    # responses reuse the prefix the rankers already sent
+    context, label_to_model = _build_council_context(user_query, stage1_results)
+
+    chairman_prompt = _build_chairman_prompt(
+        user_query,
+        label_to_model,
+        stage2_results,
+        _build_persona_context(stage1_results, personas),
+        subject,
+    )
+    messages = context + [{"role": "user", "content": chairman_prompt}]
 
     # Query the chairman model
-    response = await query_model(CHAIRMAN_MODEL, messages)
+    if on_event is not None:
+        def on_delta(text: str):
+            on_event({
+                "type": "stage3_delta",
+                "data": {"model": CHAIRMAN_MODEL, "delta": text},
+            })
+
+        response = await stream_model(
+            CHAIRMAN_MODEL, messages, on_delta, cache=RESPONSE_CACHE_STAGES["stage3"]
+        )
+    else:
+        response = await query_model(
+            CHAIRMAN_MODEL, messages, cache=RESPONSE_CACHE_STAGES["stage3"]
+        )
 
     if response is None:
         # Fallback if chairman fails
+        _record_call_stats("stage3", [], metadata, started)
         return {
             "model": CHAIRMAN_MODEL,
             "response": "Error: Unable to generate final synthesis."
         }
 
-    return {
+    result = {
         "model": CHAIRMAN_MODEL,
-        "response": response.get('content', '')
+        "response": response.get('content', ''),
+        **_call_accounting(CHAIRMAN_MODEL, response),
     }
+    _record_call_stats("stage3", [result], metadata, started)
+    return result
 
 
 def parse_ranking_from_text(ranking_text: str) -> List[str]:
@@ -268,28 +608,23 @@ def parse_ranking_from_text(ranking_text: str) -> List[str]:
     Returns:
         List of response labels in ranked order
     """
-    import re
-
     # Look for "FINAL RANKING:" section
-    if "FINAL RANKING:" in ranking_text:
-        # Extract everything after "FINAL RANKING:"
-        parts = ranking_text.split("FINAL RANKING:")
-        if len(parts) >= 2:
-            ranking_section = parts[1]
-            # Try to extract numbered list format (e.g., "1. Response A")
-            # This pattern looks for: number, period, optional space, "Response X"
-            numbered_matches = re.findall(r'\d+\.\s*Response [A-Z]', ranking_section)
-            if numbered_matches:
-                # Extract just the "Response X" part
-                return [re.search(r'Response [A-Z]', m).group() for m in numbered_matches]
-
-            # Fallback: Extract all "Response X" patterns in order
-            matches = re.findall(r'Response [A-Z]', ranking_section)
-            return matches
+    start = ranking_text.find(_FINAL_RANKING)
+    if start != -1:
+        # Extract everything after "FINAL RANKING:" (up to a repeated marker, if any)
+        start += len(_FINAL_RANKING)
+        end = ranking_text.find(_FINAL_RANKING, start)
+        ranking_section = ranking_text[start:] if end == -1 else ranking_text[start:end]
+        # Try to extract numbered list format (e.g., "1. Response A")
+        numbered_matches = _NUMBERED_LABEL.findall(ranking_section)
+        if numbered_matches:
+            return numbered_matches
+
+        # Fallback: Extract all "Response X" patterns in order
+        return _LABEL.findall(ranking_section)
 
     # Fallback: try to find any "Response X" patterns in order
-    matches = re.findall(r'Response [A-Z]', ranking_text)
-    return matches
+    return _LABEL.findall(ranking_text)
 
 
 def calculate_aggregate_rankings(
@@ -312,10 +647,10 @@ def calculate_aggregate_rankings(
     model_positions = defaultdict(list)
 
     for ranking in stage2_results:
-        ranking_text = ranking['ranking']
-
-        # Parse the ranking from the structured format
-        parsed_ranking = parse_ranking_from_text(ranking_text)
+        # Stage 2 already parsed each ranking; older stored results may not have
+        parsed_ranking = ranking.get('parsed_ranking')
+        if parsed_ranking is None:
+            parsed_ranking = parse_ranking_from_text(ranking['ranking'])
 
         for position, label in enumerate(parsed_ranking, start=1):
             if label in label_to_model:
@@ -358,8 +693,10 @@ Title:"""
 
     messages = [{"role": "user", "content": title_prompt}]
 
-    # Use gemini-2.5-flash for title generation (fast and cheap)
-    response = await query_model("google/gemini-2.5-flash", messages, timeout=30.0)
+    # Use a fast, cheap model for title generation (gemini-2.5-flash by default)
+    response = await query_model(
+        TITLE_MODEL, messages, timeout=30.0, cache=RESPONSE_CACHE_STAGES["title"]
+    )
 
     if response is None:
         # Fallback to a generic title
@@ -377,11 +714,19 @@ Title:"""
     return title
 
 
+def record_turn_usage(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Total the per-stage usage into metadata["usage"]["total"] and return it."""
+    usage = metadata.setdefault("usage", {})
+    usage["total"] = summarize_turn(usage)
+    return usage["total"]
+
+
 async def run_full_council(
     user_query: str,
     models: List[str],
     personas: Optional[List[Dict[str, Any]]] = None,
     subject: Optional[str] = None,
+    deadline: Optional[float] = None,
 ) -> Tuple[List, List, Dict, Dict]:
     """
     Run the complete 3-stage council process.
@@ -391,6 +736,8 @@ async def run_full_council(
         models: List of model identifiers (council members)
         personas: Optional list of persona dicts (one per model)
         subject: Optional discussion subject/topic for chairman context
+        deadline: Optional seconds the whole run may take; every provider
+            call and stage wait inside it is bounded by what is left
 
     Returns:
         Tuple of (stage1_results, stage2_results, stage3_result, metadata)
@@ -401,37 +748,46 @@ async def run_full_council(
             "response": "No models selected. Add at least one persona to the council."
         }, {}
 
-    # Stage 1: Collect individual responses
-    stage1_results = await stage1_collect_responses(user_query, models, personas)
-
-    # If no models responded successfully, return error
-    if not stage1_results:
-        return [], [], {
-            "model": "error",
-            "response": "All models failed to respond. Please try again."
-        }, {}
-
-    # Stage 2: Collect rankings
-    stage2_results, label_to_model = await stage2_collect_rankings(
-        user_query, stage1_results, models, personas
-    )
-
-    # Calculate aggregate rankings
-    aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-
-    # Stage 3: Synthesize final answer
-    stage3_result = await stage3_synthesize_final(
-        user_query,
-        stage1_results,
-        stage2_results,
-        personas=personas,
-        subject=subject,
-    )
+    metadata: Dict[str, Any] = {}
+
+    with request_deadline(deadline):
+        # Stage 1: Collect individual responses (bounded by the stage policy)
+        stage1_results = await stage1_collect_responses(
+            user_query, models, personas, metadata=metadata
+        )
+
+        # If no models responded successfully, return error
+        if not stage1_results or expired():
+            record_turn_usage(metadata)
+            return [], [], {
+                "model": "error",
+                "response": "Request deadline exceeded. Please try again." if expired()
+                else "All models failed to respond. Please try again."
+            }, metadata
+
+        # Stage 2: Collect rankings
+        stage2_results, label_to_model = await stage2_collect_rankings(
+            user_query, stage1_results, models, personas, metadata=metadata
+        )
+
+        # Calculate aggregate rankings
+        aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
+
+        # Stage 3: Synthesize final answer
+        stage3_result = await stage3_synthesize_final(
+            user_query,
+            stage1_results,
+            stage2_results,
+            personas=personas,
+            subject=subject,
+            metadata=metadata,
+        )
 
     # Prepare metadata
-    metadata = {
+    metadata.update({
         "label_to_model": label_to_model,
         "aggregate_rankings": aggregate_rankings
-    }
+    })
+    record_turn_usage(metadata)
 
     return stage1_results, stage2_results, stage3_result, metadata
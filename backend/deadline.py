@@ -0,0 +1,70 @@
+"""Request-scoped deadlines shared by everything a council turn awaits.
+
+The endpoint opens a deadline for the turn; it is held in a context
+variable, so tasks spawned for stages, seats, hedges and retries all see
+it without threading it through every signature. Provider calls clamp
+their timeouts to the time left and stage waits stop at it.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Absolute time.monotonic() by which the current request must finish
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The request ran past its deadline."""
+
+    def __init__(self, message: str = "Request deadline exceeded"):
+        super().__init__(message)
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound everything awaited inside the block to `seconds` from now.
+
+    A deadline already in effect is only ever tightened, never extended.
+
+    Args:
+        seconds: Time budget in seconds (None = no new bound)
+    """
+    if seconds is None:
+        yield
+        return
+    current = _deadline.get()
+    at = time.monotonic() + seconds
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        try:
+            _deadline.reset(token)
+        except ValueError:
+            # Generator-based callers may finish in a different context
+            _deadline.set(current)
+
+
+def time_left() -> Optional[float]:
+    """Seconds until the current deadline (never negative), or None without one."""
+    at = _deadline.get()
+    if at is None:
+        return None
+    return max(0.0, at - time.monotonic())
+
+
+def expired() -> bool:
+    """Whether the current deadline has passed."""
+    left = time_left()
+    return left is not None and left <= 0
+
+
+def clamp_timeout(timeout: Optional[float]) -> Optional[float]:
+    """A timeout shortened to the time left before the deadline."""
+    left = time_left()
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
@@ -0,0 +1,89 @@
+"""Graceful drain before shutdown: refuse new council work and let running turns finish."""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from . import metrics
+from .config import SHUTDOWN_GRACE
+from .jobs import job_queue
+
+# Seconds between checks for in-flight work while draining
+DRAIN_POLL_INTERVAL = 0.1
+
+# Monotonic time by which in-flight work must finish; None while not draining
+_drain_deadline: Optional[float] = None
+
+# Council turns running (streamed, background and non-streaming)
+_in_flight = 0
+
+
+def draining() -> bool:
+    """Whether the app is draining (not ready for new council work)."""
+    return _drain_deadline is not None
+
+
+@contextmanager
+def in_flight() -> Iterator[None]:
+    """Count a council turn as in flight for the duration of the block."""
+    global _in_flight
+    _in_flight += 1
+    try:
+        yield
+    finally:
+        _in_flight -= 1
+
+
+def pending() -> int:
+    """Council turns running plus background jobs still queued."""
+    return _in_flight + job_queue.depth
+
+
+def start_drain(grace: float = SHUTDOWN_GRACE):
+    """
+    Start draining: new council work is refused from now on and running
+    work has `grace` seconds to finish. Later calls keep the first deadline.
+    """
+    global _drain_deadline
+    if _drain_deadline is None:
+        _drain_deadline = time.monotonic() + grace
+        print(f"Draining: refusing new council turns, {pending()} in flight or queued, grace {grace}s")
+
+
+def stop_drain():
+    """Accept council work again (on startup, or when a drain is called off)."""
+    global _drain_deadline
+    _drain_deadline = None
+
+
+async def wait_drained(grace: float = SHUTDOWN_GRACE) -> bool:
+    """
+    Drain (if not already draining) and wait until no council turn is running
+    and no job is queued, or the drain deadline passes.
+
+    Args:
+        grace: Seconds running work may take, counted from the drain start
+
+    Returns:
+        True if everything finished within the grace period
+    """
+    start_drain(grace)
+    while pending() and time.monotonic() < _drain_deadline:
+        await asyncio.sleep(DRAIN_POLL_INTERVAL)
+    if pending():
+        print(f"Drain grace period over with {pending()} council turns in flight or queued")
+        return False
+    return True
+
+
+def _drain_samples() -> Iterable[Tuple[Dict[str, str], float]]:
+    """1 while draining, else 0."""
+    yield {}, 1.0 if draining() else 0.0
+
+
+metrics.register(metrics.Gauge(
+    "council_draining",
+    "1 while the instance drains before shutdown (not ready for new council turns).",
+    collect=_drain_samples,
+))
@@ -0,0 +1,117 @@
+"""Per-turn event logs with monotonic ids, replayable from any point."""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .config import EVENT_LOG_MEMORY_MAX, EVENT_LOG_SPILL_DIR
+
+
+class EventLog:
+    """
+    Append-only log of one turn's events, numbered 1, 2, 3, ...
+
+    Followers replay everything after a given id and then receive new
+    events live until the log is closed. The newest `memory_max` events are
+    kept in memory; older ones are appended to a JSONL file under
+    `spill_dir` when set, and otherwise dropped, in which case a replay
+    starts at the oldest event still held.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        memory_max: int = EVENT_LOG_MEMORY_MAX,
+        spill_dir: Optional[str] = EVENT_LOG_SPILL_DIR,
+    ):
+        self.name = name
+        self.memory_max = memory_max
+        self.spill_path = os.path.join(spill_dir, f"{name}.jsonl") if spill_dir else None
+        self.last_id = 0
+        self.closed = False
+        self._events: List[Dict[str, Any]] = []
+        # Id of self._events[0]; lower ids are spilled (or dropped)
+        self._first_id = 1
+        self._spilled = False
+        self._changed = asyncio.Event()
+
+    def _notify(self):
+        """Wake every follower waiting for new events or the close."""
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def append(self, event: Dict[str, Any]) -> int:
+        """Add an event; returns its id."""
+        self.last_id += 1
+        self._events.append(event)
+        if len(self._events) > self.memory_max:
+            self._evict(len(self._events) - self.memory_max // 2)
+        self._notify()
+        return self.last_id
+
+    def _evict(self, count: int):
+        """Move the oldest `count` in-memory events to the spill file (or drop them)."""
+        evicted, self._events = self._events[:count], self._events[count:]
+        if self.spill_path is not None:
+            try:
+                Path(self.spill_path).parent.mkdir(parents=True, exist_ok=True)
+                with open(self.spill_path, 'a') as f:
+                    for offset, event in enumerate(evicted):
+                        f.write(json.dumps({"id": self._first_id + offset, "event": event}) + "\n")
+                self._spilled = True
+            except OSError as e:
+                print(f"Event log {self.name}: error spilling to {self.spill_path}: {e}")
+        self._first_id += count
+
+    def close(self):
+        """Mark the log finished; followers stop after the last event."""
+        self.closed = True
+        self._notify()
+
+    def discard(self):
+        """Remove the spill file, if any."""
+        if self._spilled:
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+
+    def _read_spilled(self, after: int, before: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Spilled events with after < id < before."""
+        if not self._spilled:
+            return []
+        events = []
+        try:
+            with open(self.spill_path) as f:
+                for line in f:
+                    record = json.loads(line)
+                    if after < record["id"] < before:
+                        events.append((record["id"], record["event"]))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Event log {self.name}: error reading {self.spill_path}: {e}")
+        return events
+
+    async def follow(self, after: int = 0) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield (id, event) for every event with id > `after`, live until closed.
+
+        Args:
+            after: Last event id the follower already has (0 = from the start)
+        """
+        while True:
+            if after + 1 < self._first_id:
+                # Older than memory holds: replay from the spill file, if any
+                before = self._first_id
+                for item in self._read_spilled(after, before):
+                    yield item
+                after = before - 1
+                continue
+            if after < self.last_id:
+                after += 1
+                yield after, self._events[after - self._first_id]
+                continue
+            if self.closed:
+                return
+            await self._changed.wait()
@@ -0,0 +1,212 @@
+"""Background council jobs: a bounded queue drained by a fixed pool of asyncio workers."""
+
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import metrics
+from .config import JOB_WORKERS, JOB_QUEUE_MAX, JOB_RETENTION
+from .events import EventLog
+
+# Job work: receives the job's emit callback and returns its result (None on failure)
+JobRun = Callable[[Callable[[Dict[str, Any]], None]], Awaitable[Optional[Dict[str, Any]]]]
+
+# Job statuses; the last three are final
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+_FINAL = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class QueueFull(Exception):
+    """The job queue is at JOB_QUEUE_MAX."""
+
+
+class Job:
+    """A submitted council turn: status, timestamps, result and a log of the events it emitted."""
+
+    def __init__(self, conversation_id: str, run: JobRun):
+        self.id = str(uuid.uuid4())
+        self.conversation_id = conversation_id
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.log = EventLog(f"job-{self.id}")
+        self._run = run
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in _FINAL
+
+    def emit(self, event: Dict[str, Any]):
+        """Record an event emitted by the job's turn."""
+        self.log.append(event)
+        if event.get("type") == "error":
+            self.error = event.get("message")
+
+    def finish(self, status: str, result: Optional[Dict[str, Any]] = None):
+        """Move to a final status."""
+        self.status = status
+        self.result = result
+        self.finished_at = time.time()
+        metrics.jobs_finished.inc(status=status)
+        self.log.close()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Job state for the API."""
+        return {
+            "id": self.id,
+            "conversation_id": self.conversation_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "last_event_id": self.log.last_id,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+class JobQueue:
+    """
+    FIFO of council jobs run by `workers` asyncio workers.
+
+    Submissions beyond `max_queued` waiting jobs are refused rather than
+    queued without bound. A job cancelled while waiting stays in the
+    asyncio.Queue until a worker dequeues and skips it, so waiting jobs are
+    counted separately. Finished jobs stay queryable for `retention` seconds.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, max_queued: int = JOB_QUEUE_MAX, retention: float = JOB_RETENTION):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.retention = retention
+        self.busy = 0
+        self._queued = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: Dict[str, Job] = {}
+
+    def start(self):
+        """Start the worker pool (on the running event loop)."""
+        self._queue = asyncio.Queue()
+        self._queued = 0
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Stop the workers and cancel every unfinished job."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        tasks = []
+        for job in self._jobs.values():
+            if job._task is not None:
+                job._task.cancel()
+                tasks.append(job._task)
+            if not job.done:
+                job.finish(CANCELLED)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._queued = 0
+
+    @property
+    def depth(self) -> int:
+        """Jobs waiting for a worker."""
+        return self._queued
+
+    def submit(self, conversation_id: str, run: JobRun) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            conversation_id: Conversation the job's turn belongs to
+            run: Coroutine function doing the work (see JobRun)
+
+        Returns:
+            The queued Job
+
+        Raises:
+            QueueFull: max_queued jobs are already waiting
+        """
+        if self._queue is None:
+            raise RuntimeError("Job queue is not started")
+        if self._queued >= self.max_queued:
+            raise QueueFull(f"{self.max_queued} jobs already queued")
+        job = Job(conversation_id, run)
+        self._queue.put_nowait(job)
+        self._queued += 1
+        self._prune()
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """A job by id, if still retained."""
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job; returns it, or None if unknown."""
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return job
+        if job._task is not None:
+            job._task.cancel()
+        else:
+            job.finish(CANCELLED)  # The worker skips it when dequeued
+            self._queued -= 1
+        return job
+
+    def _prune(self):
+        """Forget jobs that finished more than `retention` seconds ago."""
+        cutoff = time.time() - self.retention
+        for job in [j for j in self._jobs.values() if j.done and j.finished_at < cutoff]:
+            del self._jobs[job.id]
+            job.log.discard()
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            if job.done:
+                continue
+            self._queued -= 1
+            metrics.job_wait_duration.observe(time.time() - job.created_at)
+            self.busy += 1
+            job.status = RUNNING
+            job.started_at = time.time()
+            job._task = asyncio.create_task(job._run(job.emit))
+            try:
+                # wait() leaves the job running if the worker itself is cancelled; stop() handles it
+                await asyncio.wait({job._task})
+            finally:
+                self.busy -= 1
+            if job.done:
+                continue
+            if job._task.cancelled():
+                job.finish(CANCELLED)
+            elif job._task.exception() is not None:
+                job.error = str(job._task.exception())
+                job.finish(FAILED)
+            else:
+                result = job._task.result()
+                job.finish(SUCCEEDED if result is not None else FAILED, result)
+
+
+# Process-wide queue, started and stopped with the app
+job_queue = JobQueue()
+
+
+def _job_samples() -> Iterable[Tuple[Dict[str, str], float]]:
+    """Queued jobs and busy/total workers."""
+    yield {"state": "queued"}, job_queue.depth
+    yield {"state": "busy_workers"}, job_queue.busy
+    yield {"state": "workers"}, job_queue.workers
+
+
+metrics.register(metrics.Gauge(
+    "council_job_queue",
+    "Background council jobs waiting for a worker, and busy and total workers (utilization = busy/total).",
+    ("state",),
+    collect=_job_samples,
+))
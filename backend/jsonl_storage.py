@@ -0,0 +1,315 @@
+"""Append-only JSONL storage for conversations (STORAGE_BACKEND=jsonl).
+
+Same functions as storage.py. Each conversation is a log at
+DATA_DIR/<id>.jsonl whose first line is a small header record (id,
+created_at, title, and how many messages follow it as of the last
+compaction), followed by one record per message and "meta" records that
+update header fields:
+
+    {"type": "header", "id": "...", "created_at": "...", "title": "New Conversation", "compacted": 0}
+    {"type": "message", "message": {"role": "user", "content": "..."}}
+    {"type": "meta", "title": "..."}
+
+Writes append one record, so their cost no longer grows with the
+conversation; reads stream the log line by line, and listings come from an
+in-memory metadata index kept current by the writes. Once more than
+JSONL_COMPACT_AFTER records (messages or meta) have been appended since the
+last compaction, the next read rewrites the log as header + messages, folding
+in superseded meta records. A line left incomplete by a crash mid-append is
+skipped and dropped at compaction. Conversations still stored as <id>.json
+are converted on first access; the JSON file is left in place, so switching
+back to the json backend still finds them (as they were before conversion).
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .config import DATA_DIR, JSONL_COMPACT_AFTER
+from .tracing import traced
+from .conversation_index import ConversationIndex
+
+# Line prefixes of message and meta records (json.dumps writes "type" first)
+_MESSAGE_PREFIX = '{"type": "message"'
+_META_PREFIX = '{"type": "meta"'
+
+
+def _conversation_attributes(conversation_id: str, *args, **kwargs) -> Dict[str, Any]:
+    """Span attributes for storage calls keyed by conversation id."""
+    return {"conversation.id": conversation_id}
+
+
+def ensure_data_dir():
+    """Ensure the data directory exists."""
+    Path(DATA_DIR).mkdir(parents=True, exist_ok=True)
+
+
+def get_conversation_path(conversation_id: str) -> str:
+    """Get the log path for a conversation."""
+    return os.path.join(DATA_DIR, f"{conversation_id}.jsonl")
+
+
+def _write_log(conversation: Dict[str, Any]):
+    """Write a conversation as a compacted log (header + messages), atomically."""
+    ensure_data_dir()
+    path = get_conversation_path(conversation["id"])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps({
+            "type": "header",
+            "id": conversation["id"],
+            "created_at": conversation["created_at"],
+            "title": conversation.get("title", "New Conversation"),
+            "compacted": len(conversation["messages"]),
+        }) + "\n")
+        for message in conversation["messages"]:
+            f.write(json.dumps({"type": "message", "message": message}) + "\n")
+    os.replace(tmp_path, path)
+    _index.put({
+        "id": conversation["id"],
+        "created_at": conversation["created_at"],
+        "title": conversation.get("title", "New Conversation"),
+        "message_count": len(conversation["messages"])
+    })
+
+
+def _convert_legacy(conversation_id: str) -> bool:
+    """
+    Convert a conversation stored as <id>.json to a log, unless it already
+    has one; returns whether a log exists now. The JSON file is kept.
+    """
+    if os.path.exists(get_conversation_path(conversation_id)):
+        return True
+    legacy_path = os.path.join(DATA_DIR, f"{conversation_id}.json")
+    if not os.path.exists(legacy_path):
+        return False
+    with open(legacy_path, 'r') as f:
+        _write_log(json.load(f))
+    return True
+
+
+def _exists(conversation_id: str) -> bool:
+    """Whether a conversation exists, converting a legacy JSON file if needed."""
+    return os.path.exists(get_conversation_path(conversation_id)) or _convert_legacy(conversation_id)
+
+
+def _read_records(path: str) -> Iterator[Optional[Dict[str, Any]]]:
+    """Stream a log's records; a line torn by a crash mid-append yields None."""
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping incomplete record in {path}")
+                yield None
+
+
+def _append(conversation_id: str, record: Dict[str, Any]):
+    """Append one record to a conversation's log."""
+    if not _exists(conversation_id):
+        raise ValueError(f"Conversation {conversation_id} not found")
+    line = (json.dumps(record) + "\n").encode()
+    with open(get_conversation_path(conversation_id), 'a+b') as f:
+        # Start on a fresh line if a previous append was torn
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = b"\n" + line
+        f.write(line)
+
+
+@traced("storage.create_conversation", attributes=_conversation_attributes)
+def create_conversation(conversation_id: str) -> Dict[str, Any]:
+    """
+    Create a new conversation.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+
+    Returns:
+        New conversation dict
+    """
+    conversation = {
+        "id": conversation_id,
+        "created_at": datetime.utcnow().isoformat(),
+        "title": "New Conversation",
+        "messages": []
+    }
+    _write_log(conversation)
+    return conversation
+
+
+@traced("storage.get_conversation", attributes=_conversation_attributes)
+def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a conversation from storage, compacting its log if due.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+
+    Returns:
+        Conversation dict or None if not found
+    """
+    if not _exists(conversation_id):
+        return None
+
+    conversation: Optional[Dict[str, Any]] = None
+    compacted = 0
+    appended = 0
+    torn = False
+    for record in _read_records(get_conversation_path(conversation_id)):
+        if record is None:
+            torn = True
+            continue
+        kind = record.pop("type", None)
+        if kind == "header":
+            compacted = record.pop("compacted", 0)
+            conversation = {**record, "messages": []}
+        elif conversation is None:
+            continue
+        elif kind == "message":
+            conversation["messages"].append(record["message"])
+            if len(conversation["messages"]) > compacted:
+                appended += 1
+        elif kind == "meta":
+            conversation.update(record)
+            appended += 1
+    if conversation is None:
+        print(f"Conversation log {get_conversation_path(conversation_id)} has no header")
+        return None
+
+    if appended > JSONL_COMPACT_AFTER or torn:
+        _write_log(conversation)
+    return conversation
+
+
+@traced("storage.save_conversation", attributes=lambda conversation: {"conversation.id": conversation["id"]})
+def save_conversation(conversation: Dict[str, Any]):
+    """
+    Save a conversation to storage (rewriting its log compacted).
+
+    Args:
+        conversation: Conversation dict to save
+    """
+    _write_log(conversation)
+
+
+def _scan_conversations() -> Iterable[Dict[str, Any]]:
+    """
+    Metadata of every stored conversation, read from the logs (builds the
+    index). Only header and meta records are parsed; message records are
+    counted by their prefix.
+    """
+    ensure_data_dir()
+
+    for filename in os.listdir(DATA_DIR):
+        if filename.endswith('.json'):
+            _convert_legacy(filename[:-len('.json')])
+
+    for filename in os.listdir(DATA_DIR):
+        if not filename.endswith('.jsonl'):
+            continue
+        path = os.path.join(DATA_DIR, filename)
+        metadata: Optional[Dict[str, Any]] = None
+        message_count = 0
+        with open(path, 'r') as f:
+            for number, line in enumerate(f):
+                if line.startswith(_MESSAGE_PREFIX):
+                    message_count += 1
+                elif number == 0 or line.startswith(_META_PREFIX):
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if number == 0:
+                        metadata = record
+                    elif metadata is not None:
+                        metadata.update(record)
+        if metadata is None:
+            continue
+        yield {
+            "id": metadata["id"],
+            "created_at": metadata["created_at"],
+            "title": metadata.get("title", "New Conversation"),
+            "message_count": message_count
+        }
+
+
+# Listing metadata, built on the first listing and kept current by the write paths
+_index = ConversationIndex(_scan_conversations)
+
+
+@traced("storage.list_conversations")
+def list_conversations(limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+    """
+    List conversations (metadata only), newest first.
+
+    Served from the in-memory metadata index, so the cost is proportional to
+    the page returned; the logs are only scanned to build the index once.
+
+    Args:
+        limit: Maximum number of conversations to return (None = all)
+        offset: Number of newest conversations to skip
+
+    Returns:
+        List of conversation metadata dicts
+    """
+    return _index.page(limit, offset)
+
+
+@traced("storage.add_user_message", attributes=_conversation_attributes)
+def add_user_message(conversation_id: str, content: str):
+    """
+    Add a user message to a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        content: User message content
+    """
+    _append(conversation_id, {"type": "message", "message": {"role": "user", "content": content}})
+    _index.add_message(conversation_id)
+
+
+@traced("storage.add_assistant_message", attributes=_conversation_attributes)
+def add_assistant_message(
+    conversation_id: str,
+    stage1: List[Dict[str, Any]],
+    stage2: List[Dict[str, Any]],
+    stage3: Dict[str, Any],
+    usage: Optional[Dict[str, Any]] = None,
+):
+    """
+    Add an assistant message with all 3 stages to a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        stage1: List of individual model responses
+        stage2: List of model rankings
+        stage3: Final synthesized response
+        usage: Optional per-stage and total token/cost/latency accounting
+    """
+    message = {
+        "role": "assistant",
+        "stage1": stage1,
+        "stage2": stage2,
+        "stage3": stage3
+    }
+    if usage is not None:
+        message["usage"] = usage
+    _append(conversation_id, {"type": "message", "message": message})
+    _index.add_message(conversation_id)
+
+
+@traced("storage.update_conversation_title", attributes=_conversation_attributes)
+def update_conversation_title(conversation_id: str, title: str):
+    """
+    Update the title of a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        title: New title for the conversation
+    """
+    _append(conversation_id, {"type": "meta", "title": title})
+    _index.update(conversation_id, title=title)
@@ -1,25 +1,37 @@
 """FastAPI backend for LLM Council."""
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, PlainTextResponse, JSONResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+from contextlib import asynccontextmanager
 import uuid
 import json
 import asyncio
 
 from . import storage
 from . import persona_storage
+from . import metrics
+from . import tracing
+from . import drain
 from .config import COUNCIL_MODELS, CHAIRMAN_MODEL
-from .council import (
-    run_full_council,
-    generate_conversation_title,
-    stage1_collect_responses,
-    stage2_collect_rankings,
-    stage3_synthesize_final,
-    calculate_aggregate_rankings,
+from .turns import (
+    Turn, run_turn, start_turn, await_turn, get_turn, latest_turn, watch_turn,
+    resume_interrupted_turns, shutdown_turns,
 )
+from .jobs import job_queue, QueueFull
+from .providers import open_clients, close_clients
+
+
+def _refuse_if_draining():
+    """Refuse new council work with 503 while the instance drains for shutdown."""
+    if drain.draining():
+        raise HTTPException(
+            status_code=503,
+            detail="Server is shutting down; retry shortly",
+            headers={"Retry-After": "5"},
+        )
 
 
 def _resolve_personas(persona_ids: List[str] | None) -> tuple[List[Dict[str, Any]], List[str]]:
@@ -53,7 +65,127 @@ def _resolve_personas(persona_ids: List[str] | None) -> tuple[List[Dict[str, Any
 
     return personas, models
 
-app = FastAPI(title="LLM Council API")
+
+def _sse(event: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Format an event dict as a Server-Sent Events message, with an id when given."""
+    if event_id is None:
+        return f"data: {json.dumps(event)}\n\n"
+    return f"id: {event_id}\ndata: {json.dumps(event)}\n\n"
+
+
+def _last_event_id(http_request: Request, last_event_id: Optional[int]) -> int:
+    """Resume point: the Last-Event-ID header, else the query parameter, else 0."""
+    header = http_request.headers.get("last-event-id")
+    if header and header.strip().isdigit():
+        return int(header)
+    return last_event_id or 0
+
+
+def _event_stream_response(body: AsyncIterator[str], headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """StreamingResponse for Server-Sent Events."""
+    return StreamingResponse(
+        body,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            **(headers or {}),
+        }
+    )
+
+
+# Seconds between checks for a streaming client that has gone away
+DISCONNECT_POLL_INTERVAL = 0.5
+
+
+class ClientDisconnected(Exception):
+    """The client of a streaming request disconnected."""
+
+
+async def _watch_disconnect(request: Request, disconnected: asyncio.Event):
+    """Set `disconnected` once the client of a streaming request goes away."""
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+    disconnected.set()
+
+
+async def _stream_events(
+    events: AsyncIterator[Tuple[int, Dict[str, Any]]],
+    disconnected: Optional[asyncio.Event] = None,
+) -> AsyncIterator[str]:
+    """
+    Yield SSE messages (with ids) for (id, event) pairs until `events` ends.
+
+    Raises:
+        ClientDisconnected: `disconnected` was set
+    """
+    watcher = asyncio.ensure_future(disconnected.wait()) if disconnected is not None else None
+    getter = None
+    try:
+        while True:
+            getter = asyncio.ensure_future(events.__anext__())
+            waiting = {getter} if watcher is None else {getter, watcher}
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                raise ClientDisconnected()
+            try:
+                event_id, event = getter.result()
+            except StopAsyncIteration:
+                return
+            yield _sse(event, event_id)
+    finally:
+        # Also reached when the stream itself is cancelled mid-wait; the event
+        # source is closed so it sees the client go
+        if watcher is not None:
+            watcher.cancel()
+        if getter is not None and not getter.done():
+            getter.cancel()
+            await asyncio.wait({getter})
+        await events.aclose()
+
+
+async def _stream_turn(turn: Turn, after: int, http_request: Request) -> AsyncIterator[str]:
+    """
+    SSE body following a turn from event id `after`. A client leaving only
+    detaches it; the turn keeps running for a reconnect (see watch_turn).
+    """
+    disconnected = asyncio.Event()
+    watcher = asyncio.create_task(_watch_disconnect(http_request, disconnected))
+    try:
+        async for message in _stream_events(watch_turn(turn, after), disconnected):
+            yield message
+    except ClientDisconnected:
+        print(f"Client detached from turn {turn.id} in conversation {turn.conversation_id}")
+    finally:
+        watcher.cancel()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open pooled provider clients, start job workers and resume checkpointed
+    turns on startup. On shutdown drain: running turns and queued jobs get
+    SHUTDOWN_GRACE seconds to finish, then the rest are cancelled (keeping
+    their checkpoints) and the clients are closed.
+    """
+    await open_clients()
+    drain.stop_drain()
+    job_queue.start()
+    resume_interrupted_turns()
+    try:
+        yield
+    finally:
+        await drain.wait_drained()
+        await shutdown_turns()
+        await job_queue.stop()
+        await close_clients()
+        tracing.shutdown()
+
+
+app = FastAPI(title="LLM Council API", lifespan=lifespan)
+
+# Request counts/latency per route, served at /metrics
+app.add_middleware(metrics.MetricsMiddleware)
 
 # Enable CORS for local development
 app.add_middleware(
@@ -115,6 +247,31 @@ async def root():
     return {"status": "ok", "service": "LLM Council API"}
 
 
+@app.get("/ready")
+async def ready():
+    """Readiness check: 503 while the instance drains for shutdown."""
+    if drain.draining():
+        return JSONResponse({"status": "draining", "pending": drain.pending()}, status_code=503)
+    return {"status": "ready"}
+
+
+@app.post("/api/drain", status_code=202)
+async def start_drain():
+    """
+    Start draining ahead of a shutdown (e.g. from a preStop hook): new council
+    turns are refused and /ready reports not-ready, while running turns and
+    queued jobs carry on. The grace period counts from this call.
+    """
+    drain.start_drain()
+    return {"status": "draining", "pending": drain.pending()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Operational metrics in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/api/config")
 async def get_config():
     """Get council configuration and providers/models for frontend.
@@ -180,9 +337,9 @@ async def delete_persona(persona_id: str):
 
 
 @app.get("/api/conversations", response_model=List[ConversationMetadata])
-async def list_conversations():
-    """List all conversations (metadata only)."""
-    return storage.list_conversations()
+async def list_conversations(limit: Optional[int] = Query(None, ge=1), offset: int = Query(0, ge=0)):
+    """List conversations (metadata only), newest first; limit/offset select a page."""
+    return storage.list_conversations(limit=limit, offset=offset)
 
 
 @app.post("/api/conversations", response_model=Conversation)
@@ -206,58 +363,114 @@ async def get_conversation(conversation_id: str):
 async def send_message(conversation_id: str, request: SendMessageRequest):
     """
     Send a message and run the 3-stage council process.
-    Returns the complete response with all stages.
+    Returns the complete response with all stages, all within REQUEST_DEADLINE.
+
+    The turn is checkpointed like streamed turns and jobs: if the server
+    shuts down or restarts mid-turn, it resumes on startup and its answer is
+    saved to the conversation.
     """
+    _refuse_if_draining()
+
     # Check if conversation exists
     conversation = storage.get_conversation(conversation_id)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
+    # Resolve personas and get models (raises 400 if invalid)
+    personas, models = _resolve_personas(request.persona_ids)
+    if not models:
+        models = COUNCIL_MODELS
+        personas = None
+
     # Check if this is the first message
     is_first_message = len(conversation["messages"]) == 0
 
     # Add user message
     storage.add_user_message(conversation_id, request.content)
 
-    # If this is the first message, generate a title
-    if is_first_message:
-        title = await generate_conversation_title(request.content)
-        storage.update_conversation_title(conversation_id, title)
+    # Only the turn's outcome matters here; keep the reason if it fails
+    errors: List[str] = []
+
+    def collect(event: Dict[str, Any]):
+        if event["type"] == "error":
+            errors.append(event["message"])
+
+    result = await await_turn(
+        conversation_id, request.content, models, personas, request.subject,
+        is_first_message, emit=collect,
+    )
+    if result is None:
+        # Cancelled by a shutdown: the checkpointed turn resumes after restart
+        status_code = 503 if drain.draining() else 500
+        raise HTTPException(status_code=status_code, detail=errors[-1] if errors else "Council turn failed")
+    return result
+
+
+@app.post("/api/conversations/{conversation_id}/message/stream")
+async def send_message_stream(conversation_id: str, request: SendMessageRequest, http_request: Request):
+    """
+    Send a message and stream the 3-stage council process.
+    Returns Server-Sent Events as each stage completes.
+
+    Events carry ids and the turn id is returned in the X-Turn-Id header. A
+    client that loses the stream can resume it with GET on this path and
+    Last-Event-ID; the turn keeps running for TURN_RESUME_GRACE seconds
+    without a client and is then cancelled. It is bounded by REQUEST_DEADLINE.
+    """
+    _refuse_if_draining()
+
+    # Check if conversation exists
+    conversation = storage.get_conversation(conversation_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
 
-    # Resolve personas and get models (dynamic council)
+    # Resolve personas and get models (raises 400 if invalid)
     personas, models = _resolve_personas(request.persona_ids)
     if not models:
         models = COUNCIL_MODELS
         personas = None
 
-    # Run the 3-stage council process
-    stage1_results, stage2_results, stage3_result, metadata = await run_full_council(
-        request.content, models, personas, subject=request.subject
-    )
+    # Check if this is the first message
+    is_first_message = len(conversation["messages"]) == 0
 
-    # Add assistant message with all stages
-    storage.add_assistant_message(
-        conversation_id,
-        stage1_results,
-        stage2_results,
-        stage3_result
-    )
+    # Add user message
+    storage.add_user_message(conversation_id, request.content)
 
-    # Return the complete response with metadata
-    return {
-        "stage1": stage1_results,
-        "stage2": stage2_results,
-        "stage3": stage3_result,
-        "metadata": metadata
-    }
+    turn = start_turn(conversation_id, request.content, models, personas, request.subject, is_first_message)
+    return _event_stream_response(_stream_turn(turn, 0, http_request), headers={"X-Turn-Id": turn.id})
 
 
-@app.post("/api/conversations/{conversation_id}/message/stream")
-async def send_message_stream(conversation_id: str, request: SendMessageRequest):
+@app.get("/api/conversations/{conversation_id}/message/stream")
+async def resume_message_stream(
+    conversation_id: str,
+    http_request: Request,
+    turn_id: Optional[str] = None,
+    last_event_id: Optional[int] = None,
+):
     """
-    Send a message and stream the 3-stage council process.
-    Returns Server-Sent Events as each stage completes.
+    Resume the stream of a running or recently finished turn (the
+    conversation's latest unless turn_id is given): events after
+    Last-Event-ID (header, or last_event_id query parameter) are replayed,
+    then new ones follow live. No stage is re-run.
     """
+    turn = get_turn(turn_id) if turn_id else latest_turn(conversation_id)
+    if turn is None or turn.conversation_id != conversation_id:
+        raise HTTPException(status_code=404, detail="No active turn for this conversation")
+
+    after = _last_event_id(http_request, last_event_id)
+    return _event_stream_response(_stream_turn(turn, after, http_request), headers={"X-Turn-Id": turn.id})
+
+
+@app.post("/api/conversations/{conversation_id}/message/jobs", status_code=202)
+async def submit_message_job(conversation_id: str, request: SendMessageRequest):
+    """
+    Send a message and queue its 3-stage council run as a background job.
+    Returns the job at once; poll GET /api/jobs/{job_id} or stream its
+    events from /api/jobs/{job_id}/events. Responds 503 when the queue is full
+    or the instance is draining.
+    """
+    _refuse_if_draining()
+
     # Check if conversation exists
     conversation = storage.get_conversation(conversation_id)
     if conversation is None:
@@ -272,71 +485,54 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
     # Check if this is the first message
     is_first_message = len(conversation["messages"]) == 0
 
-    async def event_generator():
-        try:
-            # Add user message
-            storage.add_user_message(conversation_id, request.content)
+    async def run(emit):
+        return await run_turn(
+            conversation_id, request.content, models, personas, request.subject,
+            is_first_message, emit=emit,
+        )
 
-            # Start title generation in parallel (don't await yet)
-            title_task = None
-            if is_first_message:
-                title_task = asyncio.create_task(generate_conversation_title(request.content))
+    try:
+        job = job_queue.submit(conversation_id, run)
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
 
-            # Stage 1: Collect responses
-            yield f"data: {json.dumps({'type': 'stage1_start'})}\n\n"
-            stage1_results = await stage1_collect_responses(
-                request.content, models, personas
-            )
-            yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results})}\n\n"
+    # Add user message
+    storage.add_user_message(conversation_id, request.content)
+    return job.to_dict()
 
-            # Stage 2: Collect rankings
-            yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
-            stage2_results, label_to_model = await stage2_collect_rankings(
-                request.content, stage1_results, models, personas
-            )
-            aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-            yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}})}\n\n"
-
-            # Stage 3: Synthesize final answer
-            yield f"data: {json.dumps({'type': 'stage3_start'})}\n\n"
-            stage3_result = await stage3_synthesize_final(
-                request.content,
-                stage1_results,
-                stage2_results,
-                personas=personas,
-                subject=request.subject,
-            )
-            yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result})}\n\n"
-
-            # Wait for title generation if it was started
-            if title_task:
-                title = await title_task
-                storage.update_conversation_title(conversation_id, title)
-                yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
-
-            # Save complete assistant message
-            storage.add_assistant_message(
-                conversation_id,
-                stage1_results,
-                stage2_results,
-                stage3_result
-            )
 
-            # Send completion event
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get a background job's status and, once finished, its result."""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
 
-        except Exception as e:
-            # Send error event
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
 
-    return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-        }
-    )
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, http_request: Request, last_event_id: Optional[int] = None):
+    """
+    Stream a background job's events as Server-Sent Events: those after
+    Last-Event-ID (header, or last_event_id query parameter) are replayed,
+    then new ones follow live until the job finishes. Disconnecting does
+    not affect the job.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    after = _last_event_id(http_request, last_event_id)
+    return _event_stream_response(_stream_events(job.log.follow(after)))
+
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running background job."""
+    job = job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,323 @@
+"""In-process metrics rendered in the Prometheus text exposition format."""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets (seconds) sized for LLM calls: sub-second cache hits up to
+# multi-minute council runs
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    """Render {name="value",...}; empty when there are no labels."""
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value; whole numbers without a trailing .0."""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric(ABC):
+    """Base for a metric family with a fixed set of label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Sample lines of the family in text format."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down; optionally computed at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Tuple[str, ...] = (),
+        collect: Optional[Callable[[], Iterable[Tuple[Dict[str, str], float]]]] = None,
+    ):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels: str):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[str]:
+        if self._collect is not None:
+            items = sorted((self._key(labels), value) for labels, value in self._collect())
+        else:
+            with self._lock:
+                items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts, sum, count)
+        self._values: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(c), s, n)) for key, (c, s, n) in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.label_names, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(self.label_names, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {count}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+_registry: List[_Metric] = []
+
+
+def register(metric: _Metric) -> _Metric:
+    """Add a metric to the registry served by render()."""
+    _registry.append(metric)
+    return metric
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text format (version 0.0.4)."""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+
+# HTTP API
+http_requests = register(Counter(
+    "council_http_requests_total", "HTTP requests handled, by route template and status.",
+    ("method", "route", "status"),
+))
+http_request_duration = register(Histogram(
+    "council_http_request_duration_seconds",
+    "HTTP request duration until the response body completes (whole SSE stream included).",
+    ("method", "route"),
+))
+
+# Provider calls (one observation per attempt)
+provider_calls = register(Counter(
+    "council_provider_calls_total", "Provider call attempts, by outcome (ok or error).",
+    ("provider", "model", "outcome"),
+))
+provider_call_duration = register(Histogram(
+    "council_provider_call_duration_seconds", "Provider call attempt latency.",
+    ("provider", "model"),
+))
+provider_errors = register(Counter(
+    "council_provider_errors_total",
+    "Failed provider call attempts, by kind (timeout, connection, rate_limited, server, client, other).",
+    ("provider", "model", "kind"),
+))
+provider_timeouts = register(Counter(
+    "council_provider_timeouts_total", "Provider call attempts that timed out.",
+    ("provider", "model"),
+))
+provider_retries = register(Counter(
+    "council_provider_retries_total", "Provider call retries.",
+    ("provider", "model"),
+))
+
+# Council runs
+council_runs_in_flight = register(Gauge(
+    "council_runs_in_flight", "Council turns currently running.",
+))
+stage_duration = register(Histogram(
+    "council_stage_duration_seconds", "Council stage wall-clock duration.",
+    ("stage",),
+))
+council_turns_abandoned = register(Counter(
+    "council_turns_abandoned_total",
+    "Council turns cut short, by reason (client_disconnect or deadline).",
+    ("reason",),
+))
+council_turns_resumed = register(Counter(
+    "council_turns_resumed_total", "Council turns resumed from a checkpoint after a restart.",
+))
+
+# Background jobs
+jobs_finished = register(Counter(
+    "council_jobs_finished_total", "Background council jobs finished, by status.",
+    ("status",),
+))
+job_wait_duration = register(Histogram(
+    "council_job_wait_seconds", "Time background council jobs spent queued before a worker took them.",
+))
+
+# Caching
+response_cache_lookups = register(Counter(
+    "council_response_cache_lookups_total", "Response cache lookups, by result (hit or miss).",
+    ("result",),
+))
+coalesced_requests = register(Counter(
+    "council_coalesced_requests_total", "Calls served by joining an identical in-flight request.",
+))
+prompt_tokens = register(Counter(
+    "council_prompt_tokens_total",
+    "Prompt tokens sent to providers, by whether they were read from the provider's prompt cache.",
+    ("provider", "model", "cache"),
+))
+
+
+def observe_http(method: str, route: str, status: int, seconds: float):
+    """Record one handled HTTP request."""
+    http_requests.inc(method=method, route=route, status=str(status))
+    http_request_duration.observe(seconds, method=method, route=route)
+
+
+def observe_provider_call(
+    provider: str,
+    model: str,
+    seconds: float,
+    error_kind: Optional[str] = None,
+    usage: Optional[Dict[str, int]] = None,
+):
+    """Record one provider call attempt; error_kind is None on success."""
+    provider_calls.inc(provider=provider, model=model, outcome="ok" if error_kind is None else "error")
+    provider_call_duration.observe(seconds, provider=provider, model=model)
+    if error_kind is not None:
+        provider_errors.inc(provider=provider, model=model, kind=error_kind)
+        if error_kind == "timeout":
+            provider_timeouts.inc(provider=provider, model=model)
+    if usage:
+        cached = usage.get("cache_read_tokens", 0)
+        prompt_tokens.inc(cached, provider=provider, model=model, cache="read")
+        prompt_tokens.inc(max(0, usage.get("input_tokens", 0) - cached), provider=provider, model=model, cache="miss")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts and durations per route template.
+
+    Duration runs until the last body chunk is sent, so streamed (SSE)
+    responses are measured end to end. Paths that match no route share the
+    "unmatched" label to keep label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        status = 500
+        recorded = False
+
+        def record():
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            observe_http(scope["method"], route, status, time.monotonic() - started)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Errors and client disconnects end the request without a final body
+            record()
@@ -78,9 +78,9 @@ async def _fetch_openai_models() -> List[str]:
         return STATIC_FALLBACK["openai"]
 
     try:
-        from openai import AsyncOpenAI
+        from .providers.clients import get_openai_client
 
-        client = AsyncOpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         models = []
         async for model in client.models.list():
             mid = getattr(model, "id", None) or getattr(model, "name", None)
@@ -99,9 +99,9 @@ async def _fetch_xai_models() -> List[str]:
         return STATIC_FALLBACK["x-ai"]
 
     try:
-        from openai import AsyncOpenAI
+        from .providers.clients import get_openai_client, XAI_BASE_URL
 
-        client = AsyncOpenAI(api_key=api_key, base_url="https://api.x.ai/v1")
+        client = get_openai_client(api_key, XAI_BASE_URL)
         models = []
         async for model in client.models.list():
             mid = getattr(model, "id", None) or getattr(model, "name", None)
@@ -120,9 +120,9 @@ async def _fetch_anthropic_models() -> List[str]:
         return STATIC_FALLBACK["anthropic"]
 
     try:
-        from anthropic import AsyncAnthropic
+        from .providers.clients import get_anthropic_client
 
-        client = AsyncAnthropic(api_key=api_key)
+        client = get_anthropic_client(api_key)
         models = []
         async for m in client.models.list(limit=100):
             mid = getattr(m, "id", None)
@@ -141,11 +141,11 @@ async def _fetch_google_models() -> List[str]:
         return STATIC_FALLBACK["google"]
 
     try:
-        from google import genai
+        from .providers.clients import get_google_client
 
-        client = genai.Client(api_key=api_key)
+        client = get_google_client(api_key)
         models = []
-        for m in client.models.list():
+        async for m in await client.aio.models.list():
             name = getattr(m, "name", None)
             if name:
                 # name is like "models/gemini-1.5-pro" - strip "models/"
@@ -169,17 +169,18 @@ async def _fetch_openrouter_models() -> List[str]:
         return STATIC_FALLBACK["openrouter"]
 
     try:
-        import httpx
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            r = await client.get(
-                "https://openrouter.ai/api/v1/models",
-                headers={"Authorization": f"Bearer {api_key}"},
-            )
-            r.raise_for_status()
-            data = r.json()
-            models = [m.get("id") for m in data.get("data", []) if m.get("id")]
-            return sorted(set(models))[:200] if models else STATIC_FALLBACK["openrouter"]
+        from .providers.clients import get_http_client, OPENROUTER_BASE_URL
+
+        client = get_http_client(OPENROUTER_BASE_URL)
+        r = await client.get(
+            f"{OPENROUTER_BASE_URL}/models",
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=30.0,
+        )
+        r.raise_for_status()
+        data = r.json()
+        models = [m.get("id") for m in data.get("data", []) if m.get("id")]
+        return sorted(set(models))[:200] if models else STATIC_FALLBACK["openrouter"]
     except Exception as e:
         print(f"OpenRouter models fetch failed: {e}")
         return STATIC_FALLBACK["openrouter"]
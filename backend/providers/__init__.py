@@ -4,10 +4,18 @@ from .router import (
     query_model,
     query_models_parallel,
     query_models_parallel_with_messages,
+    stream_model,
+    query_models_as_completed,
+    open_clients,
+    close_clients,
 )
 
 __all__ = [
     "query_model",
     "query_models_parallel",
     "query_models_parallel_with_messages",
+    "stream_model",
+    "query_models_as_completed",
+    "open_clients",
+    "close_clients",
 ]
@@ -1,35 +1,62 @@
 """Anthropic API provider."""
 
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 
-from anthropic import AsyncAnthropic
-from .base import BaseProvider
+from .base import BaseProvider, CACHEABLE, make_usage
+from .clients import get_anthropic_client
+from ..config import PROMPT_CACHE_ENABLED
 
+# Marks the end of the prompt prefix Anthropic should cache
+_CACHE_CONTROL = {"type": "ephemeral"}
 
-def _convert_messages(messages: List[Dict[str, str]]) -> tuple[str | None, List[Dict[str, str]]]:
+
+def _convert_messages(messages: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]] | None, List[Dict[str, Any]]]:
     """
     Convert OpenAI-format messages to Anthropic format.
     Anthropic uses system prompt separately and doesn't support 'system' role in messages.
+    System messages become system text blocks; consecutive messages of one
+    role are merged into one turn of several blocks. A message marked
+    CACHEABLE gets a cache_control breakpoint so the prefix up to it is cached.
     """
-    system_content = None
+    system_blocks = []
     anthropic_messages = []
 
     for msg in messages:
         role = msg.get("role", "user")
         content = msg.get("content", "")
+        block = {"type": "text", "text": content}
+        if PROMPT_CACHE_ENABLED and msg.get(CACHEABLE):
+            block["cache_control"] = _CACHE_CONTROL
 
         if role == "system":
-            system_content = content
+            system_blocks.append(block)
         elif role in ("user", "assistant"):
-            anthropic_messages.append({"role": role, "content": content})
+            if anthropic_messages and anthropic_messages[-1]["role"] == role:
+                anthropic_messages[-1]["content"].append(block)
+            else:
+                anthropic_messages.append({"role": role, "content": [block]})
+
+    return system_blocks or None, anthropic_messages
+
 
-    return system_content, anthropic_messages
+def _usage(usage: Any) -> Dict[str, int]:
+    """Normalize Anthropic usage; its input_tokens excludes cached tokens."""
+    cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+    return make_usage(
+        (usage.input_tokens or 0) + cache_read + cache_write,
+        usage.output_tokens,
+        cache_read_tokens=cache_read,
+        cache_write_tokens=cache_write,
+    )
 
 
 class AnthropicProvider(BaseProvider):
     """Anthropic API provider."""
 
+    name = "anthropic"
+
     async def query(
         self,
         model: str,
@@ -46,29 +73,71 @@ class AnthropicProvider(BaseProvider):
         if not anthropic_messages:
             return None
 
-        client = AsyncAnthropic(api_key=api_key)
-
-        try:
-            kwargs = {
-                "model": model,
-                "messages": anthropic_messages,
-                "max_tokens": 8192,
-            }
-            if system_content:
-                kwargs["system"] = system_content
-
-            response = await client.messages.create(**kwargs)
-
-            content = ""
-            for block in response.content:
-                if hasattr(block, "text"):
-                    content += block.text
-
-            return {
-                "content": content or None,
-                "reasoning_details": None,
-            }
+        client = get_anthropic_client(api_key)
+
+        kwargs = {
+            "model": model,
+            "messages": anthropic_messages,
+            "max_tokens": 8192,
+            "timeout": timeout,
+        }
+        if system_content:
+            kwargs["system"] = system_content
+
+        raw = await client.messages.with_raw_response.create(**kwargs)
+        response = raw.parse()
+
+        content = ""
+        for block in response.content:
+            if hasattr(block, "text"):
+                content += block.text
+
+        return {
+            "content": content or None,
+            "reasoning_details": None,
+            "usage": _usage(response.usage),
+            "headers": raw.headers,
+        }
+
+    async def stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        on_delta: Callable[[str], None],
+        timeout: float = 120.0,
+    ) -> Optional[Dict[str, Any]]:
+        """Stream from Anthropic API."""
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            print("Anthropic: ANTHROPIC_API_KEY not set")
+            return None
 
-        except Exception as e:
-            print(f"Error querying Anthropic model {model}: {e}")
+        system_content, anthropic_messages = _convert_messages(messages)
+        if not anthropic_messages:
             return None
+
+        client = get_anthropic_client(api_key)
+
+        kwargs = {
+            "model": model,
+            "messages": anthropic_messages,
+            "max_tokens": 8192,
+            "timeout": timeout,
+        }
+        if system_content:
+            kwargs["system"] = system_content
+
+        parts = []
+        async with client.messages.stream(**kwargs) as stream:
+            async for text in stream.text_stream:
+                if text:
+                    parts.append(text)
+                    on_delta(text)
+            message = await stream.get_final_message()
+
+        return {
+            "content": "".join(parts) or None,
+            "reasoning_details": None,
+            "usage": _usage(message.usage),
+            "headers": stream.response.headers,
+        }
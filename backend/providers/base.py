@@ -1,12 +1,76 @@
 """Base interface for LLM providers."""
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
+
+
+class ProviderError(Exception):
+    """Provider failure not raised by an SDK (e.g. an error inside a 200 response)."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+# Message key marking the end of a stable prompt prefix shared across calls
+# (e.g. all stage-2 rankers); providers map it to their prompt-caching feature
+CACHEABLE = "cacheable"
+
+
+def strip_cache_markers(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Copy of messages without cache markers, for APIs that reject unknown keys."""
+    return [{k: v for k, v in msg.items() if k != CACHEABLE} for msg in messages]
+
+
+def cacheable_prefix_length(messages: List[Dict[str, Any]]) -> int:
+    """Number of leading messages forming the cacheable prefix (0 if unmarked)."""
+    for i in range(len(messages) - 1, -1, -1):
+        if messages[i].get(CACHEABLE):
+            return i + 1
+    return 0
+
+
+def make_usage(
+    input_tokens: Optional[int],
+    output_tokens: Optional[int],
+    cache_read_tokens: Optional[int] = 0,
+    cache_write_tokens: Optional[int] = 0,
+) -> Dict[str, int]:
+    """
+    Normalized token usage for a response.
+
+    Args:
+        input_tokens: Total prompt tokens, including any read from cache
+        output_tokens: Completion tokens
+        cache_read_tokens: Prompt tokens served from the provider's prompt cache
+        cache_write_tokens: Prompt tokens written to the provider's prompt cache
+
+    Returns:
+        Dict with 'input_tokens', 'output_tokens', 'cache_read_tokens' and
+        'cache_write_tokens'
+    """
+    return {
+        "input_tokens": input_tokens or 0,
+        "output_tokens": output_tokens or 0,
+        "cache_read_tokens": cache_read_tokens or 0,
+        "cache_write_tokens": cache_write_tokens or 0,
+    }
 
 
 class BaseProvider(ABC):
     """Abstract base class for LLM providers."""
 
+    # Route name used for circuit breakers and response metadata
+    name: str = "unknown"
+    # Whether the model can also be served by OpenRouter (circuit failover, hedging)
+    openrouter_fallback: bool = True
+
     @abstractmethod
     async def query(
         self,
@@ -19,10 +83,49 @@ class BaseProvider(ABC):
 
         Args:
             model: Model identifier (may have provider prefix stripped)
-            messages: List of message dicts with 'role' and 'content'
+            messages: List of message dicts with 'role' and 'content'; the
+                last message carrying CACHEABLE ends a prefix shared with
+                other calls, which providers should send as a cached prompt
             timeout: Request timeout in seconds
 
         Returns:
-            Response dict with 'content' and optional 'reasoning_details', or None if failed
+            Response dict with 'content', optional 'reasoning_details', token
+            'usage' (see make_usage) and the HTTP 'headers' (for rate-limit
+            adaptation; stripped by the router), or None if the provider is
+            not configured
+
+        Raises:
+            SDK/httpx exceptions or ProviderError on failure; the router
+            classifies them and retries where appropriate
         """
         pass
+
+    async def stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        on_delta: Callable[[str], None],
+        timeout: float = 120.0,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Query the model, calling on_delta with each text chunk as it arrives.
+
+        Providers without a streaming API inherit this fallback, which emits
+        the whole completion as a single delta.
+
+        Args:
+            model: Model identifier (may have provider prefix stripped)
+            messages: List of message dicts with 'role' and 'content'
+            on_delta: Callback receiving each text delta
+            timeout: Request timeout in seconds
+
+        Returns:
+            Same response dict as query(), with the full accumulated content
+
+        Raises:
+            Same as query()
+        """
+        response = await self.query(model, messages, timeout)
+        if response is not None and response.get("content"):
+            on_delta(response["content"])
+        return response
@@ -0,0 +1,158 @@
+"""Content-addressed response cache for provider calls: in-memory LRU + SQLite."""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import (
+    RESPONSE_CACHE_TTL,
+    RESPONSE_CACHE_MEMORY_SIZE,
+    RESPONSE_CACHE_PATH,
+)
+
+# Fields of a provider response worth caching
+_CACHED_FIELDS = ("content", "reasoning_details")
+
+# Prune expired disk rows every this many writes
+_PRUNE_EVERY = 500
+
+
+def request_key(model: str, messages: List[Dict[str, Any]]) -> str:
+    """
+    Stable hash of a model request.
+
+    Generation settings are not part of the key: providers send fixed ones
+    (e.g. max_tokens), so the model and messages determine the request.
+
+    Args:
+        model: Model identifier as requested (route-independent)
+        messages: Message list sent to the model
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {"model": model, "messages": messages},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier TTL cache: an in-memory LRU in front of an optional SQLite table."""
+
+    def __init__(
+        self,
+        ttl: float = RESPONSE_CACHE_TTL,
+        memory_size: int = RESPONSE_CACHE_MEMORY_SIZE,
+        path: str = RESPONSE_CACHE_PATH,
+    ):
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self.path = path
+        self._memory: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the disk tier on first use."""
+        if not self.path:
+            return None
+        if self._db is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Request hash from request_key()
+
+        Returns:
+            Cached response dict, or None on miss/expiry
+        """
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            created_at, response = entry
+            if now - created_at < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return dict(response)
+            del self._memory[key]
+
+        db = self._connect()
+        if db is not None:
+            try:
+                row = db.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Response cache read failed: {e}")
+                row = None
+            if row is not None and now - row[1] < self.ttl:
+                response = json.loads(row[0])
+                self._remember(key, row[1], response)
+                self.hits += 1
+                self.disk_hits += 1
+                return dict(response)
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, response: Dict[str, Any]):
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Request hash from request_key()
+            response: Provider response dict (only content fields are kept)
+        """
+        now = time.time()
+        cached = {field: response.get(field) for field in _CACHED_FIELDS}
+        self._remember(key, now, cached)
+
+        db = self._connect()
+        if db is None:
+            return
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(cached), now),
+            )
+            self._writes += 1
+            if self._writes % _PRUNE_EVERY == 0:
+                db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            db.commit()
+        except sqlite3.Error as e:
+            print(f"Response cache write failed: {e}")
+
+    def _remember(self, key: str, created_at: float, response: Dict[str, Any]):
+        """Insert into the memory tier, evicting the least recently used entry."""
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def close(self):
+        """Close the disk tier."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,123 @@
+"""Circuit breakers for native provider routes."""
+
+import time
+from typing import Dict, List, Tuple
+
+from ..config import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker.
+
+    Closed: calls flow; consecutive failures are counted and the circuit opens
+    at the threshold. Open: calls are refused until reset_timeout has passed.
+    Half-open: a limited number of probe calls go through; a success closes
+    the circuit, a failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+
+    def allow(self) -> bool:
+        """Whether a call may use this route now. Reserves a probe slot when half-open."""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+            self.probes = 0
+        if self.state == HALF_OPEN:
+            if self.probes >= self.half_open_max_calls:
+                return False
+            self.probes += 1
+        return True
+
+    def release(self):
+        """Give back a probe slot reserved by allow() for a call that never reported."""
+        if self.state == HALF_OPEN and self.probes > 0:
+            self.probes -= 1
+
+    def record_success(self):
+        """The route answered; close the circuit."""
+        self.state = CLOSED
+        self.failures = 0
+        self.probes = 0
+
+    def record_failure(self):
+        """The route failed with a transient error."""
+        if self.state == HALF_OPEN:
+            self._trip()
+            return
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self._trip()
+
+    def _trip(self):
+        """Open the circuit and start the reset timer."""
+        if self.state != OPEN:
+            print(f"Circuit {self.name} opened")
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.probes = 0
+
+
+# (route, model or "*") -> breaker
+_breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+
+
+def _get_breaker(route: str, model: str) -> CircuitBreaker:
+    """Get or create the breaker for a route ("*" = the whole provider)."""
+    key = (route, model)
+    breaker = _breakers.get(key)
+    if breaker is None:
+        breaker = CircuitBreaker(f"{route}:{model}" if model != "*" else route)
+        _breakers[key] = breaker
+    return breaker
+
+
+def get_breakers(route: str, model: str) -> List[CircuitBreaker]:
+    """
+    Breakers guarding a call: one for the whole provider route, one for the model.
+
+    Args:
+        route: Provider route name (e.g. "anthropic")
+        model: Model identifier as requested (e.g. "anthropic/claude-sonnet-4.5")
+
+    Returns:
+        [provider breaker, model breaker]
+    """
+    return [_get_breaker(route, "*"), _get_breaker(route, model)]
+
+
+def acquire(breakers: List[CircuitBreaker]) -> bool:
+    """
+    Check every breaker; if any refuses, give back probe slots already taken.
+
+    Returns:
+        True if all breakers allow the call
+    """
+    allowed = []
+    for breaker in breakers:
+        if not breaker.allow():
+            for taken in allowed:
+                taken.release()
+            return False
+        allowed.append(breaker)
+    return True
@@ -0,0 +1,162 @@
+"""Shared, pooled clients for LLM providers.
+
+One long-lived httpx pool per upstream origin and one SDK client per
+(provider, base URL, API key), so council calls reuse TCP+TLS connections
+instead of handshaking on every query. Opened and closed by the FastAPI lifespan.
+"""
+
+from typing import Any, Dict, Iterable, Tuple
+
+import httpx
+
+from .. import metrics, tracing
+from ..config import (
+    TRACE_PROPAGATE,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+)
+
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+XAI_BASE_URL = "https://api.x.ai/v1"
+ANTHROPIC_BASE_URL = "https://api.anthropic.com"
+GOOGLE_BASE_URL = "https://generativelanguage.googleapis.com"
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# origin -> pooled httpx client
+_http_clients: Dict[str, httpx.AsyncClient] = {}
+# (kind, base_url, api_key) -> SDK client bound to a pooled httpx client
+_sdk_clients: Dict[Tuple[str, str, str], Any] = {}
+
+
+def _origin(url: str) -> str:
+    """Reduce a URL to scheme://host[:port] so all paths on a host share one pool."""
+    parsed = httpx.URL(url)
+    port = f":{parsed.port}" if parsed.port else ""
+    return f"{parsed.scheme}://{parsed.host}{port}"
+
+
+async def _inject_trace_headers(request: httpx.Request):
+    """httpx request hook: carry the current trace context to the provider."""
+    tracing.inject_headers(request.headers)
+
+
+def get_http_client(base_url: str) -> httpx.AsyncClient:
+    """
+    Get the pooled httpx client for the origin of base_url.
+
+    Args:
+        base_url: Any URL on the upstream host
+
+    Returns:
+        Shared httpx.AsyncClient with configured keep-alive and pool limits
+    """
+    origin = _origin(base_url)
+    client = _http_clients.get(origin)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(120.0),
+            event_hooks={"request": [_inject_trace_headers] if TRACE_PROPAGATE else []},
+        )
+        _http_clients[origin] = client
+    return client
+
+
+def get_openai_client(api_key: str, base_url: str | None = None):
+    """Get the shared AsyncOpenAI client (also used for xAI via base_url)."""
+    from openai import AsyncOpenAI
+
+    base_url = base_url or OPENAI_BASE_URL
+    key = ("openai", base_url, api_key)
+    client = _sdk_clients.get(key)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=get_http_client(base_url),
+            max_retries=0,  # Retries are owned by the router (providers/retry.py)
+        )
+        _sdk_clients[key] = client
+    return client
+
+
+def get_anthropic_client(api_key: str):
+    """Get the shared AsyncAnthropic client."""
+    from anthropic import AsyncAnthropic
+
+    key = ("anthropic", ANTHROPIC_BASE_URL, api_key)
+    client = _sdk_clients.get(key)
+    if client is None:
+        client = AsyncAnthropic(
+            api_key=api_key,
+            http_client=get_http_client(ANTHROPIC_BASE_URL),
+            max_retries=0,  # Retries are owned by the router (providers/retry.py)
+        )
+        _sdk_clients[key] = client
+    return client
+
+
+def get_google_client(api_key: str):
+    """Get the shared google-genai client (async calls go through client.aio)."""
+    from google import genai
+    from google.genai import types
+
+    key = ("google", GOOGLE_BASE_URL, api_key)
+    client = _sdk_clients.get(key)
+    if client is None:
+        client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(
+                httpx_async_client=get_http_client(GOOGLE_BASE_URL),
+            ),
+        )
+        _sdk_clients[key] = client
+    return client
+
+
+async def open_clients():
+    """Open the registry at app startup. Pools are created lazily on first use."""
+    _sdk_clients.clear()
+
+
+async def close_clients():
+    """Close every pooled connection. Called at app shutdown."""
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    _sdk_clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as e:
+            print(f"Error closing HTTP client: {e}")
+
+
+def _pool_samples() -> Iterable[Tuple[Dict[str, str], float]]:
+    """Per-origin connection counts by state, read from the httpcore pools."""
+    for origin, client in list(_http_clients.items()):
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        if pool is None:
+            continue
+        try:
+            connections = list(getattr(pool, "connections", []))
+            idle = sum(1 for conn in connections if conn.is_idle())
+            queued = sum(1 for request in list(getattr(pool, "_requests", [])) if request.is_queued())
+        except AttributeError:
+            # httpcore internals changed shape: skip the origin rather than fail /metrics
+            continue
+        yield {"origin": origin, "state": "active"}, len(connections) - idle
+        yield {"origin": origin, "state": "idle"}, idle
+        yield {"origin": origin, "state": "queued"}, queued
+
+
+metrics.register(metrics.Gauge(
+    "council_http_pool_connections",
+    f"Pooled upstream connections per origin (active, idle) and requests queued for one; max {HTTP_MAX_CONNECTIONS} per origin.",
+    ("origin", "state"),
+    collect=_pool_samples,
+))
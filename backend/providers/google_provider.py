@@ -1,16 +1,155 @@
 """Google Generative AI provider (google-genai SDK)."""
 
 import os
-from typing import List, Dict, Any, Optional
+import time
+import asyncio
+import hashlib
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
-from google import genai
+import httpx
 from google.genai import types
-from .base import BaseProvider
+from .base import BaseProvider, cacheable_prefix_length, make_usage
+from .clients import get_google_client
+from ..config import PROMPT_CACHE_ENABLED, GOOGLE_CONTEXT_CACHE_TTL, GOOGLE_CONTEXT_CACHE_MIN_TOKENS
+
+# Explicit context caches per (model, prefix): key -> (cache name or None, expires at)
+_context_caches: Dict[str, Tuple[Optional[str], float]] = {}
+_pending_caches: Dict[str, "asyncio.Task"] = {}
+
+# Stop handing out a cache this close to its expiry
+_EXPIRY_MARGIN = 30.0
+
+
+def _convert_messages(messages: List[Dict[str, Any]]) -> tuple[str | None, str | None, str | None]:
+    """
+    Flatten OpenAI-format messages to (cacheable_prefix, system_instruction, user_content).
+    Gemini takes the system prompt separately. User messages inside the
+    marked cacheable prefix are returned apart so they can be served from a
+    context cache; the user messages after it are joined into one turn.
+    """
+    prefix_length = cacheable_prefix_length(messages)
+    if any(msg.get("role") != "user" for msg in messages[:prefix_length]):
+        prefix_length = 0  # Only a user-only prefix can become cached content
+
+    prefix_parts = [msg.get("content", "") for msg in messages[:prefix_length]]
+    system_parts = []
+    user_parts = []
+
+    for msg in messages[prefix_length:]:
+        role = msg.get("role", "user")
+        content = msg.get("content", "")
+        if role == "system":
+            system_parts.append(content)
+        elif role == "user":
+            user_parts.append(content)
+
+    return (
+        "\n\n".join(prefix_parts) or None,
+        "\n\n".join(system_parts) or None,
+        "\n\n".join(user_parts) or None,
+    )
+
+
+async def _create_context_cache(client: Any, model: str, key: str, prefix: str) -> Optional[str]:
+    """Create a Gemini cached content for a prompt prefix and remember it."""
+    try:
+        cached = await client.aio.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                contents=[types.Content(role="user", parts=[types.Part(text=prefix)])],
+                ttl=f"{GOOGLE_CONTEXT_CACHE_TTL}s",
+            ),
+        )
+        name = cached.name
+    except Exception as e:
+        # Too small for this model, unsupported, quota... send uncached for a while
+        print(f"Google: context cache unavailable for {model}: {e}")
+        name = None
+    _context_caches[key] = (name, time.monotonic() + GOOGLE_CONTEXT_CACHE_TTL)
+    return name
+
+
+async def _context_cache(client: Any, model: str, prefix: str) -> Optional[str]:
+    """
+    Name of a live Gemini context cache holding prefix, creating it if needed.
+
+    Returns:
+        Cached content name, or None to send the prefix uncached
+    """
+    if not PROMPT_CACHE_ENABLED or len(prefix) / 4 < GOOGLE_CONTEXT_CACHE_MIN_TOKENS:
+        return None
+
+    key = hashlib.sha256(f"{model}\n{prefix}".encode("utf-8")).hexdigest()
+    entry = _context_caches.get(key)
+    if entry is not None and entry[1] - time.monotonic() > _EXPIRY_MARGIN:
+        return entry[0]
+
+    # Rankers sharing a prefix start together; create the cache only once
+    task = _pending_caches.get(key)
+    if task is None:
+        task = asyncio.create_task(_create_context_cache(client, model, key, prefix))
+        _pending_caches[key] = task
+        task.add_done_callback(lambda _: _pending_caches.pop(key, None))
+    return await asyncio.shield(task)
+
+
+def _with_timeout(
+    config: Optional[types.GenerateContentConfig],
+    timeout: float,
+) -> types.GenerateContentConfig:
+    """Request config carrying the per-call timeout (the SDK takes milliseconds)."""
+    config = config or types.GenerateContentConfig()
+    config.http_options = types.HttpOptions(timeout=max(1, int(timeout * 1000)))
+    return config
+
+
+async def _build_request(
+    client: Any,
+    model: str,
+    messages: List[Dict[str, Any]],
+) -> Tuple[Optional[str], Optional[types.GenerateContentConfig]]:
+    """Contents and config for a request, using a context cache for the prefix."""
+    prefix, system_content, user_content = _convert_messages(messages)
+    if user_content is None:
+        return None, None
+
+    cache_name = await _context_cache(client, model, prefix) if prefix else None
+    if cache_name:
+        # A request on cached content takes no system instruction; it rides in contents
+        if system_content:
+            user_content = f"{system_content}\n\n{user_content}"
+        return user_content, types.GenerateContentConfig(cached_content=cache_name)
+
+    if prefix:
+        user_content = f"{prefix}\n\n{user_content}"
+    config = None
+    if system_content:
+        config = types.GenerateContentConfig(system_instruction=system_content)
+    return user_content, config
+
+
+def _usage(metadata: Any) -> Optional[Dict[str, int]]:
+    """Normalize Gemini usage metadata; thinking tokens bill as output."""
+    if metadata is None:
+        return None
+    return make_usage(
+        metadata.prompt_token_count,
+        (metadata.candidates_token_count or 0) + (metadata.thoughts_token_count or 0),
+        cache_read_tokens=metadata.cached_content_token_count,
+    )
+
+
+def _response_headers(response: Any) -> httpx.Headers:
+    """HTTP headers the SDK attaches to a response (case-insensitive)."""
+    http_response = getattr(response, "sdk_http_response", None)
+    return httpx.Headers(getattr(http_response, "headers", None) or {})
 
 
 class GoogleProvider(BaseProvider):
     """Google Generative AI provider using google-genai SDK."""
 
+    name = "google"
+
     async def query(
         self,
         model: str,
@@ -23,41 +162,65 @@ class GoogleProvider(BaseProvider):
             print("Google: GOOGLE_API_KEY or GEMINI_API_KEY not set")
             return None
 
-        client = genai.Client(api_key=api_key)
+        client = get_google_client(api_key)
+
+        user_content, config = await _build_request(client, model, messages)
+        if user_content is None:
+            return None
 
-        # Flatten: system content prepended to first user message; build prompt
-        system_content = None
-        user_content = None
+        response = await client.aio.models.generate_content(
+            model=model,
+            contents=user_content,
+            config=_with_timeout(config, timeout),
+        )
 
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
-            if role == "system":
-                system_content = content
-            elif role == "user":
-                user_content = content
-                break
+        text = getattr(response, "text", None) or ""
+        return {
+            "content": text,
+            "reasoning_details": None,
+            "usage": _usage(response.usage_metadata),
+            "headers": _response_headers(response),
+        }
 
-        if user_content is None:
+    async def stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        on_delta: Callable[[str], None],
+        timeout: float = 120.0,
+    ) -> Optional[Dict[str, Any]]:
+        """Stream from Google Generative AI API."""
+        api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            print("Google: GOOGLE_API_KEY or GEMINI_API_KEY not set")
             return None
 
-        try:
-            config = None
-            if system_content:
-                config = types.GenerateContentConfig(system_instruction=system_content)
-
-            response = await client.aio.models.generate_content(
-                model=model,
-                contents=user_content,
-                config=config,
-            )
-
-            text = getattr(response, "text", None) or ""
-            return {
-                "content": text,
-                "reasoning_details": None,
-            }
-
-        except Exception as e:
-            print(f"Error querying Google model {model}: {e}")
+        client = get_google_client(api_key)
+
+        user_content, config = await _build_request(client, model, messages)
+        if user_content is None:
             return None
+
+        parts = []
+        headers = None
+        usage = None
+        async for chunk in await client.aio.models.generate_content_stream(
+            model=model,
+            contents=user_content,
+            config=_with_timeout(config, timeout),
+        ):
+            if headers is None:
+                headers = _response_headers(chunk)
+            if chunk.usage_metadata is not None:
+                usage = _usage(chunk.usage_metadata)
+            text = getattr(chunk, "text", None)
+            if text:
+                parts.append(text)
+                on_delta(text)
+
+        return {
+            "content": "".join(parts),
+            "reasoning_details": None,
+            "usage": usage,
+            "headers": headers,
+        }
@@ -0,0 +1,49 @@
+"""Latency tracking for hedged requests."""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from ..config import HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES, HEDGE_DEFAULT_DELAY
+
+# Recent successful call latencies kept per (route, model)
+_WINDOW = 200
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies per (route, model)."""
+
+    def __init__(self, window: int = _WINDOW):
+        self.window = window
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+
+    def record(self, route: str, model: str, seconds: float):
+        """Record the latency of a successful call."""
+        samples = self._samples.get((route, model))
+        if samples is None:
+            samples = deque(maxlen=self.window)
+            self._samples[(route, model)] = samples
+        samples.append(seconds)
+
+    def percentile(self, route: str, model: str, q: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of recent latencies.
+
+        Args:
+            route: Provider route name
+            model: Model identifier as requested
+            q: Quantile in (0, 1], e.g. 0.9
+
+        Returns:
+            Latency in seconds, or None if fewer than HEDGE_MIN_SAMPLES samples
+        """
+        samples = self._samples.get((route, model))
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+    def hedge_delay(self, route: str, model: str) -> float:
+        """Seconds to wait on the primary route before sending a hedge."""
+        delay = self.percentile(route, model, HEDGE_PERCENTILE)
+        return HEDGE_DEFAULT_DELAY if delay is None else delay
@@ -0,0 +1,301 @@
+"""Adaptive per-provider (and per-model) concurrency and rate limiters."""
+
+import asyncio
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .. import metrics
+from .retry import parse_retry_after
+from ..config import PROVIDER_LIMITS, MODEL_LIMITS
+
+# Minimum spacing between multiplicative decreases, so a burst of 429s from
+# calls already in flight only halves the limit once
+_DECREASE_INTERVAL = 1.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit reset header into seconds from now.
+
+    Accepts OpenAI-style durations ("1s", "6m0s", "20ms"), RFC 3339 timestamps
+    (Anthropic) and epoch milliseconds (OpenRouter).
+    """
+    if not value:
+        return None
+    value = value.strip()
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+        return sum(float(n) * scale[u] for n, u in parts)
+    try:
+        number = float(value)
+        # Epoch milliseconds vs. plain seconds
+        return max(0.0, number / 1000 - time.time()) if number > 1e11 else number
+    except ValueError:
+        pass
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return max(0.0, reset_at.timestamp() - time.time())
+    except ValueError:
+        return None
+
+
+def _first_int(headers: Any, names: List[str]) -> Optional[int]:
+    """First header in names that holds an integer."""
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return int(float(value))
+            except ValueError:
+                continue
+    return None
+
+
+def parse_rate_limit_headers(headers: Any) -> Dict[str, Optional[float]]:
+    """
+    Normalize vendor rate-limit headers.
+
+    Args:
+        headers: Response headers (OpenAI/xAI x-ratelimit-*, Anthropic
+            anthropic-ratelimit-*, OpenRouter X-RateLimit-*, retry-after)
+
+    Returns:
+        Dict with 'remaining_requests', 'remaining_tokens', 'reset' (seconds
+        until the exhausted window resets) and 'retry_after'; values may be None
+    """
+    if not headers:
+        return {"remaining_requests": None, "remaining_tokens": None, "reset": None, "retry_after": None}
+
+    remaining_requests = _first_int(headers, [
+        "x-ratelimit-remaining-requests",
+        "anthropic-ratelimit-requests-remaining",
+        "x-ratelimit-remaining",
+    ])
+    remaining_tokens = _first_int(headers, [
+        "x-ratelimit-remaining-tokens",
+        "anthropic-ratelimit-tokens-remaining",
+        "anthropic-ratelimit-input-tokens-remaining",
+    ])
+
+    reset = None
+    if remaining_requests == 0:
+        reset = _parse_reset(
+            headers.get("x-ratelimit-reset-requests")
+            or headers.get("anthropic-ratelimit-requests-reset")
+            or headers.get("x-ratelimit-reset")
+        )
+    if remaining_tokens == 0:
+        token_reset = _parse_reset(
+            headers.get("x-ratelimit-reset-tokens")
+            or headers.get("anthropic-ratelimit-tokens-reset")
+            or headers.get("anthropic-ratelimit-input-tokens-reset")
+        )
+        if token_reset is not None:
+            reset = max(reset or 0.0, token_reset)
+
+    return {
+        "remaining_requests": remaining_requests,
+        "remaining_tokens": remaining_tokens,
+        "reset": reset,
+        "retry_after": parse_retry_after(headers),
+    }
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limiter with an AIMD-adapted limit and optional token bucket.
+
+    Calls over the limit wait in FIFO order. Each success nudges the limit up
+    by 1/limit (about +1 per window of calls); a 429 halves it and pauses new
+    calls for the server's Retry-After. Rate-limit headers reporting an empty
+    window pause new calls until the window resets.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        rps: Optional[float] = None,
+    ):
+        self.name = name
+        self.limit = float(concurrency)
+        self.min_limit = float(min_concurrency)
+        self.max_limit = float(max_concurrency)
+        self.rps = rps
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._tokens = float(rps) if rps else 0.0
+        self._refilled_at = time.monotonic()
+        self._last_decrease = 0.0
+
+    @property
+    def queued(self) -> int:
+        """Calls waiting for a slot."""
+        return len(self._waiters)
+
+    def _cap(self) -> int:
+        """Current limit as a whole number of slots."""
+        return max(1, int(self.limit))
+
+    def _wake(self):
+        """Hand free slots to waiters in arrival order."""
+        while self._waiters and self.in_flight < self._cap():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def acquire(self):
+        """Wait for a concurrency slot, any pause window and a rate token."""
+        if not self._waiters and self.in_flight < self._cap():
+            self.in_flight += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Slot was handed over just as we were cancelled; pass it on
+                    self.release()
+                else:
+                    try:
+                        self._waiters.remove(waiter)
+                    except ValueError:
+                        pass
+                raise
+
+        try:
+            await self._wait_for_pause()
+            await self._take_token()
+        except asyncio.CancelledError:
+            self.release()
+            raise
+
+    def release(self):
+        """Return a slot."""
+        self.in_flight -= 1
+        self._wake()
+
+    async def _wait_for_pause(self):
+        """Sleep out any pause window set by 429s or exhausted rate-limit windows."""
+        while True:
+            delay = self.paused_until - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def _take_token(self):
+        """Take a token from the request-rate bucket, waiting for a refill if empty."""
+        if not self.rps:
+            return
+        while True:
+            now = time.monotonic()
+            self._tokens = min(float(self.rps), self._tokens + (now - self._refilled_at) * self.rps)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rps)
+
+    def _pause(self, seconds: Optional[float]):
+        """Hold back new calls for the given number of seconds."""
+        if seconds:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def on_success(self, headers: Any = None):
+        """Additive increase, then apply any rate-limit headers."""
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._observe(headers)
+        self._wake()
+
+    def on_rate_limited(self, headers: Any = None, retry_after: Optional[float] = None):
+        """Multiplicative decrease on 429 and pause for Retry-After."""
+        now = time.monotonic()
+        if now - self._last_decrease >= _DECREASE_INTERVAL:
+            self.limit = max(self.min_limit, self.limit / 2)
+            self._last_decrease = now
+        self._pause(retry_after)
+        self._observe(headers)
+
+    def _observe(self, headers: Any):
+        """Adapt to rate-limit headers from the latest response."""
+        info = parse_rate_limit_headers(headers)
+        self._pause(info["retry_after"])
+        self._pause(info["reset"])
+        remaining = info["remaining_requests"]
+        if remaining is not None and 0 < remaining < self.limit:
+            # Don't keep more calls in flight than the window has left
+            self.limit = max(self.min_limit, float(remaining))
+
+
+# "provider" or "provider|model" -> limiter
+_limiters: Dict[str, AdaptiveLimiter] = {}
+
+
+def get_limiters(route: str, model: str) -> List[AdaptiveLimiter]:
+    """
+    Limiters a call must pass: the provider route's, plus the model's if configured.
+
+    Args:
+        route: Provider route name (e.g. "openai")
+        model: Model identifier as requested (e.g. "openai/gpt-5.1")
+
+    Returns:
+        List of limiters, provider first
+    """
+    limiter = _limiters.get(route)
+    if limiter is None:
+        limiter = AdaptiveLimiter(route, **PROVIDER_LIMITS.get(route, PROVIDER_LIMITS["default"]))
+        _limiters[route] = limiter
+    limiters = [limiter]
+
+    if model in MODEL_LIMITS:
+        key = f"{route}|{model}"
+        model_limiter = _limiters.get(key)
+        if model_limiter is None:
+            model_limiter = AdaptiveLimiter(key, **MODEL_LIMITS[model])
+            _limiters[key] = model_limiter
+        limiters.append(model_limiter)
+
+    return limiters
+
+
+@asynccontextmanager
+async def limited(limiters: List[AdaptiveLimiter]):
+    """Hold a slot on every limiter for the duration of a call."""
+    acquired = []
+    try:
+        for limiter in limiters:
+            await limiter.acquire()
+            acquired.append(limiter)
+        yield
+    finally:
+        for limiter in reversed(acquired):
+            limiter.release()
+
+
+def _limiter_samples() -> Iterable[Tuple[Dict[str, str], float]]:
+    """Current limit, in-flight and queued calls per limiter."""
+    for name, limiter in list(_limiters.items()):
+        yield {"limiter": name, "state": "limit"}, limiter._cap()
+        yield {"limiter": name, "state": "in_flight"}, limiter.in_flight
+        yield {"limiter": name, "state": "queued"}, limiter.queued
+
+
+metrics.register(metrics.Gauge(
+    "council_provider_concurrency",
+    "Adaptive provider limiters: current limit, calls in flight and calls queued.",
+    ("limiter", "state"),
+    collect=_limiter_samples,
+))
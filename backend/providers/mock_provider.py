@@ -0,0 +1,172 @@
+"""In-process mock provider for deterministic load and latency testing."""
+
+import asyncio
+import hashlib
+import random
+import re
+from typing import List, Dict, Any, Optional, Callable
+
+import httpx
+
+from .base import BaseProvider, ProviderError, cacheable_prefix_length, make_usage
+from ..config import MOCK_SEED, MOCK_DEFAULTS, MOCK_MODELS
+
+_WORDS = (
+    "the council weighs evidence carefully and each member offers a distinct view on "
+    "tradeoffs risks benefits costs assumptions context history data models systems "
+    "users latency throughput accuracy clarity depth nuance consensus disagreement"
+).split()
+
+_LABEL = re.compile(r"Response ([A-Z])\b")
+
+# Stage-2 ranking instructions (the chairman prompt quotes rankings too)
+_RANKING_INSTRUCTION = 'Start with the line "FINAL RANKING:"'
+
+# Bound on remembered requests so long load tests don't grow memory
+_MAX_REMEMBERED = 10000
+
+
+def _sample(spec: Any, rng: random.Random) -> float:
+    """Draw from a distribution spec (see MOCK_DEFAULTS in config) or return a constant."""
+    if not isinstance(spec, dict):
+        return float(spec)
+    dist = spec.get("dist", "fixed")
+    if dist == "uniform":
+        return rng.uniform(spec["low"], spec["high"])
+    if dist == "normal":
+        return max(0.0, rng.gauss(spec["mean"], spec["stddev"]))
+    if dist == "lognormal":
+        return spec["median"] * rng.lognormvariate(0.0, spec["sigma"])
+    return float(spec["value"])
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class MockProvider(BaseProvider):
+    """
+    Simulated model behind the "mock/" prefix.
+
+    Each call's behavior (latency, failure, timeout, response length and
+    text) is drawn from a random generator seeded with MOCK_SEED, the model,
+    the request and how many times that exact request has been made, so a
+    run replays identically whatever order concurrent calls complete in.
+    Ranking prompts get a canned "FINAL RANKING" over the labels they
+    mention; a cacheable prefix is reported as a cache read with the
+    profile's prompt_cache_hit_rate, drawn from the same generator.
+    """
+
+    name = "mock"
+    # A mock model has no OpenRouter equivalent to fail over or hedge to
+    openrouter_fallback = False
+
+    def __init__(self, seed: int = MOCK_SEED):
+        self.seed = seed
+        self._calls: Dict[str, int] = {}
+
+    @staticmethod
+    def _remember(table: Dict[str, Any], key: str, value: Any):
+        """Insert into a bounded table, evicting the oldest entry."""
+        table[key] = value
+        if len(table) > _MAX_REMEMBERED:
+            del table[next(iter(table))]
+
+    def _profile(self, model: str) -> Dict[str, Any]:
+        """Default behavior merged with the per-model overrides."""
+        return {**MOCK_DEFAULTS, **MOCK_MODELS.get(model, {})}
+
+    def _rng(self, model: str, messages: List[Dict[str, Any]]) -> random.Random:
+        """Generator seeded by (seed, model, request, repeat count)."""
+        request = hashlib.sha256(repr((model, messages)).encode("utf-8")).hexdigest()
+        count = self._calls.get(request, 0)
+        self._remember(self._calls, request, count + 1)
+        return random.Random(f"{self.seed}|{request}|{count}")
+
+    def _content(self, messages: List[Dict[str, Any]], rng: random.Random, tokens: int) -> str:
+        """Generated text; ranking prompts end with a FINAL RANKING section."""
+        prompt = messages[-1].get("content", "") if messages else ""
+        if prompt.rstrip().endswith("Title:"):
+            return " ".join(rng.choice(_WORDS).capitalize() for _ in range(rng.randint(3, 5)))
+
+        body = " ".join(rng.choice(_WORDS) for _ in range(tokens))
+        if _RANKING_INSTRUCTION not in prompt:
+            return body
+
+        # Labels come from the shared context, not the format example in the instructions
+        context = "\n".join(m.get("content", "") for m in messages[:-1])
+        labels = sorted(set(_LABEL.findall(context)))
+        rng.shuffle(labels)
+        ranking = "\n".join(f"{i}. Response {label}" for i, label in enumerate(labels, start=1))
+        return f"{body}\n\nFINAL RANKING:\n{ranking}"
+
+    def _usage(
+        self,
+        messages: List[Dict[str, Any]],
+        content: str,
+        rng: random.Random,
+        hit_rate: float,
+    ) -> Dict[str, int]:
+        """Token usage, simulating prompt-cache reads of the cacheable prefix."""
+        input_tokens = sum(_estimate_tokens(m.get("content", "")) for m in messages)
+        prefix = messages[:cacheable_prefix_length(messages)]
+        cache_read = 0
+        if prefix and rng.random() < hit_rate:
+            cache_read = sum(_estimate_tokens(m.get("content", "")) for m in prefix)
+        return make_usage(input_tokens, _estimate_tokens(content), cache_read_tokens=cache_read)
+
+    async def _run(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        on_delta: Optional[Callable[[str], None]],
+        timeout: float,
+    ) -> Dict[str, Any]:
+        """Simulate one call, optionally streaming the text word by word."""
+        profile = self._profile(model)
+        rng = self._rng(model, messages)
+
+        roll = rng.random()
+        if roll < profile["timeout_rate"]:
+            await asyncio.sleep(min(timeout, profile.get("timeout_after", timeout)))
+            raise httpx.ReadTimeout(f"mock/{model} timed out")
+
+        await asyncio.sleep(_sample(profile["latency"], rng))
+        if roll < profile["timeout_rate"] + profile["failure_rate"]:
+            raise ProviderError(f"mock/{model} simulated failure", status_code=503)
+
+        tokens = max(1, int(_sample(profile["response_tokens"], rng)))
+        content = self._content(messages, rng, tokens)
+        if on_delta is not None:
+            words = content.split(" ")
+            for i, word in enumerate(words):
+                on_delta(word if i == 0 else f" {word}")
+                if profile["token_interval"]:
+                    await asyncio.sleep(profile["token_interval"])
+
+        return {
+            "content": content,
+            "reasoning_details": None,
+            "usage": self._usage(messages, content, rng, profile["prompt_cache_hit_rate"]),
+            "headers": {},
+        }
+
+    async def query(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        timeout: float = 120.0,
+    ) -> Optional[Dict[str, Any]]:
+        """Simulate a completion."""
+        return await self._run(model, messages, None, timeout)
+
+    async def stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        on_delta: Callable[[str], None],
+        timeout: float = 120.0,
+    ) -> Optional[Dict[str, Any]]:
+        """Simulate a streamed completion at the profile's token cadence."""
+        return await self._run(model, messages, on_delta, timeout)
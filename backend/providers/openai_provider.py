@@ -1,18 +1,54 @@
 """OpenAI API provider - also used for xAI via base_url."""
 
 import os
-from typing import List, Dict, Any, Optional
+import hashlib
+from typing import List, Dict, Any, Optional, Callable
 
-from openai import AsyncOpenAI
-from .base import BaseProvider
+from .base import BaseProvider, strip_cache_markers, cacheable_prefix_length, make_usage
+from .clients import get_openai_client
+from ..config import PROMPT_CACHE_ENABLED
+
+
+def _usage(usage: Any) -> Optional[Dict[str, int]]:
+    """Normalize a chat completions usage object."""
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    return make_usage(
+        usage.prompt_tokens,
+        usage.completion_tokens,
+        cache_read_tokens=getattr(details, "cached_tokens", 0),
+    )
 
 
 class OpenAIProvider(BaseProvider):
     """OpenAI API provider."""
 
-    def __init__(self, base_url: str | None = None, api_key_env: str = "OPENAI_API_KEY"):
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key_env: str = "OPENAI_API_KEY",
+        name: str = "openai",
+    ):
         self.base_url = base_url
         self.api_key_env = api_key_env
+        self.name = name
+
+    def _request_kwargs(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Messages plus prompt-cache routing.
+
+        OpenAI caches shared prompt prefixes automatically; prompt_cache_key
+        steers calls sharing the marked prefix onto the same cache shard.
+        """
+        kwargs = {"messages": strip_cache_markers(messages)}
+        prefix = cacheable_prefix_length(messages)
+        if PROMPT_CACHE_ENABLED and prefix and self.name == "openai":
+            digest = hashlib.sha256(
+                "".join(m.get("content", "") for m in messages[:prefix]).encode("utf-8")
+            ).hexdigest()
+            kwargs["prompt_cache_key"] = f"council-{digest[:32]}"
+        return kwargs
 
     async def query(
         self,
@@ -26,21 +62,61 @@ class OpenAIProvider(BaseProvider):
             print(f"OpenAI: {self.api_key_env} not set")
             return None
 
-        client = AsyncOpenAI(api_key=api_key, base_url=self.base_url)
+        client = get_openai_client(api_key, self.base_url)
 
-        try:
-            response = await client.chat.completions.create(
-                model=model,
-                messages=messages,
-                timeout=timeout,
-            )
-            message = response.choices[0].message
+        raw = await client.chat.completions.with_raw_response.create(
+            model=model,
+            timeout=timeout,
+            **self._request_kwargs(messages),
+        )
+        response = raw.parse()
+        message = response.choices[0].message
 
-            return {
-                "content": message.content,
-                "reasoning_details": getattr(message, "reasoning_details", None),
-            }
+        return {
+            "content": message.content,
+            "reasoning_details": getattr(message, "reasoning_details", None),
+            "usage": _usage(response.usage),
+            "headers": raw.headers,
+        }
 
-        except Exception as e:
-            print(f"Error querying OpenAI model {model}: {e}")
+    async def stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        on_delta: Callable[[str], None],
+        timeout: float = 120.0,
+    ) -> Optional[Dict[str, Any]]:
+        """Stream from OpenAI API."""
+        api_key = os.getenv(self.api_key_env)
+        if not api_key:
+            print(f"OpenAI: {self.api_key_env} not set")
             return None
+
+        client = get_openai_client(api_key, self.base_url)
+
+        raw = await client.chat.completions.with_raw_response.create(
+            model=model,
+            timeout=timeout,
+            stream=True,
+            stream_options={"include_usage": True},
+            **self._request_kwargs(messages),
+        )
+        stream = raw.parse()
+        parts = []
+        usage = None
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = _usage(chunk.usage)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                on_delta(delta)
+
+        return {
+            "content": "".join(parts),
+            "reasoning_details": None,
+            "usage": usage,
+            "headers": raw.headers,
+        }
@@ -1,15 +1,69 @@
 """OpenRouter API provider - fallback for models without native SDK support."""
 
-import httpx
-from typing import List, Dict, Any, Optional
+import json
+from typing import List, Dict, Any, Optional, Callable
 
-from .base import BaseProvider
-from ..config import OPENROUTER_API_KEY, OPENROUTER_API_URL
+from .base import BaseProvider, ProviderError, CACHEABLE, make_usage
+from .clients import get_http_client
+from ..config import OPENROUTER_API_KEY, OPENROUTER_API_URL, PROMPT_CACHE_ENABLED
+
+
+def _raise_for_error(data: Dict[str, Any]):
+    """OpenRouter can report upstream failures inside a 200 body or SSE chunk."""
+    error = data.get("error")
+    if error:
+        code = error.get("code") if isinstance(error, dict) else None
+        message = error.get("message", error) if isinstance(error, dict) else error
+        raise ProviderError(str(message), status_code=code if isinstance(code, int) else None)
+
+
+def _payload(model: str, messages: List[Dict[str, Any]], **extra: Any) -> Dict[str, Any]:
+    """
+    Request body; a message marked CACHEABLE (of any role - the council
+    prefix is a user message) becomes a content block with a cache_control
+    breakpoint, which OpenRouter forwards to Anthropic and Gemini models
+    (others cache prefixes automatically or ignore it).
+    """
+    converted = []
+    for msg in messages:
+        out = {k: v for k, v in msg.items() if k != CACHEABLE}
+        if PROMPT_CACHE_ENABLED and msg.get(CACHEABLE):
+            out["content"] = [{
+                "type": "text",
+                "text": msg.get("content", ""),
+                "cache_control": {"type": "ephemeral"},
+            }]
+        converted.append(out)
+    return {"model": model, "messages": converted, "usage": {"include": True}, **extra}
+
+
+def _usage(data: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    """Normalize OpenRouter's OpenAI-style usage block."""
+    usage = data.get("usage")
+    if not usage:
+        return None
+    details = usage.get("prompt_tokens_details") or {}
+    return make_usage(
+        usage.get("prompt_tokens"),
+        usage.get("completion_tokens"),
+        cache_read_tokens=details.get("cached_tokens"),
+        cache_write_tokens=details.get("cache_write_tokens"),
+    )
+
+
+def _headers() -> Dict[str, str]:
+    """Request headers for OpenRouter."""
+    return {
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+    }
 
 
 class OpenRouterProvider(BaseProvider):
     """OpenRouter API provider using httpx."""
 
+    name = "openrouter"
+
     async def query(
         self,
         model: str,
@@ -21,33 +75,72 @@ class OpenRouterProvider(BaseProvider):
             print("OpenRouter: OPENROUTER_API_KEY not set")
             return None
 
-        headers = {
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-            "Content-Type": "application/json",
-        }
+        payload = _payload(model, messages)
+
+        client = get_http_client(OPENROUTER_API_URL)
+        response = await client.post(
+            OPENROUTER_API_URL,
+            headers=_headers(),
+            json=payload,
+            timeout=timeout,
+        )
+        response.raise_for_status()
+
+        data = response.json()
+        _raise_for_error(data)
+        message = data["choices"][0]["message"]
 
-        payload = {
-            "model": model,
-            "messages": messages,
+        return {
+            "content": message.get("content"),
+            "reasoning_details": message.get("reasoning_details"),
+            "usage": _usage(data),
+            "headers": response.headers,
         }
 
-        try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(
-                    OPENROUTER_API_URL,
-                    headers=headers,
-                    json=payload,
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                message = data["choices"][0]["message"]
-
-                return {
-                    "content": message.get("content"),
-                    "reasoning_details": message.get("reasoning_details"),
-                }
-
-        except Exception as e:
-            print(f"Error querying OpenRouter model {model}: {e}")
+    async def stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        on_delta: Callable[[str], None],
+        timeout: float = 120.0,
+    ) -> Optional[Dict[str, Any]]:
+        """Stream from OpenRouter API (OpenAI-compatible SSE)."""
+        if not OPENROUTER_API_KEY:
+            print("OpenRouter: OPENROUTER_API_KEY not set")
             return None
+
+        payload = _payload(model, messages, stream=True)
+
+        client = get_http_client(OPENROUTER_API_URL)
+        parts = []
+        usage = None
+        async with client.stream(
+            "POST",
+            OPENROUTER_API_URL,
+            headers=_headers(),
+            json=payload,
+            timeout=timeout,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                # Skip blank keep-alives and ": OPENROUTER PROCESSING" comments
+                if not line.startswith("data: "):
+                    continue
+                data = line[6:].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                _raise_for_error(chunk)
+                usage = _usage(chunk) or usage
+                choices = chunk.get("choices") or []
+                delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                if delta:
+                    parts.append(delta)
+                    on_delta(delta)
+
+        return {
+            "content": "".join(parts),
+            "reasoning_details": None,
+            "usage": usage,
+            "headers": response.headers,
+        }
@@ -0,0 +1,194 @@
+"""Retry policy for provider calls: error classification, backoff and retry budget."""
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional, Tuple
+
+import httpx
+import openai
+import anthropic
+from google.genai import errors as genai_errors
+
+from .base import ProviderError
+from ..config import (
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    RETRY_BUDGET_RATIO,
+    RETRY_BUDGET_MAX,
+)
+
+# Statuses worth retrying: timeouts, conflicts, rate limits, overload and server errors
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+_TIMEOUT_ERRORS = (
+    asyncio.TimeoutError,
+    httpx.TimeoutException,
+    openai.APITimeoutError,
+    anthropic.APITimeoutError,
+)
+
+_CONNECTION_ERRORS = (
+    asyncio.TimeoutError,
+    httpx.TimeoutException,
+    httpx.TransportError,
+    openai.APIConnectionError,
+    anthropic.APIConnectionError,
+)
+
+
+def status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status carried by an SDK/httpx exception, if any."""
+    if isinstance(exc, (openai.APIStatusError, anthropic.APIStatusError, ProviderError)):
+        return exc.status_code
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code
+    if isinstance(exc, genai_errors.APIError):
+        return exc.code
+    return None
+
+
+def error_headers(exc: BaseException) -> Optional[httpx.Headers]:
+    """Response headers attached to an exception, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    return headers if isinstance(headers, httpx.Headers) else None
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """
+    Parse retry-after-ms / retry-after headers into seconds.
+
+    Args:
+        headers: Mapping of response headers
+
+    Returns:
+        Seconds to wait, or None if the server gave no hint
+    """
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _google_retry_delay(exc: BaseException) -> Optional[float]:
+    """Gemini reports its retry hint as a RetryInfo detail ("retryDelay": "30s")."""
+    details = getattr(exc, "details", None)
+    if not isinstance(details, dict):
+        return None
+    for detail in (details.get("error") or {}).get("details") or []:
+        delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+        if isinstance(delay, str) and delay.endswith("s"):
+            try:
+                return float(delay[:-1])
+            except ValueError:
+                return None
+    return None
+
+
+def classify_error(exc: BaseException) -> Tuple[bool, Optional[float]]:
+    """
+    Classify a provider error as retryable or fatal.
+
+    Args:
+        exc: Exception raised by a provider call
+
+    Returns:
+        Tuple of (retryable, retry_after seconds or None)
+    """
+    if isinstance(exc, ProviderError) and exc.retry_after is not None:
+        return True, exc.retry_after
+    if isinstance(exc, _CONNECTION_ERRORS):
+        return True, None
+
+    status = status_code(exc)
+    if status is None or status not in RETRYABLE_STATUS:
+        return False, None
+
+    retry_after = parse_retry_after(error_headers(exc))
+    if retry_after is None and isinstance(exc, genai_errors.APIError):
+        retry_after = _google_retry_delay(exc)
+    return True, retry_after
+
+
+def error_kind(exc: BaseException) -> str:
+    """
+    Coarse error category for metrics.
+
+    Returns:
+        One of "timeout", "connection", "rate_limited", "server", "client", "other"
+    """
+    if isinstance(exc, _TIMEOUT_ERRORS):
+        return "timeout"
+    if isinstance(exc, _CONNECTION_ERRORS):
+        return "connection"
+    status = status_code(exc)
+    if status == 429:
+        return "rate_limited"
+    if status == 408:
+        return "timeout"
+    if status is not None and status >= 500:
+        return "server"
+    if status is not None and status >= 400:
+        return "client"
+    return "other"
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Delay before the next attempt: exponential backoff with full jitter,
+    never shorter than the server's Retry-After.
+
+    Args:
+        attempt: Zero-based number of the attempt that just failed
+        retry_after: Server-provided wait in seconds, if any
+
+    Returns:
+        Seconds to sleep
+    """
+    delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class RetryBudget:
+    """
+    Token-bucket retry budget shared by all provider calls.
+
+    Every call deposits `ratio` tokens and every retry withdraws one, so the
+    retry rate is bounded by a fraction of real traffic and retries cannot
+    pile up during an outage.
+    """
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, max_tokens: float = RETRY_BUDGET_MAX):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self):
+        """Record a new call."""
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """Spend one retry token; False when the budget is exhausted."""
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
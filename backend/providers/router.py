@@ -1,13 +1,36 @@
 """Provider router - dispatches to native SDK or OpenRouter fallback."""
 
 import os
-from typing import List, Dict, Any, Optional
+import time
+import asyncio
+from typing import List, Dict, Any, Optional, Callable, Tuple, AsyncIterator, Awaitable
 
 from .base import BaseProvider
 from .openai_provider import OpenAIProvider
 from .anthropic_provider import AnthropicProvider
 from .google_provider import GoogleProvider
 from .openrouter_provider import OpenRouterProvider
+from .mock_provider import MockProvider
+from . import clients
+from .clients import open_clients
+from .retry import RetryBudget, classify_error, backoff_delay, status_code, error_headers, error_kind
+from .circuit import CircuitBreaker, get_breakers, acquire
+from .limits import get_limiters, limited
+from .hedging import LatencyTracker
+from .cache import ResponseCache, request_key
+from .singleflight import SingleFlight
+from .. import metrics, tracing
+from ..deadline import time_left, expired, clamp_timeout
+from ..config import (
+    OPENROUTER_API_KEY,
+    RESPONSE_CACHE_ENABLED,
+    SINGLE_FLIGHT_ENABLED,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_MAX_RETRY_AFTER,
+    HEDGE_ENABLED,
+    HEDGE_BUDGET_RATIO,
+    HEDGE_BUDGET_MAX,
+)
 
 # Lazy-initialized provider instances
 _openai_provider: OpenAIProvider | None = None
@@ -15,6 +38,26 @@ _xai_provider: OpenAIProvider | None = None
 _anthropic_provider: AnthropicProvider | None = None
 _google_provider: GoogleProvider | None = None
 _openrouter_provider: OpenRouterProvider | None = None
+_mock_provider: MockProvider | None = None
+
+# Shared retry budget across all provider calls
+_retry_budget = RetryBudget()
+
+# Hedging: observed latencies per route, and a budget capping duplicate calls
+_latency = LatencyTracker()
+_hedge_budget = RetryBudget(ratio=HEDGE_BUDGET_RATIO, max_tokens=HEDGE_BUDGET_MAX)
+
+# Content-addressed cache of successful responses
+_response_cache = ResponseCache()
+
+# Identical requests in flight at the same time share one upstream call
+_single_flight = SingleFlight()
+
+
+async def close_clients():
+    """Close pooled provider connections and the response cache's disk tier. Called at app shutdown."""
+    await clients.close_clients()
+    _response_cache.close()
 
 
 def _get_provider(model: str) -> BaseProvider:
@@ -34,6 +77,7 @@ def _get_provider(model: str) -> BaseProvider:
                 _xai_provider = OpenAIProvider(
                     base_url="https://api.x.ai/v1",
                     api_key_env="XAI_API_KEY",
+                    name="x-ai",
                 )
             return _xai_provider
     elif prefix == "anthropic":
@@ -42,6 +86,11 @@ def _get_provider(model: str) -> BaseProvider:
             if _anthropic_provider is None:
                 _anthropic_provider = AnthropicProvider()
             return _anthropic_provider
+    elif prefix == "mock":
+        global _mock_provider
+        if _mock_provider is None:
+            _mock_provider = MockProvider()
+        return _mock_provider
     elif prefix == "google":
         if os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY"):
             global _google_provider
@@ -50,6 +99,11 @@ def _get_provider(model: str) -> BaseProvider:
             return _google_provider
 
     # Fallback to OpenRouter
+    return _get_openrouter_provider()
+
+
+def _get_openrouter_provider() -> OpenRouterProvider:
+    """Get the shared OpenRouter provider."""
     global _openrouter_provider
     if _openrouter_provider is None:
         _openrouter_provider = OpenRouterProvider()
@@ -63,10 +117,274 @@ def _strip_model_prefix(model: str) -> str:
     return model
 
 
+def _resolve_route(
+    model: str,
+    force_openrouter: bool = False,
+) -> Tuple[BaseProvider, str, List[CircuitBreaker]]:
+    """
+    Pick the provider for a model and the model ID that provider expects.
+
+    Native routes are guarded by circuit breakers; while a native circuit is
+    open, calls fail over to OpenRouter (when an OpenRouter key is configured).
+
+    Args:
+        model: Model identifier as requested
+        force_openrouter: Use the OpenRouter route regardless (hedge calls)
+
+    Returns:
+        Tuple of (provider, api model ID, breakers to report the outcome to)
+    """
+    if force_openrouter:
+        return _get_openrouter_provider(), model, []
+
+    provider = _get_provider(model)
+
+    # OpenRouter uses full model ID; native APIs use stripped ID
+    if isinstance(provider, OpenRouterProvider):
+        return provider, model, []
+
+    breakers = get_breakers(provider.name, model)
+    if not OPENROUTER_API_KEY or not provider.openrouter_fallback or acquire(breakers):
+        return provider, _strip_model_prefix(model), breakers
+    return _get_openrouter_provider(), model, []
+
+
+async def _call_with_retries(
+    model: str,
+    call: Callable[[BaseProvider, str], Awaitable[Optional[Dict[str, Any]]]],
+    can_retry: Callable[[], bool] = lambda: True,
+    force_openrouter: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Run a provider call, retrying transient failures.
+
+    Each attempt holds a slot on the route's adaptive limiters, which learn
+    from rate-limit headers and back off on 429. The route is resolved per
+    attempt, so once a native circuit opens the remaining attempts fail over
+    to OpenRouter. Retryable errors (timeouts, connection errors,
+    408/409/425/429/5xx) are retried with exponential backoff and jitter,
+    honoring Retry-After, up to RETRY_MAX_ATTEMPTS and only while the shared
+    retry budget allows. Attempts are cut off at the request deadline, and
+    no retry starts that could not begin before it; an attempt cut off by
+    the deadline is not held against the route's circuit breakers.
+
+    Args:
+        model: Model identifier as requested
+        call: Coroutine factory performing one attempt on (provider, api model ID)
+        can_retry: Extra check evaluated before each retry
+        force_openrouter: Always use the OpenRouter route (hedge calls)
+
+    Returns:
+        Response dict with 'retries' count and the 'route' that answered,
+        or None if the call failed
+    """
+    _retry_budget.deposit()
+    attempt = 0
+    while True:
+        if expired():
+            print(f"Error querying model {model} (after {attempt} retries): request deadline exceeded")
+            return None
+        provider, api_model, breakers = _resolve_route(model, force_openrouter)
+        limiters = get_limiters(provider.name, model)
+        started = None
+        try:
+            # Queues here when the route is at its adaptive concurrency/rate limit
+            async with limited(limiters):
+                started = time.monotonic()
+                response = await asyncio.wait_for(call(provider, api_model), time_left())
+                elapsed = time.monotonic() - started
+        except asyncio.CancelledError:
+            for breaker in breakers:
+                breaker.release()
+            raise
+        except Exception as e:
+            if expired() and error_kind(e) == "timeout":
+                # Cut off by our own request deadline, not a route failure
+                for breaker in breakers:
+                    breaker.release()
+                print(f"Error querying model {model} via {provider.name} (after {attempt} retries): request deadline exceeded")
+                return None
+            elapsed = 0.0 if started is None else time.monotonic() - started
+            metrics.observe_provider_call(provider.name, model, elapsed, error_kind=error_kind(e))
+            retryable, retry_after = classify_error(e)
+            if status_code(e) == 429:
+                for limiter in limiters:
+                    limiter.on_rate_limited(error_headers(e), retry_after)
+            for breaker in breakers:
+                # Fatal errors (bad request, bad key) say nothing about the
+                # route's health: leave the state alone, just free the probe
+                if retryable:
+                    breaker.record_failure()
+                else:
+                    breaker.release()
+            delay = backoff_delay(attempt, retry_after)
+            left = time_left()
+            if (
+                not retryable
+                or attempt + 1 >= RETRY_MAX_ATTEMPTS
+                or (retry_after is not None and retry_after > RETRY_MAX_RETRY_AFTER)
+                or (left is not None and delay >= left)
+                or not can_retry()
+                or not _retry_budget.try_withdraw()
+            ):
+                print(f"Error querying model {model} via {provider.name} (after {attempt} retries): {e}")
+                return None
+            print(f"Retrying model {model} in {delay:.2f}s: {e}")
+            metrics.provider_retries.inc(provider=provider.name, model=model)
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+
+        headers = response.pop("headers", None) if response is not None else None
+        for limiter in limiters:
+            limiter.on_success(headers)
+        for breaker in breakers:
+            if response is not None:
+                breaker.record_success()
+            else:
+                breaker.release()
+        if response is not None:
+            metrics.observe_provider_call(provider.name, model, elapsed, usage=response.get("usage"))
+            _latency.record(provider.name, model, elapsed)
+            response["retries"] = attempt
+            response["route"] = provider.name
+        return response
+
+
+def _hedge_route(model: str) -> Optional[str]:
+    """Native route name if the model can also be reached via OpenRouter, else None."""
+    if not OPENROUTER_API_KEY:
+        return None
+    provider = _get_provider(model)
+    if isinstance(provider, OpenRouterProvider) or not provider.openrouter_fallback:
+        return None
+    return provider.name
+
+
+async def _hedged_call(
+    model: str,
+    native_route: str,
+    call: Callable[[BaseProvider, str], Awaitable[Optional[Dict[str, Any]]]],
+) -> Optional[Dict[str, Any]]:
+    """
+    Run call on the primary route; if it hasn't answered by the route's
+    observed p90 latency, duplicate it on OpenRouter and take the first answer.
+    """
+    _hedge_budget.deposit()
+    primary = asyncio.create_task(_call_with_retries(model, call))
+    tasks = {primary}
+    try:
+        delay = _latency.hedge_delay(native_route, model)
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return primary.result()
+
+        if not _hedge_budget.try_withdraw():
+            return await primary
+
+        hedge = asyncio.create_task(_call_with_retries(model, call, force_openrouter=True))
+        tasks.add(hedge)
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                response = task.result()
+                if response is not None:
+                    response["hedged"] = True
+                    return response
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _use_cache(cache: Optional[bool]) -> bool:
+    """Resolve a per-call cache flag against the global switch."""
+    return RESPONSE_CACHE_ENABLED and (cache is None or cache)
+
+
+def _cache_lookup(key: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Cached response for a request key, marked as a hit."""
+    if key is None:
+        return None
+    cached = _response_cache.get(key)
+    metrics.response_cache_lookups.inc(result="miss" if cached is None else "hit")
+    if cached is not None:
+        cached.update({"cache": "hit", "retries": 0, "route": "cache"})
+    return cached
+
+
+def _cache_store(key: Optional[str], response: Optional[Dict[str, Any]]):
+    """Cache a fresh response and mark it as a miss."""
+    if key is None or response is None:
+        return
+    response["cache"] = "miss"
+    if response.get("content"):
+        _response_cache.set(key, response)
+
+
+def _replica_key(model: str, messages: List[Dict[str, Any]], replica: int) -> str:
+    """Request key, made distinct per replica so duplicate seats never share a call."""
+    key = request_key(model, messages)
+    return key if replica == 0 else f"{key}#{replica}"
+
+
+def _stamp_latency(response: Optional[Dict[str, Any]], started: float) -> Optional[Dict[str, Any]]:
+    """Record the caller-observed wall-clock 'latency' (seconds, incl. retries)."""
+    if response is not None:
+        response["latency"] = round(time.monotonic() - started, 3)
+    return response
+
+
+async def _coalesce(
+    key: str,
+    fn: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Run an upstream call through the single-flight layer.
+
+    Returns:
+        Tuple of (response dict or None, whether it was shared with an
+        earlier identical call); shared responses are marked 'coalesced',
+        carry cache "coalesced" and no 'usage'
+    """
+    if not SINGLE_FLIGHT_ENABLED:
+        return await fn(), False
+    response, shared = await _single_flight.do(key, fn)
+    if shared:
+        metrics.coalesced_requests.inc()
+    if shared and response is not None:
+        # The call's tokens are accounted to the caller that started it
+        response.update({"coalesced": True, "cache": "coalesced", "usage": None})
+    return response, shared
+
+
+def _trace_response(span: Any, response: Optional[Dict[str, Any]]):
+    """Annotate a model-call span with the outcome."""
+    if response is None:
+        span.set_attribute("llm.failed", True)
+        return
+    usage = response.get("usage") or {}
+    span.set_attribute("llm.route", response.get("route"))
+    span.set_attribute("llm.retries", response.get("retries"))
+    span.set_attribute("llm.cache", response.get("cache"))
+    span.set_attribute("llm.coalesced", response.get("coalesced"))
+    span.set_attribute("llm.hedged", response.get("hedged"))
+    for field, count in usage.items():
+        span.set_attribute(f"llm.usage.{field}", count)
+
+
+@tracing.traced(
+    "llm.query_model",
+    attributes=lambda model, *args, **kwargs: {"llm.model": model},
+    result=_trace_response,
+)
 async def query_model(
     model: str,
     messages: List[Dict[str, str]],
     timeout: float = 120.0,
+    hedge: Optional[bool] = None,
+    cache: Optional[bool] = None,
+    replica: int = 0,
 ) -> Optional[Dict[str, Any]]:
     """
     Query a model via the appropriate provider (native SDK or OpenRouter).
@@ -74,20 +392,108 @@ async def query_model(
     Args:
         model: Model identifier (e.g., "openai/gpt-5.1", "anthropic/claude-sonnet-4.5")
         messages: List of message dicts with 'role' and 'content'
-        timeout: Request timeout in seconds
+        timeout: Request timeout in seconds (shortened to the request deadline)
+        hedge: Send a duplicate via OpenRouter if the native route straggles
+            past its p90 latency (defaults to HEDGE_ENABLED)
+        cache: Serve/store identical requests from the response cache
+            (defaults to RESPONSE_CACHE_ENABLED)
+        replica: Ordinal among identical requests made together (duplicate
+            council seats); replicas never share a call or cache entry
 
     Returns:
-        Response dict with 'content' and optional 'reasoning_details', or None if failed
+        Response dict with 'content', optional 'reasoning_details', the
+        number of 'retries' it took, the 'route' that answered, token
+        'usage', wall-clock 'latency' in seconds and 'cache' ("hit"/"miss",
+        when caching) ('hedged' is set when a hedge call was
+        sent, 'coalesced' when it was shared with an identical concurrent
+        call, whose caller accounts its usage), or None if failed
     """
-    provider = _get_provider(model)
+    started = time.monotonic()
+    key = _replica_key(model, messages, replica)
+    cache_key = key if _use_cache(cache) else None
+    cached = _cache_lookup(cache_key)
+    if cached is not None:
+        return _stamp_latency(cached, started)
 
-    # OpenRouter uses full model ID; native APIs use stripped ID
-    if isinstance(provider, OpenRouterProvider):
-        api_model = model
-    else:
-        api_model = _strip_model_prefix(model)
+    def call(provider: BaseProvider, api_model: str):
+        return provider.query(api_model, messages, clamp_timeout(timeout))
+
+    hedge = HEDGE_ENABLED if hedge is None else hedge
 
-    return await provider.query(api_model, messages, timeout)
+    async def upstream() -> Optional[Dict[str, Any]]:
+        native_route = _hedge_route(model) if hedge else None
+        if native_route is not None:
+            response = await _hedged_call(model, native_route, call)
+        else:
+            response = await _call_with_retries(model, call)
+        _cache_store(cache_key, response)
+        return response
+
+    response, _ = await _coalesce(key, upstream)
+    return _stamp_latency(response, started)
+
+
+@tracing.traced(
+    "llm.stream_model",
+    attributes=lambda model, *args, **kwargs: {"llm.model": model},
+    result=_trace_response,
+)
+async def stream_model(
+    model: str,
+    messages: List[Dict[str, str]],
+    on_delta: Callable[[str], None],
+    timeout: float = 120.0,
+    cache: Optional[bool] = None,
+    replica: int = 0,
+) -> Optional[Dict[str, Any]]:
+    """
+    Query a model, calling on_delta with each text chunk as it is generated.
+
+    Args:
+        model: Model identifier (e.g., "openai/gpt-5.1")
+        messages: List of message dicts with 'role' and 'content'
+        on_delta: Callback receiving each text delta
+        timeout: Request timeout in seconds (shortened to the request deadline)
+        cache: Serve/store identical requests from the response cache
+            (defaults to RESPONSE_CACHE_ENABLED); a hit arrives as one delta
+        replica: Ordinal among identical requests made together (duplicate
+            council seats); replicas never share a call or cache entry
+
+    Returns:
+        Response dict with the full 'content', or None if failed. When the
+        call is coalesced with an identical one already streaming, the
+        content arrives as one delta once that call completes.
+    """
+    started = time.monotonic()
+    key = _replica_key(model, messages, replica)
+    cache_key = key if _use_cache(cache) else None
+    cached = _cache_lookup(cache_key)
+    if cached is not None:
+        if cached.get("content"):
+            on_delta(cached["content"])
+        return _stamp_latency(cached, started)
+
+    emitted = False
+
+    def track_delta(text: str):
+        nonlocal emitted
+        emitted = True
+        on_delta(text)
+
+    async def upstream() -> Optional[Dict[str, Any]]:
+        # Once tokens have reached the client a retry would duplicate them
+        response = await _call_with_retries(
+            model,
+            lambda provider, api_model: provider.stream(api_model, messages, track_delta, clamp_timeout(timeout)),
+            can_retry=lambda: not emitted,
+        )
+        _cache_store(cache_key, response)
+        return response
+
+    response, shared = await _coalesce(key, upstream)
+    if shared and response is not None and response.get("content"):
+        on_delta(response["content"])
+    return _stamp_latency(response, started)
 
 
 async def query_models_parallel(
@@ -106,8 +512,6 @@ async def query_models_parallel(
     Returns:
         Dict mapping model identifier to response dict (or None if failed)
     """
-    import asyncio
-
     tasks = [query_model(m, messages, timeout) for m in models]
     responses = await asyncio.gather(*tasks)
     return {model: response for model, response in zip(models, responses)}
@@ -129,11 +533,85 @@ async def query_models_parallel_with_messages(
     Returns:
         Dict mapping model identifier to response dict (or None if failed)
     """
-    import asyncio
-
     tasks = [
         query_model(models[i], messages_list[i], timeout)
         for i in range(len(models))
     ]
     responses = await asyncio.gather(*tasks)
     return {model: response for model, response in zip(models, responses)}
+
+
+async def query_models_as_completed(
+    models: List[str],
+    messages_list: List[List[Dict[str, str]]],
+    timeout: float = 120.0,
+    on_delta: Optional[Callable[[int, str, str], None]] = None,
+    quorum: Optional[int] = None,
+    deadline: Optional[float] = None,
+    cache: Optional[bool] = None,
+) -> AsyncIterator[Tuple[int, str, Optional[Dict[str, Any]]]]:
+    """
+    Query multiple models in parallel, yielding each result as soon as it lands.
+
+    Unlike query_models_parallel_with_messages there is no barrier on the
+    slowest seat. Iteration stops once `quorum` seats have answered
+    successfully or `deadline` seconds have passed; closing the iterator
+    early has the same effect. Seats still running are then cancelled.
+
+    Args:
+        models: List of model identifiers (duplicates are separate seats)
+        messages_list: List of message lists, one per model
+        timeout: Request timeout per model
+        on_delta: Optional callback receiving (seat index, model, text delta);
+            when set, seats are streamed instead of queried
+        quorum: Successful answers after which to stop (None = all seats)
+        deadline: Seconds after which to stop waiting (None = no deadline);
+            the request deadline applies as well
+        cache: Per-call response cache flag passed to each seat
+
+    Yields:
+        Tuples of (seat index, model, response dict or None if failed)
+    """
+    tasks = {}
+    replicas: Dict[str, int] = {}
+    for i, model in enumerate(models):
+        key = request_key(model, messages_list[i])
+        replica = replicas.get(key, 0)
+        replicas[key] = replica + 1
+        if on_delta is not None:
+            coro = stream_model(
+                model,
+                messages_list[i],
+                lambda text, i=i, model=model: on_delta(i, model, text),
+                timeout,
+                cache=cache,
+                replica=replica,
+            )
+        else:
+            coro = query_model(model, messages_list[i], timeout, cache=cache, replica=replica)
+        tasks[asyncio.create_task(coro)] = i
+
+    loop = asyncio.get_running_loop()
+    deadline = clamp_timeout(deadline)
+    deadline_at = None if deadline is None else loop.time() + deadline
+    answered = 0
+    pending = set(tasks)
+    try:
+        while pending:
+            wait_timeout = None if deadline_at is None else max(0.0, deadline_at - loop.time())
+            done, pending = await asyncio.wait(
+                pending, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break  # Stage deadline passed
+            for task in sorted(done, key=tasks.get):
+                i = tasks[task]
+                response = task.result()
+                if response is not None:
+                    answered += 1
+                yield i, models[i], response
+            if quorum is not None and answered >= quorum:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,75 @@
+"""Single-flight coalescing of identical in-flight provider requests."""
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class _Flight:
+    """One upstream call and the number of callers waiting on it."""
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Share one upstream call between concurrent callers with the same key.
+
+    The first caller for a key starts the call; callers arriving while it is
+    in flight wait on the same task and each receive their own copy of the
+    result. A caller that is cancelled (e.g. its client disconnected) only
+    stops waiting; the shared call is cancelled once no caller is left.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.coalesced = 0
+
+    def in_flight(self) -> int:
+        """Number of distinct upstream calls currently running."""
+        return len(self._flights)
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    ) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Run fn() once for all concurrent callers sharing key.
+
+        Args:
+            key: Request hash identifying identical calls
+            fn: Zero-argument coroutine function making the upstream call
+
+        Returns:
+            Tuple of (response dict or None, whether this caller joined an
+            existing flight rather than starting it)
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.create_task(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _, key=key, flight=flight: self._forget(key, flight))
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            # This caller went away; drop the upstream call if it was the last
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                self._forget(key, flight)
+                flight.task.cancel()
+            raise
+        flight.waiters -= 1
+        return copy.deepcopy(result), shared
+
+    def _forget(self, key: str, flight: _Flight):
+        """Remove a finished flight so later calls start afresh."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1,418 @@
+"""SQLite storage for conversations (STORAGE_BACKEND=sqlite).
+
+Same functions as storage.py. Conversations, their messages and the stage
+results of assistant messages live in separate tables of one WAL-mode
+database, so listing conversations reads an indexed metadata table instead of
+every conversation. A new database imports the existing JSON conversations
+once; run `python -m backend.sqlite_storage [json_dir]` to import again
+(conversations already present are skipped).
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from .config import DATA_DIR, STORAGE_SQLITE_PATH
+from .tracing import traced
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    title TEXT NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS conversations_created_at ON conversations (created_at);
+CREATE TABLE IF NOT EXISTS messages (
+    conversation_id TEXT NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT,
+    usage TEXT,
+    PRIMARY KEY (conversation_id, position)
+);
+CREATE TABLE IF NOT EXISTS stage_results (
+    conversation_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    seat INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (conversation_id, position, stage, seat),
+    FOREIGN KEY (conversation_id, position) REFERENCES messages (conversation_id, position) ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS turn_checkpoints (
+    turn_id TEXT PRIMARY KEY,
+    conversation_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    checkpoint TEXT NOT NULL
+);
+"""
+
+# Stages stored per assistant message; stage3 is a single result at seat 0
+_STAGES = ("stage1", "stage2", "stage3")
+
+_db: Optional[sqlite3.Connection] = None
+_lock = threading.RLock()
+
+
+def _conversation_attributes(conversation_id: str, *args, **kwargs) -> Dict[str, Any]:
+    """Span attributes for storage calls keyed by conversation id."""
+    return {"conversation.id": conversation_id}
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the database on first use, creating the schema (and importing JSON conversations) if new."""
+    global _db
+    if _db is None:
+        Path(STORAGE_SQLITE_PATH).parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(STORAGE_SQLITE_PATH, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA foreign_keys=ON")
+        is_new = db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'conversations'"
+        ).fetchone() is None
+        db.executescript(_SCHEMA)
+        db.commit()
+        _db = db
+        if is_new:
+            migrated = migrate_from_json(DATA_DIR)
+            if migrated:
+                print(f"Imported {migrated} conversations from {DATA_DIR} into {STORAGE_SQLITE_PATH}")
+    return _db
+
+
+def _insert_message(db: sqlite3.Connection, conversation_id: str, position: int, message: Dict[str, Any]):
+    """Insert one message row plus, for an assistant message, its stage results."""
+    usage = message.get("usage")
+    db.execute(
+        "INSERT INTO messages (conversation_id, position, role, content, usage) VALUES (?, ?, ?, ?, ?)",
+        (
+            conversation_id,
+            position,
+            message["role"],
+            message.get("content"),
+            json.dumps(usage) if usage is not None else None,
+        ),
+    )
+    if message["role"] != "assistant":
+        return
+    rows = []
+    for stage in _STAGES:
+        results = message.get(stage)
+        if stage == "stage3":
+            results = [results] if results is not None else []
+        for seat, result in enumerate(results or []):
+            rows.append((conversation_id, position, stage, seat, json.dumps(result)))
+    db.executemany(
+        "INSERT INTO stage_results (conversation_id, position, stage, seat, result) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def _append_message(conversation_id: str, message: Dict[str, Any]):
+    """Append a message at the end of a conversation in one transaction."""
+    db = _connect()
+    with _lock, db:
+        row = db.execute(
+            "SELECT message_count FROM conversations WHERE id = ?", (conversation_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Conversation {conversation_id} not found")
+        _insert_message(db, conversation_id, row[0], message)
+        db.execute(
+            "UPDATE conversations SET message_count = message_count + 1 WHERE id = ?",
+            (conversation_id,),
+        )
+
+
+@traced("storage.create_conversation", attributes=_conversation_attributes)
+def create_conversation(conversation_id: str) -> Dict[str, Any]:
+    """
+    Create a new conversation.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+
+    Returns:
+        New conversation dict
+    """
+    conversation = {
+        "id": conversation_id,
+        "created_at": datetime.utcnow().isoformat(),
+        "title": "New Conversation",
+        "messages": []
+    }
+
+    db = _connect()
+    with _lock, db:
+        db.execute(
+            "INSERT INTO conversations (id, created_at, title, message_count) VALUES (?, ?, ?, 0)",
+            (conversation_id, conversation["created_at"], conversation["title"]),
+        )
+
+    return conversation
+
+
+@traced("storage.get_conversation", attributes=_conversation_attributes)
+def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a conversation from storage.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+
+    Returns:
+        Conversation dict or None if not found
+    """
+    db = _connect()
+    with _lock:
+        row = db.execute(
+            "SELECT created_at, title FROM conversations WHERE id = ?", (conversation_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        message_rows = db.execute(
+            "SELECT position, role, content, usage FROM messages WHERE conversation_id = ? ORDER BY position",
+            (conversation_id,),
+        ).fetchall()
+        result_rows = db.execute(
+            "SELECT position, stage, result FROM stage_results WHERE conversation_id = ? ORDER BY position, stage, seat",
+            (conversation_id,),
+        ).fetchall()
+
+    results: Dict[int, Dict[str, List[Any]]] = {}
+    for position, stage, result in result_rows:
+        results.setdefault(position, {}).setdefault(stage, []).append(json.loads(result))
+
+    messages = []
+    for position, role, content, usage in message_rows:
+        if role == "assistant":
+            stages = results.get(position, {})
+            stage3 = stages.get("stage3")
+            message = {
+                "role": role,
+                "stage1": stages.get("stage1", []),
+                "stage2": stages.get("stage2", []),
+                "stage3": stage3[0] if stage3 else None,
+            }
+            if usage is not None:
+                message["usage"] = json.loads(usage)
+        else:
+            message = {"role": role, "content": content}
+        messages.append(message)
+
+    return {
+        "id": conversation_id,
+        "created_at": row[0],
+        "title": row[1],
+        "messages": messages,
+    }
+
+
+@traced("storage.save_conversation", attributes=lambda conversation: {"conversation.id": conversation["id"]})
+def save_conversation(conversation: Dict[str, Any]):
+    """
+    Save a conversation to storage, replacing any stored version.
+
+    Args:
+        conversation: Conversation dict to save
+    """
+    db = _connect()
+    with _lock, db:
+        db.execute(
+            "INSERT INTO conversations (id, created_at, title, message_count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET created_at = excluded.created_at, title = excluded.title, "
+            "message_count = excluded.message_count",
+            (
+                conversation["id"],
+                conversation["created_at"],
+                conversation.get("title", "New Conversation"),
+                len(conversation["messages"]),
+            ),
+        )
+        db.execute("DELETE FROM stage_results WHERE conversation_id = ?", (conversation["id"],))
+        db.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation["id"],))
+        for position, message in enumerate(conversation["messages"]):
+            _insert_message(db, conversation["id"], position, message)
+
+
+@traced("storage.list_conversations")
+def list_conversations(limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+    """
+    List conversations (metadata only), newest first.
+
+    Args:
+        limit: Maximum number of conversations to return (None = all)
+        offset: Number of newest conversations to skip
+
+    Returns:
+        List of conversation metadata dicts
+    """
+    db = _connect()
+    with _lock:
+        rows = db.execute(
+            "SELECT id, created_at, title, message_count FROM conversations "
+            "ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset),
+        ).fetchall()
+
+    return [
+        {"id": id, "created_at": created_at, "title": title, "message_count": message_count}
+        for id, created_at, title, message_count in rows
+    ]
+
+
+@traced("storage.add_user_message", attributes=_conversation_attributes)
+def add_user_message(conversation_id: str, content: str):
+    """
+    Add a user message to a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        content: User message content
+    """
+    _append_message(conversation_id, {"role": "user", "content": content})
+
+
+@traced("storage.add_assistant_message", attributes=_conversation_attributes)
+def add_assistant_message(
+    conversation_id: str,
+    stage1: List[Dict[str, Any]],
+    stage2: List[Dict[str, Any]],
+    stage3: Dict[str, Any],
+    usage: Optional[Dict[str, Any]] = None,
+):
+    """
+    Add an assistant message with all 3 stages to a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        stage1: List of individual model responses
+        stage2: List of model rankings
+        stage3: Final synthesized response
+        usage: Optional per-stage and total token/cost/latency accounting
+    """
+    message = {
+        "role": "assistant",
+        "stage1": stage1,
+        "stage2": stage2,
+        "stage3": stage3
+    }
+    if usage is not None:
+        message["usage"] = usage
+    _append_message(conversation_id, message)
+
+
+@traced("storage.update_conversation_title", attributes=_conversation_attributes)
+def update_conversation_title(conversation_id: str, title: str):
+    """
+    Update the title of a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        title: New title for the conversation
+    """
+    db = _connect()
+    with _lock, db:
+        updated = db.execute(
+            "UPDATE conversations SET title = ? WHERE id = ?", (title, conversation_id)
+        ).rowcount
+    if not updated:
+        raise ValueError(f"Conversation {conversation_id} not found")
+
+
+@traced("storage.save_turn_checkpoint", attributes=lambda checkpoint: {"conversation.id": checkpoint["conversation_id"]})
+def save_turn_checkpoint(checkpoint: Dict[str, Any]):
+    """
+    Save the progress of a running turn, replacing its previous checkpoint.
+
+    Args:
+        checkpoint: Checkpoint dict with at least 'turn_id' and 'conversation_id'
+    """
+    db = _connect()
+    with _lock, db:
+        db.execute(
+            "INSERT OR REPLACE INTO turn_checkpoints (turn_id, conversation_id, created_at, checkpoint) VALUES (?, ?, ?, ?)",
+            (
+                checkpoint["turn_id"],
+                checkpoint["conversation_id"],
+                checkpoint.get("created_at", ""),
+                json.dumps(checkpoint),
+            ),
+        )
+
+
+@traced("storage.list_turn_checkpoints")
+def list_turn_checkpoints() -> List[Dict[str, Any]]:
+    """
+    Load every saved turn checkpoint (turns that have not finished).
+
+    Returns:
+        List of checkpoint dicts, oldest first
+    """
+    db = _connect()
+    with _lock:
+        rows = db.execute("SELECT checkpoint FROM turn_checkpoints ORDER BY created_at").fetchall()
+    return [json.loads(row[0]) for row in rows]
+
+
+@traced("storage.delete_turn_checkpoint")
+def delete_turn_checkpoint(turn_id: str):
+    """
+    Remove a turn's checkpoint, if any.
+
+    Args:
+        turn_id: Turn identifier
+    """
+    db = _connect()
+    with _lock, db:
+        db.execute("DELETE FROM turn_checkpoints WHERE turn_id = ?", (turn_id,))
+
+
+def migrate_from_json(json_dir: str = DATA_DIR) -> int:
+    """
+    Import JSON conversation files (as written by storage.py) into the database.
+
+    Conversations already in the database are skipped, so this can be rerun.
+
+    Args:
+        json_dir: Directory holding <conversation id>.json files
+
+    Returns:
+        Number of conversations imported
+    """
+    if not os.path.isdir(json_dir):
+        return 0
+
+    db = _connect()
+    imported = 0
+    for filename in sorted(os.listdir(json_dir)):
+        if not filename.endswith('.json'):
+            continue
+        path = os.path.join(json_dir, filename)
+        try:
+            with open(path, 'r') as f:
+                conversation = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Skipping {path}: {e}")
+            continue
+        with _lock:
+            exists = db.execute(
+                "SELECT 1 FROM conversations WHERE id = ?", (conversation["id"],)
+            ).fetchone()
+        if exists is None:
+            save_conversation(conversation)
+            imported += 1
+    return imported
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else DATA_DIR
+    count = migrate_from_json(source)
+    print(f"Imported {count} conversations from {source} into {STORAGE_SQLITE_PATH}")
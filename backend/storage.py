@@ -1,11 +1,18 @@
-"""JSON-based storage for conversations."""
+"""JSON-based storage for conversations (jsonl_storage.py and sqlite_storage.py can stand in)."""
 
 import json
 import os
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 from pathlib import Path
-from .config import DATA_DIR
+from .config import DATA_DIR, STORAGE_BACKEND
+from .tracing import traced
+from .conversation_index import ConversationIndex
+
+
+def _conversation_attributes(conversation_id: str, *args, **kwargs) -> Dict[str, Any]:
+    """Span attributes for storage calls keyed by conversation id."""
+    return {"conversation.id": conversation_id}
 
 
 def ensure_data_dir():
@@ -18,6 +25,31 @@ def get_conversation_path(conversation_id: str) -> str:
     return os.path.join(DATA_DIR, f"{conversation_id}.json")
 
 
+def _metadata(conversation: Dict[str, Any]) -> Dict[str, Any]:
+    """Listing metadata of a conversation."""
+    return {
+        "id": conversation["id"],
+        "created_at": conversation["created_at"],
+        "title": conversation.get("title", "New Conversation"),
+        "message_count": len(conversation["messages"])
+    }
+
+
+def _scan_conversations() -> Iterable[Dict[str, Any]]:
+    """Metadata of every stored conversation, read from the files (builds the index)."""
+    ensure_data_dir()
+    for filename in os.listdir(DATA_DIR):
+        if filename.endswith('.json'):
+            path = os.path.join(DATA_DIR, filename)
+            with open(path, 'r') as f:
+                yield _metadata(json.load(f))
+
+
+# Listing metadata, built on the first listing and kept current by save_conversation
+_index = ConversationIndex(_scan_conversations)
+
+
+@traced("storage.create_conversation", attributes=_conversation_attributes)
 def create_conversation(conversation_id: str) -> Dict[str, Any]:
     """
     Create a new conversation.
@@ -41,10 +73,12 @@ def create_conversation(conversation_id: str) -> Dict[str, Any]:
     path = get_conversation_path(conversation_id)
     with open(path, 'w') as f:
         json.dump(conversation, f, indent=2)
+    _index.put(_metadata(conversation))
 
     return conversation
 
 
+@traced("storage.get_conversation", attributes=_conversation_attributes)
 def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
     """
     Load a conversation from storage.
@@ -64,6 +98,7 @@ def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
         return json.load(f)
 
 
+@traced("storage.save_conversation", attributes=lambda conversation: {"conversation.id": conversation["id"]})
 def save_conversation(conversation: Dict[str, Any]):
     """
     Save a conversation to storage.
@@ -76,37 +111,28 @@ def save_conversation(conversation: Dict[str, Any]):
     path = get_conversation_path(conversation['id'])
     with open(path, 'w') as f:
         json.dump(conversation, f, indent=2)
+    _index.put(_metadata(conversation))
 
 
-def list_conversations() -> List[Dict[str, Any]]:
+@traced("storage.list_conversations")
+def list_conversations(limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
     """
-    List all conversations (metadata only).
+    List conversations (metadata only), newest first.
+
+    Served from the in-memory metadata index, so the cost is proportional to
+    the page returned; the files are only read to build the index once.
+
+    Args:
+        limit: Maximum number of conversations to return (None = all)
+        offset: Number of newest conversations to skip
 
     Returns:
         List of conversation metadata dicts
     """
-    ensure_data_dir()
-
-    conversations = []
-    for filename in os.listdir(DATA_DIR):
-        if filename.endswith('.json'):
-            path = os.path.join(DATA_DIR, filename)
-            with open(path, 'r') as f:
-                data = json.load(f)
-                # Return metadata only
-                conversations.append({
-                    "id": data["id"],
-                    "created_at": data["created_at"],
-                    "title": data.get("title", "New Conversation"),
-                    "message_count": len(data["messages"])
-                })
-
-    # Sort by creation time, newest first
-    conversations.sort(key=lambda x: x["created_at"], reverse=True)
-
-    return conversations
+    return _index.page(limit, offset)
 
 
+@traced("storage.add_user_message", attributes=_conversation_attributes)
 def add_user_message(conversation_id: str, content: str):
     """
     Add a user message to a conversation.
@@ -127,11 +153,13 @@ def add_user_message(conversation_id: str, content: str):
     save_conversation(conversation)
 
 
+@traced("storage.add_assistant_message", attributes=_conversation_attributes)
 def add_assistant_message(
     conversation_id: str,
     stage1: List[Dict[str, Any]],
     stage2: List[Dict[str, Any]],
-    stage3: Dict[str, Any]
+    stage3: Dict[str, Any],
+    usage: Optional[Dict[str, Any]] = None,
 ):
     """
     Add an assistant message with all 3 stages to a conversation.
@@ -141,21 +169,26 @@ def add_assistant_message(
         stage1: List of individual model responses
         stage2: List of model rankings
         stage3: Final synthesized response
+        usage: Optional per-stage and total token/cost/latency accounting
     """
     conversation = get_conversation(conversation_id)
     if conversation is None:
         raise ValueError(f"Conversation {conversation_id} not found")
 
-    conversation["messages"].append({
+    message = {
         "role": "assistant",
         "stage1": stage1,
         "stage2": stage2,
         "stage3": stage3
-    })
+    }
+    if usage is not None:
+        message["usage"] = usage
+    conversation["messages"].append(message)
 
     save_conversation(conversation)
 
 
+@traced("storage.update_conversation_title", attributes=_conversation_attributes)
 def update_conversation_title(conversation_id: str, title: str):
     """
     Update the title of a conversation.
@@ -170,3 +203,95 @@ def update_conversation_title(conversation_id: str, title: str):
 
     conversation["title"] = title
     save_conversation(conversation)
+
+
+def get_checkpoint_path(turn_id: str) -> str:
+    """Get the file path for a turn checkpoint."""
+    return os.path.join(DATA_DIR, "checkpoints", f"{turn_id}.json")
+
+
+@traced("storage.save_turn_checkpoint", attributes=lambda checkpoint: {"conversation.id": checkpoint["conversation_id"]})
+def save_turn_checkpoint(checkpoint: Dict[str, Any]):
+    """
+    Save the progress of a running turn, replacing its previous checkpoint.
+
+    The file is written to a temporary path and renamed, so a crash mid-write
+    leaves the previous checkpoint intact.
+
+    Args:
+        checkpoint: Checkpoint dict with at least 'turn_id' and 'conversation_id'
+    """
+    path = get_checkpoint_path(checkpoint["turn_id"])
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+@traced("storage.list_turn_checkpoints")
+def list_turn_checkpoints() -> List[Dict[str, Any]]:
+    """
+    Load every saved turn checkpoint (turns that have not finished).
+
+    Returns:
+        List of checkpoint dicts, oldest first
+    """
+    checkpoint_dir = os.path.join(DATA_DIR, "checkpoints")
+    if not os.path.isdir(checkpoint_dir):
+        return []
+
+    checkpoints = []
+    for filename in os.listdir(checkpoint_dir):
+        if filename.endswith('.json'):
+            path = os.path.join(checkpoint_dir, filename)
+            try:
+                with open(path, 'r') as f:
+                    checkpoints.append(json.load(f))
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Error reading turn checkpoint {path}: {e}")
+
+    checkpoints.sort(key=lambda x: x.get("created_at", ""))
+    return checkpoints
+
+
+@traced("storage.delete_turn_checkpoint")
+def delete_turn_checkpoint(turn_id: str):
+    """
+    Remove a turn's checkpoint, if any.
+
+    Args:
+        turn_id: Turn identifier
+    """
+    try:
+        os.remove(get_checkpoint_path(turn_id))
+    except FileNotFoundError:
+        pass
+
+
+# The JSONL and SQLite backends replace the JSON-file functions above (see STORAGE_BACKEND)
+if STORAGE_BACKEND == "jsonl":
+    from .jsonl_storage import (  # noqa: F811
+        create_conversation,
+        get_conversation,
+        save_conversation,
+        list_conversations,
+        add_user_message,
+        add_assistant_message,
+        update_conversation_title,
+    )
+elif STORAGE_BACKEND == "sqlite":
+    from .sqlite_storage import (  # noqa: F811
+        create_conversation,
+        get_conversation,
+        save_conversation,
+        list_conversations,
+        add_user_message,
+        add_assistant_message,
+        update_conversation_title,
+        save_turn_checkpoint,
+        list_turn_checkpoints,
+        delete_turn_checkpoint,
+    )
+elif STORAGE_BACKEND != "json":
+    print(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r}, using json")
@@ -0,0 +1,236 @@
+"""Request tracing: OpenTelemetry when installed, else spans written as JSONL.
+
+One trace per council turn, with child spans for stages, model calls and
+storage access. Export goes over OTLP when the OpenTelemetry SDK and OTLP
+exporter are installed and OTEL_EXPORTER_OTLP_ENDPOINT is set; otherwise
+finished spans are appended to TRACE_JSONL_PATH. With TRACING_ENABLED off
+every helper here is a no-op.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .config import TRACING_ENABLED, TRACE_JSONL_PATH, TRACE_SERVICE_NAME
+
+# Lazily chosen backend: "otel", "jsonl" or "off"
+_backend: Optional[str] = None
+_otel_tracer = None
+_otel_provider = None
+
+# JSONL fallback state
+_current: contextvars.ContextVar[Optional["_Span"]] = contextvars.ContextVar("council_span", default=None)
+_jsonl_lock = threading.Lock()
+
+
+def _init_otel() -> bool:
+    """Set up an OTLP-exporting tracer provider; False if OTel is unavailable."""
+    global _otel_tracer, _otel_provider
+    if not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") and not os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT"):
+        return False
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    except ImportError:
+        print("Tracing: OpenTelemetry SDK/OTLP exporter not installed, writing spans to JSONL")
+        return False
+
+    _otel_provider = TracerProvider(resource=Resource.create({"service.name": TRACE_SERVICE_NAME}))
+    _otel_provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(_otel_provider)
+    _otel_tracer = trace.get_tracer("llm-council")
+    return True
+
+
+def _get_backend() -> str:
+    """Pick the tracing backend on first use."""
+    global _backend
+    if _backend is None:
+        if not TRACING_ENABLED:
+            _backend = "off"
+        elif _init_otel():
+            _backend = "otel"
+        else:
+            _backend = "jsonl"
+    return _backend
+
+
+def _clean(value: Any) -> Any:
+    """Coerce an attribute to a type both OTel and JSON accept."""
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+
+class _Span:
+    """Minimal span for the JSONL fallback, W3C trace-context compatible."""
+
+    def __init__(self, name: str, parent: Optional["_Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = {k: _clean(v) for k, v in attributes.items() if v is not None}
+        self.start_ns = time.time_ns()
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        if value is not None:
+            self.attributes[key] = _clean(value)
+
+    def record_exception(self, exc: BaseException):
+        self.status = "error"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def end(self):
+        end_ns = time.time_ns()
+        record = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_time_ns": self.start_ns,
+            "end_time_ns": end_ns,
+            "duration_ms": round((end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+        }
+        line = json.dumps(record) + "\n"
+        try:
+            with _jsonl_lock:
+                Path(TRACE_JSONL_PATH).parent.mkdir(parents=True, exist_ok=True)
+                with open(TRACE_JSONL_PATH, 'a') as f:
+                    f.write(line)
+        except OSError as e:
+            print(f"Tracing: error writing span to {TRACE_JSONL_PATH}: {e}")
+
+
+class _NoopSpan:
+    """Span stand-in when tracing is off."""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_exception(self, exc: BaseException):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Open a span as a child of the current one (or a new trace).
+
+    Args:
+        name: Span name (e.g. "council.stage1")
+        **attributes: Initial span attributes; None values are skipped
+
+    Yields:
+        Span with set_attribute(key, value) and record_exception(exc)
+    """
+    backend = _get_backend()
+    if backend == "off":
+        yield _NOOP
+        return
+
+    if backend == "otel":
+        from opentelemetry.trace import Status, StatusCode
+
+        clean = {k: _clean(v) for k, v in attributes.items() if v is not None}
+        with _otel_tracer.start_as_current_span(name, attributes=clean, record_exception=False) as otel_span:
+            try:
+                yield otel_span
+            except BaseException as e:
+                otel_span.record_exception(e)
+                otel_span.set_status(Status(StatusCode.ERROR, str(e)))
+                raise
+        return
+
+    current = _Span(name, _current.get(), attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.record_exception(e)
+        raise
+    finally:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Generator-based callers may finish in a different context
+            _current.set(None)
+        current.end()
+
+
+def traced(
+    name: str,
+    attributes: Optional[Callable[..., Dict[str, Any]]] = None,
+    result: Optional[Callable[[Any, Any], None]] = None,
+):
+    """
+    Decorator wrapping a sync or async function in a span.
+
+    Args:
+        name: Span name
+        attributes: Optional callable taking the function's arguments and
+            returning initial span attributes
+        result: Optional callable (span, return value) to annotate the span
+            with the outcome (e.g. token counts)
+    """
+    def decorator(fn):
+        def start(args, kwargs):
+            return span(name, **(attributes(*args, **kwargs) if attributes else {}))
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with start(args, kwargs) as current:
+                    value = await fn(*args, **kwargs)
+                    if result is not None:
+                        result(current, value)
+                    return value
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with start(args, kwargs) as current:
+                value = fn(*args, **kwargs)
+                if result is not None:
+                    result(current, value)
+                return value
+        return wrapper
+
+    return decorator
+
+
+def inject_headers(headers: Any):
+    """Add W3C trace-context headers for the current span to an outgoing request."""
+    backend = _get_backend()
+    if backend == "otel":
+        from opentelemetry.propagate import inject
+
+        inject(headers)
+    elif backend == "jsonl":
+        current = _current.get()
+        if current is not None:
+            headers["traceparent"] = f"00-{current.trace_id}-{current.span_id}-01"
+
+
+def shutdown():
+    """Flush buffered spans. Called at app shutdown."""
+    if _otel_provider is not None:
+        _otel_provider.shutdown()
@@ -0,0 +1,481 @@
+"""Council turns as event-emitting runs, shared by the message endpoints and background jobs.
+
+Streamed turns run as tasks of their own, recording events in a replayable
+EventLog, so a client that reconnects (with Last-Event-ID) resumes the same
+turn instead of starting a new one. Non-streaming requests await their turn
+directly (await_turn).
+
+Every turn is checkpointed to storage as it goes (each member result and each
+completed stage); turns interrupted by a restart resume from their checkpoint
+on startup, re-querying only the seats and stages that had not finished.
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from . import storage
+from . import metrics
+from . import tracing
+from .config import REQUEST_DEADLINE, TURN_RESUME_GRACE, TURN_RETENTION, TURN_CHECKPOINTS_ENABLED
+from .events import EventLog
+from .drain import in_flight
+from .deadline import request_deadline, time_left, DeadlineExceeded
+from .council import (
+    generate_conversation_title,
+    stage1_collect_responses,
+    stage2_collect_rankings,
+    stage3_synthesize_final,
+    calculate_aggregate_rankings,
+    record_turn_usage,
+)
+
+# Receives each event of a turn, in order
+Emit = Callable[[Dict[str, Any]], None]
+
+
+# Set while the app shuts down: turns cancelled then keep their checkpoints
+_shutting_down = False
+
+
+class Checkpoint:
+    """
+    Progress of a running turn as saved to storage: the request, each member
+    result as it lands and each completed stage, with the turn metadata.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+    @classmethod
+    def start(
+        cls,
+        conversation_id: str,
+        content: str,
+        models: List[str],
+        personas: Optional[List[Dict[str, Any]]],
+        subject: Optional[str],
+        is_first_message: bool,
+        turn_id: Optional[str] = None,
+    ) -> "Checkpoint":
+        """A fresh checkpoint for a turn about to run."""
+        return cls({
+            "turn_id": turn_id or str(uuid.uuid4()),
+            "conversation_id": conversation_id,
+            "created_at": datetime.utcnow().isoformat(),
+            "request": {
+                "content": content,
+                "models": models,
+                "personas": personas,
+                "subject": subject,
+                "is_first_message": is_first_message,
+            },
+            "members": {"stage1": {}, "stage2": {}},
+            "stages": {},
+            "metadata": {},
+        })
+
+    @property
+    def turn_id(self) -> str:
+        return self.data["turn_id"]
+
+    @property
+    def conversation_id(self) -> str:
+        return self.data["conversation_id"]
+
+    @property
+    def request(self) -> Dict[str, Any]:
+        return self.data["request"]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.data["metadata"]
+
+    def members(self, stage: str) -> Dict[int, Dict[str, Any]]:
+        """Member results of a stage collected so far, by seat index."""
+        return {int(index): result for index, result in self.data["members"][stage].items()}
+
+    def stage(self, stage: str) -> Any:
+        """A completed stage's results, or None if it has not completed."""
+        return self.data["stages"].get(stage)
+
+    def record(self, event: Dict[str, Any]):
+        """Save the member result carried by a stage1/stage2_member_complete event."""
+        stage, _, kind = event["type"].partition("_")
+        if kind != "member_complete":
+            return
+        result = dict(event["data"])
+        index = str(result.pop("index"))
+        if index not in self.data["members"][stage]:
+            self.data["members"][stage][index] = result
+            self.save()
+
+    def complete_stage(self, stage: str, result: Any):
+        """Save a completed stage along with the metadata at that point."""
+        self.data["stages"][stage] = result
+        self.save()
+
+    def save(self):
+        if not TURN_CHECKPOINTS_ENABLED:
+            return
+        try:
+            storage.save_turn_checkpoint(self.data)
+        except OSError as e:
+            print(f"Error checkpointing turn {self.turn_id}: {e}")
+
+    def discard(self):
+        if TURN_CHECKPOINTS_ENABLED:
+            storage.delete_turn_checkpoint(self.turn_id)
+
+
+async def _within_deadline(awaitable: Awaitable[Any]) -> Any:
+    """Await under the request deadline, cancelling the work if it passes."""
+    try:
+        return await asyncio.wait_for(awaitable, time_left())
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded() from None
+
+
+async def run_turn(
+    conversation_id: str,
+    content: str,
+    models: List[str],
+    personas: Optional[List[Dict[str, Any]]],
+    subject: Optional[str],
+    is_first_message: bool,
+    emit: Emit,
+    checkpoint: Optional[Checkpoint] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Run the 3-stage council for a user message already stored in the conversation.
+
+    Emits the same events the streaming endpoint sends (stage starts, deltas,
+    member results, stage completions, title, 'complete' or 'error'), saves
+    the assistant message and, for a first message, the title. The turn is
+    bounded by REQUEST_DEADLINE; cancelling the calling task cancels every
+    stage, provider call and title generation it started.
+
+    Progress is checkpointed to storage as each member result and stage
+    completes. The checkpoint is removed when the turn ends, unless it was
+    cancelled by an app shutdown, in which case it resumes on startup.
+
+    Args:
+        conversation_id: Conversation the turn belongs to
+        content: The user's message
+        models: Council member models
+        personas: Optional persona dicts (one per model)
+        subject: Optional discussion subject for the chairman
+        is_first_message: Whether to generate a conversation title
+        emit: Callback receiving each event
+        checkpoint: Optional checkpoint of an interrupted run of this turn;
+            completed stages and member results are reused, not re-queried
+
+    Returns:
+        Dict with 'stage1', 'stage2', 'stage3' and 'metadata', or None if the
+        turn failed (an 'error' event carries the reason)
+    """
+    if checkpoint is None:
+        checkpoint = Checkpoint.start(conversation_id, content, models, personas, subject, is_first_message)
+        checkpoint.save()
+    metadata = checkpoint.metadata
+    title_task = None
+
+    def on_event(event: Dict[str, Any]):
+        checkpoint.record(event)
+        emit(event)
+
+    metrics.council_runs_in_flight.inc()
+    with tracing.span(
+        "council.turn",
+        **{"conversation.id": conversation_id, "council.seats": len(models), "council.streaming": True},
+    ) as turn_span, request_deadline(REQUEST_DEADLINE), in_flight():
+        try:
+            # Start title generation in parallel (don't await yet)
+            if is_first_message:
+                title_task = asyncio.create_task(generate_conversation_title(content))
+
+            # Stage 1: Collect responses, streaming per-seat token deltas
+            emit({'type': 'stage1_start'})
+            stage1_results = checkpoint.stage('stage1')
+            if stage1_results is None:
+                stage1_results = await _within_deadline(stage1_collect_responses(
+                    content, models, personas, on_event=on_event, metadata=metadata,
+                    checkpointed=checkpoint.members('stage1'),
+                ))
+                checkpoint.complete_stage('stage1', stage1_results)
+            emit({'type': 'stage1_complete', 'data': stage1_results, 'metadata': {'dropped_seats': metadata.get('dropped_seats', {})}})
+
+            # Stage 2: Collect rankings, emitting each ranker as it lands
+            emit({'type': 'stage2_start'})
+            stage2_results = checkpoint.stage('stage2')
+            if stage2_results is None:
+                stage2_results, label_to_model = await _within_deadline(stage2_collect_rankings(
+                    content, stage1_results, models, personas, on_event=on_event, metadata=metadata,
+                    checkpointed=checkpoint.members('stage2'),
+                ))
+                aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
+                metadata.update({'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings})
+                checkpoint.complete_stage('stage2', stage2_results)
+            emit({'type': 'stage2_complete', 'data': stage2_results, 'metadata': metadata})
+
+            # Stage 3: Synthesize final answer, streaming the chairman's tokens
+            emit({'type': 'stage3_start'})
+            stage3_result = checkpoint.stage('stage3')
+            if stage3_result is None:
+                stage3_result = await _within_deadline(stage3_synthesize_final(
+                    content,
+                    stage1_results,
+                    stage2_results,
+                    personas=personas,
+                    subject=subject,
+                    on_event=emit,
+                    metadata=metadata,
+                ))
+                checkpoint.complete_stage('stage3', stage3_result)
+            total = record_turn_usage(metadata)
+            turn_span.set_attribute("council.cost", total["cost"])
+            turn_span.set_attribute("council.input_tokens", total["input_tokens"])
+            turn_span.set_attribute("council.cache_read_tokens", total["cache_read_tokens"])
+            emit({'type': 'stage3_complete', 'data': stage3_result, 'metadata': metadata})
+
+            # Wait for title generation if it was started
+            if title_task:
+                title = await _within_deadline(title_task)
+                storage.update_conversation_title(conversation_id, title)
+                emit({'type': 'title_complete', 'data': {'title': title}})
+
+            # Save complete assistant message
+            storage.add_assistant_message(
+                conversation_id,
+                stage1_results,
+                stage2_results,
+                stage3_result,
+                usage=metadata.get('usage'),
+            )
+            checkpoint.discard()
+
+            # Send completion event
+            emit({'type': 'complete'})
+            return {
+                "stage1": stage1_results,
+                "stage2": stage2_results,
+                "stage3": stage3_result,
+                "metadata": metadata,
+            }
+
+        except DeadlineExceeded as e:
+            metrics.council_turns_abandoned.inc(reason="deadline")
+            turn_span.set_attribute("council.abandoned", "deadline")
+            turn_span.record_exception(e)
+            checkpoint.discard()
+            emit({'type': 'error', 'message': str(e)})
+        except asyncio.CancelledError:
+            # Keep the checkpoint across a shutdown so the turn resumes on startup
+            if not _shutting_down:
+                checkpoint.discard()
+            raise
+        except Exception as e:
+            # Send error event
+            turn_span.record_exception(e)
+            checkpoint.discard()
+            emit({'type': 'error', 'message': str(e)})
+        finally:
+            if title_task is not None:
+                title_task.cancel()
+            metrics.council_runs_in_flight.dec()
+    return None
+
+
+class Turn:
+    """A streamed council turn: its task, event log and attached clients."""
+
+    def __init__(self, conversation_id: str, turn_id: Optional[str] = None):
+        self.id = turn_id or str(uuid.uuid4())
+        self.conversation_id = conversation_id
+        self.log = EventLog(f"turn-{self.id}")
+        self.task: Optional[asyncio.Task] = None
+        self.watchers = 0
+        self.finished_at: Optional[float] = None
+        # Pending cancellation while no client is attached
+        self._grace_timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def done(self) -> bool:
+        return self.task is not None and self.task.done()
+
+    def _finished(self, _task: asyncio.Task):
+        self.finished_at = time.time()
+        self.log.close()
+
+    def _abandon_if_unwatched(self):
+        """Cancel the turn if no client came back within the resume grace period."""
+        if self.watchers == 0 and not self.done:
+            print(f"No client reattached, abandoning turn {self.id} in conversation {self.conversation_id}")
+            metrics.council_turns_abandoned.inc(reason="client_disconnect")
+            self.task.cancel()
+
+
+# Streamed turns by id, and the latest turn per conversation
+_turns: Dict[str, Turn] = {}
+_latest: Dict[str, str] = {}
+
+# Turns awaited by a non-streaming request
+_awaited: Set[asyncio.Task] = set()
+
+
+def _prune_turns():
+    """Forget turns that finished more than TURN_RETENTION seconds ago."""
+    cutoff = time.time() - TURN_RETENTION
+    for turn in [t for t in _turns.values() if t.finished_at is not None and t.finished_at < cutoff]:
+        del _turns[turn.id]
+        if _latest.get(turn.conversation_id) == turn.id:
+            del _latest[turn.conversation_id]
+        turn.log.discard()
+
+
+def _start(checkpoint: Checkpoint) -> Turn:
+    """Run a checkpointed turn in the background and register it."""
+    _prune_turns()
+    turn = Turn(checkpoint.conversation_id, checkpoint.turn_id)
+    request = checkpoint.request
+    turn.task = asyncio.create_task(run_turn(
+        checkpoint.conversation_id,
+        request["content"],
+        request["models"],
+        request["personas"],
+        request["subject"],
+        request["is_first_message"],
+        emit=turn.log.append,
+        checkpoint=checkpoint,
+    ))
+    turn.task.add_done_callback(turn._finished)
+    _turns[turn.id] = turn
+    _latest[turn.conversation_id] = turn.id
+    return turn
+
+
+def start_turn(
+    conversation_id: str,
+    content: str,
+    models: List[str],
+    personas: Optional[List[Dict[str, Any]]],
+    subject: Optional[str],
+    is_first_message: bool,
+) -> Turn:
+    """
+    Start run_turn in the background, recording its events in the turn's log.
+
+    Returns:
+        The running Turn; stream it with watch_turn()
+    """
+    checkpoint = Checkpoint.start(conversation_id, content, models, personas, subject, is_first_message)
+    checkpoint.save()
+    return _start(checkpoint)
+
+
+async def await_turn(
+    conversation_id: str,
+    content: str,
+    models: List[str],
+    personas: Optional[List[Dict[str, Any]]],
+    subject: Optional[str],
+    is_first_message: bool,
+    emit: Emit,
+) -> Optional[Dict[str, Any]]:
+    """
+    Run run_turn for a caller that waits for its result (the non-streaming
+    endpoint). The turn is registered so shutdown_turns cancels it like a
+    streamed turn, keeping its checkpoint; the caller then gets None after an
+    'error' event. Cancelling the caller cancels the turn.
+
+    Returns:
+        run_turn's result
+    """
+    task = asyncio.create_task(run_turn(
+        conversation_id, content, models, personas, subject, is_first_message, emit=emit,
+    ))
+    _awaited.add(task)
+    task.add_done_callback(_awaited.discard)
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if not (_shutting_down and task.cancelled()):
+            raise
+        emit({'type': 'error', 'message': "Server is shutting down; the turn resumes after restart"})
+        return None
+
+
+def resume_interrupted_turns() -> List[Turn]:
+    """
+    Resume every turn left checkpointed by a previous process.
+
+    Turns whose conversation is gone or already ends in an assistant message
+    are dropped. Resumed turns are streamed turns like any other, so clients
+    can attach with GET on the conversation's message stream.
+
+    Returns:
+        The resumed Turns
+    """
+    global _shutting_down
+    _shutting_down = False  # Starting up (again, when the app is restarted in-process)
+    if not TURN_CHECKPOINTS_ENABLED:
+        return []
+    resumed = []
+    for data in storage.list_turn_checkpoints():
+        checkpoint = Checkpoint(data)
+        conversation = storage.get_conversation(checkpoint.conversation_id)
+        if conversation is None or not conversation["messages"] or conversation["messages"][-1]["role"] != "user":
+            checkpoint.discard()
+            continue
+        done = ", ".join(checkpoint.data["stages"]) or "no stages"
+        print(f"Resuming turn {checkpoint.turn_id} in conversation {checkpoint.conversation_id} ({done} completed)")
+        metrics.council_turns_resumed.inc()
+        resumed.append(_start(checkpoint))
+    return resumed
+
+
+async def shutdown_turns():
+    """
+    Cancel running streamed and awaited turns, keeping their checkpoints
+    (and those of jobs cancelled after this).
+    """
+    global _shutting_down
+    _shutting_down = True
+    running = [turn.task for turn in _turns.values() if not turn.done]
+    running.extend(task for task in _awaited if not task.done())
+    for task in running:
+        task.cancel()
+    await asyncio.gather(*running, return_exceptions=True)
+
+
+def get_turn(turn_id: str) -> Optional[Turn]:
+    """A running or recently finished turn by id."""
+    return _turns.get(turn_id)
+
+
+def latest_turn(conversation_id: str) -> Optional[Turn]:
+    """The conversation's most recent running or recently finished turn."""
+    turn_id = _latest.get(conversation_id)
+    return _turns.get(turn_id) if turn_id else None
+
+
+async def watch_turn(turn: Turn, after: int = 0) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield (event id, event) from a turn's log after `after`, live until it ends.
+
+    While no client is watching, the turn keeps running for TURN_RESUME_GRACE
+    seconds and is then cancelled.
+    """
+    turn.watchers += 1
+    if turn._grace_timer is not None:
+        turn._grace_timer.cancel()
+        turn._grace_timer = None
+    try:
+        async for item in turn.log.follow(after):
+            yield item
+    finally:
+        turn.watchers -= 1
+        if turn.watchers == 0 and not turn.done:
+            turn._grace_timer = asyncio.get_running_loop().call_later(TURN_RESUME_GRACE, turn._abandon_if_unwatched)
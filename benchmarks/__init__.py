@@ -0,0 +1 @@
+"""Benchmarks for the LLM Council backend (run with `python -m benchmarks.<name>`)."""
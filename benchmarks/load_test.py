@@ -0,0 +1,401 @@
+"""End-to-end load test for the FastAPI app against mock providers.
+
+Drives backend.main.app either in-process (straight through ASGI, no
+sockets) or over HTTP against a local uvicorn (started here, or an external
+one via --url), running many concurrent council turns. Each turn creates a
+conversation and streams one message. Measures:
+
+- council turns/sec
+- time to first SSE event and time to the final answer (stage3_complete)
+- event-loop lag (how late a 10 ms ticker wakes up)
+- memory growth (RSS) across the conversations created
+
+Results are written as JSON (with the git commit) so runs can be compared:
+
+    uv run python -m benchmarks.load_test --turns 2000 --concurrency 32
+    uv run python -m benchmarks.load_test --compare data/bench/load_test-<old commit>.json
+
+By default the council is mock/a, mock/b, mock/c with mock/chair as
+chairman, conversations go to a temporary DATA_DIR (stored per --storage),
+and the response cache is off so every turn does the full work.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+# Metrics where a higher value is better; everything else compared is lower-is-better
+_HIGHER_IS_BETTER = {"turns_per_sec"}
+
+# Metrics compared by --compare
+_COMPARED = (
+    "turns_per_sec",
+    "first_event_p50", "first_event_p99",
+    "final_answer_p50", "final_answer_p99",
+    "loop_lag_p99",
+    "rss_growth_per_1k_mb",
+)
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, or None for no samples."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(q * len(ordered) + 0.5)) - 1))
+    return round(ordered[index], 4)
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class LoopLagMonitor:
+    """Ticks every interval and records how late each wake-up was."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - expected))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+class ASGIClient:
+    """Minimal in-process HTTP client that timestamps each streamed body chunk."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None, on_chunk=None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"content-type", b"application/json"), (b"host", b"bench")],
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+        }
+        sent = False
+        disconnected = asyncio.Event()
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": payload, "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        status = 0
+        chunks: List[bytes] = []
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                if chunk:
+                    chunks.append(chunk)
+                    if on_chunk is not None:
+                        on_chunk(chunk)
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            disconnected.set()
+        return status, b"".join(chunks)
+
+
+async def _turn_in_process(client: ASGIClient, question: str) -> Dict[str, Any]:
+    """Create a conversation and stream one message through ASGI."""
+    status, body = await client.request("POST", "/api/conversations", {})
+    conversation_id = json.loads(body)["id"]
+
+    started = time.perf_counter()
+    timings: Dict[str, Optional[float]] = {"first_event": None, "final_answer": None}
+    buffer = b""
+    errors: List[str] = []
+
+    def on_chunk(chunk: bytes):
+        nonlocal buffer
+        now = time.perf_counter() - started
+        buffer += chunk
+        while b"\n\n" in buffer:
+            raw, buffer = buffer.split(b"\n\n", 1)
+            data = [line for line in raw.split(b"\n") if line.startswith(b"data: ")]
+            if not data:
+                continue
+            if timings["first_event"] is None:
+                timings["first_event"] = now
+            event = json.loads(data[0][6:])
+            if event["type"] == "stage3_complete":
+                timings["final_answer"] = now
+            elif event["type"] == "error":
+                errors.append(event.get("message", ""))
+
+    status, _ = await client.request(
+        "POST", f"/api/conversations/{conversation_id}/message/stream",
+        {"content": question}, on_chunk=on_chunk,
+    )
+    return {"status": status, "errors": errors, **timings}
+
+
+async def _turn_http(client, question: str) -> Dict[str, Any]:
+    """Create a conversation and stream one message over HTTP."""
+    response = await client.post("/api/conversations", json={})
+    conversation_id = response.json()["id"]
+
+    started = time.perf_counter()
+    timings: Dict[str, Optional[float]] = {"first_event": None, "final_answer": None}
+    errors: List[str] = []
+    async with client.stream(
+        "POST", f"/api/conversations/{conversation_id}/message/stream",
+        json={"content": question},
+    ) as response:
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            now = time.perf_counter() - started
+            if timings["first_event"] is None:
+                timings["first_event"] = now
+            event = json.loads(line[6:])
+            if event["type"] == "stage3_complete":
+                timings["final_answer"] = now
+            elif event["type"] == "error":
+                errors.append(event.get("message", ""))
+        status = response.status_code
+    return {"status": status, "errors": errors, **timings}
+
+
+async def _run(args) -> Dict[str, Any]:
+    """Run the load test and return the results document."""
+    from backend.main import app
+
+    monitor = LoopLagMonitor()
+    results: List[Dict[str, Any]] = []
+    rss_samples: List[List[float]] = []
+    next_turn = 0
+
+    async def worker(run_turn, client):
+        nonlocal next_turn
+        while next_turn < args.turns:
+            index = next_turn
+            next_turn += 1
+            # Distinct questions so single-flight/caching can't short-circuit turns
+            try:
+                results.append(await run_turn(client, f"Benchmark question {index}?"))
+            except Exception as e:
+                results.append({"status": 0, "errors": [repr(e)], "first_event": None, "final_answer": None})
+            if len(results) % args.sample_every == 0:
+                gc.collect()
+                rss_samples.append([len(results), round(_rss_mb(), 2)])
+
+    async def drive(run_turn, client):
+        gc.collect()
+        rss_samples.append([0, round(_rss_mb(), 2)])
+        monitor.start()
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(run_turn, client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        await monitor.stop()
+        if rss_samples[-1][0] != len(results):
+            gc.collect()
+            rss_samples.append([len(results), round(_rss_mb(), 2)])
+        return elapsed
+
+    server = None
+    server_task = None
+    if args.mode == "in-process":
+        async with app.router.lifespan_context(app):
+            elapsed = await drive(_turn_in_process, ASGIClient(app))
+    else:
+        import httpx
+
+        url = args.url
+        if url is None:
+            import uvicorn
+
+            server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+            server_task = asyncio.create_task(server.serve())
+            while not server.started:
+                await asyncio.sleep(0.05)
+            url = f"http://127.0.0.1:{args.port}"
+        limits = httpx.Limits(max_connections=args.concurrency * 2)
+        async with httpx.AsyncClient(base_url=url, timeout=None, limits=limits) as client:
+            elapsed = await drive(_turn_http, client)
+        if server is not None:
+            server.should_exit = True
+            await server_task
+
+    first_events = [r["first_event"] for r in results if r["first_event"] is not None]
+    final_answers = [r["final_answer"] for r in results if r["final_answer"] is not None]
+    failed = [r for r in results if r["status"] != 200 or r["errors"] or r["final_answer"] is None]
+    growth = None
+    if len(rss_samples) >= 2 and rss_samples[-1][0] > 0:
+        growth = round((rss_samples[-1][1] - rss_samples[0][1]) / rss_samples[-1][0] * 1000, 3)
+
+    return {
+        "benchmark": "load_test",
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {
+            "mode": args.mode if args.url is None else "external",
+            "turns": args.turns,
+            "concurrency": args.concurrency,
+            "council_models": os.environ.get("COUNCIL_MODELS"),
+            "chairman_model": os.environ.get("CHAIRMAN_MODEL"),
+            "mock_latency_median": os.environ.get("MOCK_LATENCY_MEDIAN"),
+            "mock_token_interval": os.environ.get("MOCK_TOKEN_INTERVAL"),
+            "mock_failure_rate": os.environ.get("MOCK_FAILURE_RATE"),
+            "mock_seed": os.environ.get("MOCK_SEED"),
+            "storage_backend": os.environ.get("STORAGE_BACKEND"),
+        },
+        "results": {
+            "elapsed_sec": round(elapsed, 3),
+            "completed_turns": len(results) - len(failed),
+            "failed_turns": len(failed),
+            "turns_per_sec": round((len(results) - len(failed)) / elapsed, 3) if elapsed else None,
+            "first_event_p50": _percentile(first_events, 0.5),
+            "first_event_p90": _percentile(first_events, 0.9),
+            "first_event_p99": _percentile(first_events, 0.99),
+            "final_answer_p50": _percentile(final_answers, 0.5),
+            "final_answer_p90": _percentile(final_answers, 0.9),
+            "final_answer_p99": _percentile(final_answers, 0.99),
+            "loop_lag_p50": _percentile(monitor.lags, 0.5),
+            "loop_lag_p99": _percentile(monitor.lags, 0.99),
+            "loop_lag_max": round(max(monitor.lags), 4) if monitor.lags else None,
+            "rss_start_mb": rss_samples[0][1] if rss_samples else None,
+            "rss_end_mb": rss_samples[-1][1] if rss_samples else None,
+            "rss_growth_per_1k_mb": growth,
+            "rss_samples": rss_samples,
+            "sample_errors": sorted({e for r in failed for e in r["errors"]})[:5],
+        },
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compare two result documents.
+
+    Returns:
+        Human-readable regressions beyond tolerance (a fraction, e.g. 0.1)
+    """
+    regressions = []
+    for metric in _COMPARED:
+        new = current["results"].get(metric)
+        old = baseline["results"].get(metric)
+        if new is None or old is None:
+            continue
+        if metric in _HIGHER_IS_BETTER:
+            worse = new < old * (1 - tolerance)
+        else:
+            # Small absolute floor so near-zero timings don't flag noise
+            worse = new > old * (1 + tolerance) + 0.001
+        marker = "REGRESSION" if worse else "ok"
+        print(f"  {metric:24s} {old!s:>10} -> {new!s:>10}  {marker}")
+        if worse:
+            regressions.append(f"{metric}: {old} -> {new}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=["in-process", "uvicorn"], default="in-process")
+    parser.add_argument("--url", help="Benchmark an already running server instead")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the local uvicorn")
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-median", type=float, default=0.05, help="Mock call latency median (s)")
+    parser.add_argument("--token-interval", type=float, default=0.0005, help="Mock streaming cadence (s)")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--storage", choices=["json", "jsonl", "sqlite"], default="json", help="Conversation storage backend")
+    parser.add_argument("--sample-every", type=int, default=100, help="Turns between RSS samples")
+    parser.add_argument("--output", help="Results file (default data/bench/load_test-<commit>.json)")
+    parser.add_argument("--compare", help="Baseline results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed regression fraction")
+    args = parser.parse_args()
+
+    # Configuration is read at import time, so set it before importing the app
+    os.environ.setdefault("COUNCIL_MODELS", "mock/a,mock/b,mock/c")
+    os.environ.setdefault("CHAIRMAN_MODEL", "mock/chair")
+    os.environ.setdefault("TITLE_MODEL", "mock/title")
+    os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+    os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="council-bench-"))
+    os.environ.setdefault("STORAGE_SQLITE_PATH", os.path.join(os.environ["DATA_DIR"], "council.sqlite3"))
+    os.environ["STORAGE_BACKEND"] = args.storage
+    os.environ["MOCK_LATENCY_MEDIAN"] = str(args.latency_median)
+    os.environ["MOCK_TOKEN_INTERVAL"] = str(args.token_interval)
+    os.environ["MOCK_FAILURE_RATE"] = str(args.failure_rate)
+    os.environ["MOCK_SEED"] = str(args.seed)
+
+    report = asyncio.run(_run(args))
+    print(json.dumps(report["results"] | {"rss_samples": f"{len(report['results']['rss_samples'])} samples"}, indent=2))
+
+    output = args.output or os.path.join("data", "bench", f"load_test-{report['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare} ({baseline.get('commit')}):")
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
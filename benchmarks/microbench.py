@@ -0,0 +1,249 @@
+"""Microbenchmarks for the council's per-turn pure functions.
+
+Covers ranking parsing and aggregation, persona context and the prompt
+builders over realistic and adversarial inputs (multi-kilobyte rankings,
+big councils, malformed or marker-free rankings, long digit runs). Each
+case runs at two input sizes 4x apart. Besides the time per call at the
+larger size it reports the scaling exponent (log of the time ratio over
+log of the size ratio), so a parser change that goes quadratic shows up
+as an exponent near 2 even when the absolute times are machine-dependent.
+
+    uv run python -m benchmarks.microbench
+    uv run python -m benchmarks.microbench --case parse_ranking
+    uv run python -m benchmarks.microbench --update-baseline
+
+Runs are compared against benchmarks/baselines/microbench.json; the exit
+status is nonzero on a regression.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.council import (
+    RANKING_PROMPT,
+    _build_chairman_prompt,
+    _build_council_context,
+    _build_messages,
+    _build_persona_context,
+    calculate_aggregate_rankings,
+    parse_ranking_from_text,
+)
+from .load_test import _git_commit
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "microbench.json")
+
+# Size ratio between the two runs of each case
+SCALE = 4
+
+# Exponent above which a case counts as superlinear whatever its baseline
+MAX_EXPONENT = 1.5
+
+_PROSE = (
+    "Response A covers the main tradeoffs but glosses over failure modes. "
+    "Response B is accurate, with a clear structure, though it misses edge cases. "
+    "Response C offers the most depth and cites concrete numbers for each claim. "
+)
+
+
+def _labels(n: int) -> List[str]:
+    """Anonymized labels as stage 2 assigns them (capped at Z)."""
+    return [f"Response {chr(65 + i % 26)}" for i in range(n)]
+
+
+def _ranking_text(prose_chars: int, members: int = 20) -> str:
+    """A well-formed ranking: evaluation prose, then the FINAL RANKING list."""
+    prose = (_PROSE * (prose_chars // len(_PROSE) + 1))[:prose_chars]
+    ranking = "\n".join(f"{i}. {label}" for i, label in enumerate(_labels(members), start=1))
+    return f"{prose}\n\nFINAL RANKING:\n{ranking}"
+
+
+def _stage1(members: int, response_chars: int) -> List[Dict[str, Any]]:
+    text = (_PROSE * (response_chars // len(_PROSE) + 1))[:response_chars]
+    return [{"model": f"provider/model-{i}", "response": text} for i in range(members)]
+
+
+def _stage2(members: int, prose_chars: int, parsed: bool) -> List[Dict[str, Any]]:
+    results = []
+    for i in range(members):
+        text = _ranking_text(prose_chars)
+        result = {"model": f"provider/model-{i}", "ranking": text}
+        if parsed:
+            result["parsed_ranking"] = parse_ranking_from_text(text)
+        results.append(result)
+    return results
+
+
+def _personas(members: int, prompt_chars: int) -> List[Dict[str, Any]]:
+    prompt = "You are a careful reviewer " + "who weighs evidence " * (prompt_chars // 20)
+    return [{"name": f"Persona {i}", "prompt": prompt} for i in range(members)]
+
+
+def _label_map(members: int) -> Dict[str, str]:
+    return {label: f"provider/model-{i}" for i, label in enumerate(_labels(members))}
+
+
+# name -> (base size, builds a zero-argument call for a given size)
+CASES: Dict[str, Tuple[int, Callable[[int], Callable[[], Any]]]] = {
+    # Ranking parsing; size is characters of ranking text
+    "parse_ranking.well_formed": (
+        2_000, lambda n: (lambda text: lambda: parse_ranking_from_text(text))(_ranking_text(n)),
+    ),
+    "parse_ranking.no_marker": (
+        2_000, lambda n: (lambda text: lambda: parse_ranking_from_text(text))((_PROSE * (n // len(_PROSE) + 1))[:n]),
+    ),
+    "parse_ranking.unnumbered": (
+        2_000, lambda n: (lambda text: lambda: parse_ranking_from_text(text))(
+            _ranking_text(n).replace(". Response", " Response")
+        ),
+    ),
+    "parse_ranking.repeated_marker": (
+        2_000, lambda n: (lambda text: lambda: parse_ranking_from_text(text))("FINAL RANKING:\n1. Response A\n" * (n // 30)),
+    ),
+    "parse_ranking.digit_run": (
+        2_000, lambda n: (lambda text: lambda: parse_ranking_from_text(text))("FINAL RANKING:\n" + "1" * n),
+    ),
+    "parse_ranking.whitespace_run": (
+        2_000, lambda n: (lambda text: lambda: parse_ranking_from_text(text))("FINAL RANKING:\n1." + " " * n),
+    ),
+    # Aggregation; size is the number of rankers, each ranking 20 labels in 4 KB
+    "aggregate.reparse": (
+        16, lambda n: (lambda results, labels: lambda: calculate_aggregate_rankings(results, labels))(
+            _stage2(n, 4_000, parsed=False), _label_map(20),
+        ),
+    ),
+    "aggregate.preparsed": (
+        16, lambda n: (lambda results, labels: lambda: calculate_aggregate_rankings(results, labels))(
+            _stage2(n, 4_000, parsed=True), _label_map(20),
+        ),
+    ),
+    # Prompt builders; size is council members
+    "persona_context": (
+        6, lambda n: (lambda stage1, personas: lambda: _build_persona_context(stage1, personas))(
+            _stage1(n, 200), _personas(n, 2_000),
+        ),
+    ),
+    "council_context": (
+        6, lambda n: (lambda stage1: lambda: _build_council_context("What should we build next?", stage1))(
+            _stage1(n, 4_000),
+        ),
+    ),
+    "chairman_prompt": (
+        6, lambda n: (lambda stage2, labels: lambda: _build_chairman_prompt(
+            "What should we build next?", labels, stage2, "- provider/model-0 (persona: Critic): terse", "Roadmap",
+        ))(_stage2(n, 4_000, parsed=True), _label_map(n)),
+    ),
+    "ranking_messages": (
+        6, lambda n: (lambda context, personas: lambda: [
+            context + _build_messages(RANKING_PROMPT, persona) for persona in personas
+        ])(_build_council_context("What should we build next?", _stage1(n, 4_000))[0], _personas(n, 2_000)),
+    ),
+}
+
+
+def _time_call(call: Callable[[], Any], repeat: int) -> float:
+    """Best seconds per call over `repeat` timing runs."""
+    timer = timeit.Timer(call)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_case(name: str, repeat: int) -> Dict[str, Any]:
+    """Time one case at its base size and SCALE times it."""
+    base, make = CASES[name]
+    small = _time_call(make(base), repeat)
+    large = _time_call(make(base * SCALE), repeat)
+    exponent = math.log(large / small) / math.log(SCALE) if small > 0 and large > 0 else 0.0
+    return {
+        "size": base * SCALE,
+        "us_per_call": round(large * 1e6, 3),
+        "exponent": round(exponent, 2),
+    }
+
+
+def compare(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+) -> List[str]:
+    """
+    Compare case results against a baseline.
+
+    Args:
+        current: Case name -> result from run_case
+        baseline: The same for the baseline run
+        tolerance: Allowed slowdown as a fraction (e.g. 0.5 for 50%)
+
+    Returns:
+        Human-readable regressions
+    """
+    regressions = []
+    for name, result in current.items():
+        old = baseline.get(name)
+        problems = []
+        if result["exponent"] > MAX_EXPONENT and (old is None or result["exponent"] > old["exponent"] + 0.3):
+            problems.append(f"scales as n^{result['exponent']}")
+        if old is not None and result["us_per_call"] > old["us_per_call"] * (1 + tolerance):
+            problems.append(f"{old['us_per_call']}us -> {result['us_per_call']}us")
+        if problems:
+            regressions.append(f"{name}: {', '.join(problems)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--case", action="append", help="Run cases whose name starts with this (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per size (best is kept)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=1.0, help="Allowed slowdown fraction (timings are noisy)")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--output", help="Results file (default data/bench/microbench-<commit>.json)")
+    args = parser.parse_args()
+
+    names = [
+        name for name in CASES
+        if not args.case or any(name.startswith(prefix) for prefix in args.case)
+    ]
+    baseline: Dict[str, Dict[str, Any]] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("cases", {})
+
+    results = {}
+    for name in names:
+        results[name] = run_case(name, args.repeat)
+        old = baseline.get(name)
+        vs = f"  (baseline {old['us_per_call']}us, n^{old['exponent']})" if old else ""
+        print(f"{name:32s} {results[name]['us_per_call']:>12.3f}us  n^{results[name]['exponent']:<5}{vs}")
+
+    report = {
+        "benchmark": "microbench",
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "cases": results,
+    }
+    if args.update_baseline:
+        output: Optional[str] = args.baseline
+    else:
+        output = args.output or os.path.join("data", "bench", f"microbench-{report['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if not args.update_baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -105,6 +105,33 @@ function App() {
             });
             break;
 
+          case 'stage1_delta':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              const { index, model, delta } = event.data;
+              const partial = [...(lastMsg.stage1 || [])];
+              while (partial.length < index) partial.push({ model: '', response: '' });
+              const current = partial[index] || { model, response: '' };
+              partial[index] = { ...current, response: current.response + delta };
+              lastMsg.stage1 = partial;
+              return { ...prev, messages };
+            });
+            break;
+
+          case 'stage1_member_complete':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              const { index, model, response } = event.data;
+              const partial = [...(lastMsg.stage1 || [])];
+              while (partial.length < index) partial.push({ model: '', response: '' });
+              partial[index] = { model, response };
+              lastMsg.stage1 = partial;
+              return { ...prev, messages };
+            });
+            break;
+
           case 'stage1_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
@@ -124,6 +151,21 @@ function App() {
             });
             break;
 
+          case 'stage2_member_complete':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              lastMsg.stage2 = [...(lastMsg.stage2 || []), event.data];
+              lastMsg.metadata = event.metadata;
+              return { ...prev, messages };
+            });
+            break;
+
+          case 'stage1_member_failed':
+          case 'stage2_member_failed':
+            console.warn(`Council member ${event.data.model} failed to respond`);
+            break;
+
           case 'stage2_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
@@ -144,6 +186,17 @@ function App() {
             });
             break;
 
+          case 'stage3_delta':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              const { model, delta } = event.data;
+              const current = lastMsg.stage3 || { model, response: '' };
+              lastMsg.stage3 = { ...current, response: current.response + delta };
+              return { ...prev, messages };
+            });
+            break;
+
           case 'stage3_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
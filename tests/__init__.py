@@ -0,0 +1,15 @@
+"""Tests run offline against the mock provider, with storage in a temporary directory."""
+
+import os
+import tempfile
+
+os.environ.update(
+    COUNCIL_MODELS="mock/a,mock/b,mock/c",
+    CHAIRMAN_MODEL="mock/chair",
+    TITLE_MODEL="mock/title",
+    DATA_DIR=tempfile.mkdtemp(),
+    RESPONSE_CACHE_ENABLED="false",
+    RESPONSE_CACHE_PATH="",
+    MOCK_LATENCY_MEDIAN="0.05",
+    MOCK_TOKEN_INTERVAL="0",
+)
@@ -0,0 +1,42 @@
+"""Calls cut off by the request deadline must not be blamed on the provider route."""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from backend import metrics
+from backend.deadline import request_deadline
+from backend.providers import mock_provider, router
+from backend.providers.circuit import CLOSED, get_breakers
+
+
+class DeadlineBreakerTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(
+            mock_provider, "MOCK_MODELS", {"deadline-slow": {"latency": {"dist": "fixed", "value": 1.0}}}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _timeouts(self) -> float:
+        return metrics.provider_timeouts._values.get(("mock", "mock/deadline-slow"), 0.0)
+
+    async def test_deadline_does_not_open_circuits(self):
+        timeouts = self._timeouts()
+
+        with request_deadline(0.05):
+            responses = await asyncio.gather(*[
+                router.query_model("mock/deadline-slow", [{"role": "user", "content": f"q{i}"}])
+                for i in range(10)
+            ])
+
+        self.assertEqual(responses, [None] * 10)
+        for breaker in get_breakers("mock", "mock/deadline-slow"):
+            self.assertEqual(breaker.state, CLOSED, breaker.name)
+            self.assertEqual(breaker.failures, 0, breaker.name)
+            self.assertEqual(breaker.probes, 0, breaker.name)
+        self.assertEqual(self._timeouts(), timeouts)
+
+
+if __name__ == "__main__":
+    unittest.main()
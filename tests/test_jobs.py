@@ -0,0 +1,52 @@
+"""Cancelled jobs must free their queue slot, and stop() must wait for running jobs."""
+
+import asyncio
+import unittest
+
+from backend import jobs
+
+
+class JobQueueTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.queue = jobs.JobQueue(workers=1, max_queued=2, retention=60)
+        self.queue.start()
+        self.addAsyncCleanup(self.queue.stop)
+        self.release = asyncio.Event()
+
+    async def _blocking(self, emit):
+        await self.release.wait()
+        return {"ok": True}
+
+    async def test_cancelled_queued_jobs_free_their_slots(self):
+        running = self.queue.submit("c", self._blocking)
+        await asyncio.sleep(0)
+        self.assertEqual(running.status, jobs.RUNNING)
+
+        waiting = [self.queue.submit("c", self._blocking) for _ in range(2)]
+        with self.assertRaises(jobs.QueueFull):
+            self.queue.submit("c", self._blocking)
+        for job in waiting:
+            self.queue.cancel(job.id)
+        self.assertEqual(self.queue.depth, 0)
+
+        replacements = [self.queue.submit("c", self._blocking) for _ in range(2)]
+        self.assertEqual(self.queue.depth, 2)
+
+        self.release.set()
+        for _ in range(20):
+            await asyncio.sleep(0)
+        self.assertEqual([job.status for job in waiting], [jobs.CANCELLED] * 2)
+        self.assertEqual([job.status for job in replacements], [jobs.SUCCEEDED] * 2)
+        self.assertEqual(self.queue.depth, 0)
+
+    async def test_stop_waits_for_cancelled_jobs(self):
+        job = self.queue.submit("c", self._blocking)
+        await asyncio.sleep(0)
+        await self.queue.stop()
+
+        self.assertEqual(job.status, jobs.CANCELLED)
+        self.assertTrue(job._task.done())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Compaction of append-only JSONL conversation logs."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from backend import jsonl_storage
+
+
+def _turn(conversation_id: str, n: int):
+    """Append one user message and one assistant message."""
+    jsonl_storage.add_user_message(conversation_id, f"question {n}")
+    jsonl_storage.add_assistant_message(
+        conversation_id,
+        [{"model": "mock/a", "response": f"answer {n}"}],
+        [],
+        {"model": "mock/chair", "response": f"final {n}"},
+    )
+
+
+class JsonlCompactionTest(unittest.TestCase):
+    def setUp(self):
+        data_dir = tempfile.mkdtemp()
+        for name, value in (("DATA_DIR", data_dir), ("JSONL_COMPACT_AFTER", 8)):
+            patcher = mock.patch.object(jsonl_storage, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.conversation_id = "c1"
+        jsonl_storage.create_conversation(self.conversation_id)
+        self.path = jsonl_storage.get_conversation_path(self.conversation_id)
+
+    def _header(self):
+        with open(self.path) as f:
+            return json.loads(f.readline())
+
+    def test_message_appends_trigger_compaction(self):
+        for n in range(10):
+            _turn(self.conversation_id, n)
+        inode = os.stat(self.path).st_ino
+
+        conversation = jsonl_storage.get_conversation(self.conversation_id)
+
+        self.assertNotEqual(os.stat(self.path).st_ino, inode)
+        self.assertEqual(self._header()["compacted"], 20)
+        self.assertEqual(len(conversation["messages"]), 20)
+        self.assertNotIn("compacted", conversation)
+        self.assertEqual(jsonl_storage.get_conversation(self.conversation_id), conversation)
+
+    def test_few_appends_do_not_rewrite(self):
+        for n in range(3):
+            _turn(self.conversation_id, n)
+        inode = os.stat(self.path).st_ino
+
+        jsonl_storage.get_conversation(self.conversation_id)
+
+        self.assertEqual(os.stat(self.path).st_ino, inode)
+        self.assertEqual(self._header()["compacted"], 0)
+
+    def test_title_updates_fold_into_header(self):
+        _turn(self.conversation_id, 0)
+        for n in range(9):
+            jsonl_storage.update_conversation_title(self.conversation_id, f"title {n}")
+
+        jsonl_storage.get_conversation(self.conversation_id)
+
+        with open(self.path) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[0]["title"], "title 8")
+        self.assertEqual([r["type"] for r in records], ["header", "message", "message"])
+
+
+if __name__ == "__main__":
+    unittest.main()
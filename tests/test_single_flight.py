@@ -0,0 +1,59 @@
+"""Single-flight coalescing must not merge council seats or double-count cost."""
+
+import asyncio
+import unittest
+
+from backend import accounting, council
+from backend.providers import router
+
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.provider = router._get_provider("mock/a")
+        self.upstream_calls = 0
+        run = self.provider._run
+
+        async def counting_run(*args, **kwargs):
+            self.upstream_calls += 1
+            return await run(*args, **kwargs)
+
+        self.provider._run = counting_run
+        self.addCleanup(setattr, self.provider, "_run", run)
+        accounting._prices = {"mock/a": {"input": 1.0, "output": 2.0}}
+        self.addCleanup(setattr, accounting, "_prices", None)
+
+    async def test_duplicate_seats_make_separate_calls(self):
+        metadata = {}
+        results = await council.stage1_collect_responses(
+            "What is single flight?", ["mock/a", "mock/a"], metadata=metadata
+        )
+
+        self.assertEqual(self.upstream_calls, 2)
+        self.assertEqual(len(results), 2)
+        self.assertNotEqual(results[0]["response"], results[1]["response"])
+        self.assertTrue(all(r["cache"] != "coalesced" for r in results))
+        usage = metadata["usage"]["stage1"]
+        self.assertEqual(usage["cost"], round(sum(r["cost"] for r in results), 6))
+
+    async def test_coalesced_call_is_costed_once(self):
+        messages = [{"role": "user", "content": "Same question"}]
+        responses = await asyncio.gather(
+            router.query_model("mock/a", messages),
+            router.query_model("mock/a", messages),
+        )
+
+        self.assertEqual(self.upstream_calls, 1)
+        leader, follower = sorted(responses, key=lambda r: r.get("coalesced", False))
+        self.assertEqual(follower["content"], leader["content"])
+        self.assertEqual(follower["cache"], "coalesced")
+        self.assertIsNone(follower["usage"])
+
+        results = [council._call_accounting("mock/a", r) for r in responses]
+        summary = accounting.summarize_calls(results)
+        self.assertEqual(summary["cost"], accounting.call_cost("mock/a", leader["usage"]))
+        self.assertEqual(summary["input_tokens"], leader["usage"]["input_tokens"])
+        self.assertEqual(summary["unpriced_calls"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Resuming an interrupted turn from its checkpoint."""
+
+import unittest
+import uuid
+
+from backend import council, storage, turns
+
+MODELS = ["mock/a", "mock/b", "mock/c"]
+
+
+class ResumeTurnTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.conversation_id = str(uuid.uuid4())
+        storage.create_conversation(self.conversation_id)
+        storage.add_user_message(self.conversation_id, "What is a checkpoint?")
+
+        self.queried = []
+        query = council.query_models_as_completed
+
+        def spy(models, *args, **kwargs):
+            self.queried.append(list(models))
+            return query(models, *args, **kwargs)
+
+        council.query_models_as_completed = spy
+        self.addCleanup(setattr, council, "query_models_as_completed", query)
+
+    async def test_resume_requeries_only_missing_rankers(self):
+        # An interrupted run: stage 1 done, one ranker answered in stage 2
+        checkpoint = turns.Checkpoint.start(
+            self.conversation_id, "What is a checkpoint?", MODELS, None, None, False
+        )
+        stage1 = await council.stage1_collect_responses("What is a checkpoint?", MODELS)
+        checkpoint.complete_stage("stage1", stage1)
+        stage2, _ = await council.stage2_collect_rankings("What is a checkpoint?", stage1, MODELS)
+        checkpoint.record({"type": "stage2_member_complete", "data": {"index": 1, **stage2[1]}})
+        self.queried.clear()
+
+        saved = [c for c in storage.list_turn_checkpoints() if c["turn_id"] == checkpoint.turn_id]
+        self.assertEqual(len(saved), 1)
+        result = await turns.run_turn(
+            self.conversation_id, "What is a checkpoint?", MODELS, None, None, False,
+            emit=lambda event: None, checkpoint=turns.Checkpoint(saved[0]),
+        )
+
+        self.assertIsNotNone(result)
+        self.assertEqual(self.queried, [["mock/a", "mock/c"]])
+        self.assertEqual(result["stage1"], stage1)
+        self.assertEqual(result["stage2"][1], stage2[1])
+        self.assertEqual([r["model"] for r in result["stage2"]], MODELS)
+        conversation = storage.get_conversation(self.conversation_id)
+        self.assertEqual([m["role"] for m in conversation["messages"]], ["user", "assistant"])
+        self.assertNotIn(checkpoint.turn_id, [c["turn_id"] for c in storage.list_turn_checkpoints()])
+
+
+if __name__ == "__main__":
+    unittest.main()